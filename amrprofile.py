@@ -0,0 +1,217 @@
+"""
+Per-level profile of an instrumented run.
+
+Run with setrun(instrument=True), which prints the steps and regridding
+of every level, and keep the screen output, e.g.
+    MEGAFLOOD_INSTRUMENT=1 make .output 2>&1 | tee _output/run.log
+(ensemble.py and benchmark.py write run.log themselves).  The profile
+combines, for each AMR level,
+  - time steps, dt range and largest CFL number (step lines of run.log),
+  - wall and CPU time and cell updates (timing summary of the run),
+  - regrids (run.log and fort.amr),
+  - patches and cells, mean and max over the output frames (headers of
+    the fort.q files),
+with the time spent in stepgrid, ghost cells, regridding and output, and
+is written to <name>.json and a readable <name>.txt that states which
+level, and whether regridding, dominates the run.
+
+Instrumenting costs time: every step of every level and every regridding
+is printed, and rprint and sprint add the grid and memory summaries.  The
+counts are exact but the wall times of an instrumented run are inflated,
+on the fine levels (most steps) and in regridding the most.  Give the
+screen output of an uninstrumented run of the same setup, e.g. the
+run.log of benchmark.py, as --timing to take the times and cell updates
+from its timing summary instead.
+
+Example:
+    python amrprofile.py _output -o profile
+    python amrprofile.py _output --timing _benchmark/base/_output/run.log
+
+"""
+from __future__ import absolute_import
+from __future__ import print_function
+import os
+import json
+
+from frameio import list_frames, read_headers
+from runlog import read_log, read_regrids
+
+
+def frame_levels(outdir='_output'):
+    """
+    Patches and cells per level in the output frames.
+
+    OUTPUT:
+        levels - dict mapping level to a dict with 'frames', 'patches_mean',
+                 'patches_max', 'cells_mean', 'cells_max'
+    """
+    counts = {}
+    frames = list_frames(outdir)
+    for frameno in frames:
+        per_frame = {}
+        for patch in read_headers(frameno, outdir):
+            n = per_frame.setdefault(patch.level, [0, 0])
+            n[0] += 1
+            n[1] += patch.mx * patch.my
+        for level, (patches, cells) in per_frame.items():
+            counts.setdefault(level, []).append((patches, cells))
+
+    levels = {}
+    for level, values in counts.items():
+        patches = [v[0] for v in values]
+        cells = [v[1] for v in values]
+        levels[level] = {'frames': len(values),
+                         'patches_mean': float(sum(patches)) / len(frames),
+                         'patches_max': max(patches),
+                         'cells_mean': float(sum(cells)) / len(frames),
+                         'cells_max': max(cells)}
+    return levels
+
+
+def _share(part, whole):
+    if part is None or not whole:
+        return None
+    return part / whole
+
+
+def profile(outdir='_output', log=None, timing_log=None):
+    """
+    Per-level records of the run in outdir with screen output log
+    (default outdir/run.log), with the timing summary of timing_log if
+    given (an uninstrumented run, see the module docstring).
+
+    OUTPUT:
+        prof - dict with 'levels' (list of per-level dicts), 'parts'
+               (time per part of the code with its share of the total),
+               'total', 'threads' and 'finished'
+    """
+    if log is None:
+        log = os.path.join(outdir, 'run.log')
+    steps, timing = read_log(log)
+    if timing_log is not None:
+        timing = read_log(timing_log)[1]
+    regrids = read_regrids([log, os.path.join(outdir, 'fort.amr')])
+    frames = frame_levels(outdir)
+    levels_timing = timing['levels'] if timing else {}
+    total = timing['total'] if timing else None
+    integration = total['wall'] if total else None
+
+    records = []
+    for level in sorted(set(steps) | set(levels_timing) | set(frames)
+                        | set(regrids)):
+        rec = {'level': level}
+        s = steps.get(level)
+        if s is not None:
+            rec.update(steps=s['count'], dt_min=s['dt_min'],
+                       dt_max=s['dt_max'], cfl_max=s['cfl_max'])
+        t = levels_timing.get(level)
+        if t is not None:
+            rec.update(wall=t['wall'], cpu=t['cpu'],
+                       cell_updates=t['cell_updates'],
+                       wall_share=_share(t['wall'], integration))
+            if t['wall'] and t['cell_updates']:
+                rec['updates_per_second'] = t['cell_updates'] / t['wall']
+        r = regrids.get(level)
+        if r is not None:
+            rec.update(regrids=r['count'])
+            if r['reports']:
+                rec.update(regrid_grids_max=r['grids_max'],
+                           regrid_cells_max=r['cells_max'])
+        f = frames.get(level)
+        if f is not None:
+            rec.update(f)
+            rec['cells_per_patch'] = f['cells_mean'] / f['patches_mean']
+        records.append(rec)
+
+    parts = {}
+    if timing:
+        whole = timing['parts'].get('total time', {}).get('wall')
+        for name, part in timing['parts'].items():
+            parts[name] = dict(part, share=_share(part['wall'], whole))
+    return {'outdir': os.path.abspath(outdir), 'log': os.path.abspath(log),
+            'timing_log': os.path.abspath(timing_log or log),
+            'finished': timing is not None,
+            'threads': timing.get('threads') if timing else None,
+            'total': total, 'levels': records, 'parts': parts}
+
+
+def _fmt(value, fmt):
+    return '-' if value is None else fmt % value
+
+
+def _percent(share):
+    return '-' if share is None else '%.0f%%' % (100 * share)
+
+
+def report_lines(prof):
+    """The profile as lines of text, ending with the main findings."""
+    lines = ['Profile of %s' % prof['outdir']]
+    if not prof['finished']:
+        lines.append('(no timing summary: the run did not finish)')
+    elif prof['timing_log'] == prof['log']:
+        lines.append('(times of the instrumented run, inflated by its '
+                     'printing)')
+    else:
+        lines.append('(times from %s)' % prof['timing_log'])
+    lines.append('level    steps   regrids  patches  cells/patch'
+                 '   wall (s)  share  cell updates  updates/s')
+    for rec in prof['levels']:
+        lines.append('%5i %8s %9s %8s %12s %10s %6s %13s %10s' % (
+            rec['level'], _fmt(rec.get('steps'), '%i'),
+            _fmt(rec.get('regrids'), '%i'),
+            _fmt(rec.get('patches_mean'), '%.1f'),
+            _fmt(rec.get('cells_per_patch'), '%.0f'),
+            _fmt(rec.get('wall'), '%.1f'),
+            _percent(rec.get('wall_share')),
+            _fmt(rec.get('cell_updates'), '%.3g'),
+            _fmt(rec.get('updates_per_second'), '%.3g')))
+    if prof['parts']:
+        lines.append('')
+        lines.append('part                    wall (s)  share')
+        for name, part in sorted(prof['parts'].items(),
+                                 key=lambda item: -item[1]['wall']):
+            lines.append('%-22s %9.1f %6s' % (name, part['wall'],
+                                              _percent(part['share'])))
+
+    timed = [rec for rec in prof['levels'] if rec.get('wall') is not None]
+    if timed:
+        top = max(timed, key=lambda rec: rec['wall'])
+        lines.append('')
+        lines.append('Level %i takes the most integration time (%s of it).'
+                     % (top['level'], _percent(top.get('wall_share'))))
+    regrid = prof['parts'].get('regridding')
+    if regrid is not None and regrid['share'] is not None:
+        lines.append('Regridding takes %s of the total time.'
+                     % _percent(regrid['share']))
+    return lines
+
+
+def write_report(prof, name='profile'):
+    """Write name.json and name.txt."""
+    with open(name + '.json', 'w') as f:
+        json.dump(prof, f, indent=1)
+    with open(name + '.txt', 'w') as f:
+        f.write('\n'.join(report_lines(prof)) + '\n')
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('outdir', nargs='?', default='_output')
+    parser.add_argument('--log', default=None,
+                        help='screen output of the run (default '
+                             'OUTDIR/run.log)')
+    parser.add_argument('--timing', default=None,
+                        help='screen output of an uninstrumented run to '
+                             'take the times from')
+    parser.add_argument('-o', '--output', default='profile',
+                        help='report name, writes NAME.json and NAME.txt')
+    args = parser.parse_args()
+
+    prof = profile(args.outdir, args.log, args.timing)
+    write_report(prof, args.output)
+    print('\n'.join(report_lines(prof)))
+
+
+if __name__ == '__main__':
+    main()
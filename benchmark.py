@@ -0,0 +1,219 @@
+"""
+Short, reproducible benchmark of this run.
+
+setrun(benchmark=True) keeps the domain, regions, topography and solver
+settings but stops at benchmark_tfinal (1 hour of simulated time) with
+steps_max capped and writes no checkpoints or intermediate frames.  The
+output verbosity is that of a full run, so printing does not weigh on the
+timing: the level 1 steps and the cell updates of each level (from the
+timing summary) are read from run.log.  The benchmark is run in
+    <benchmark_dir>/<name>/_output
+and the wall time, the time steps, the cell updates of each level and the
+cell updates per second are written to <benchmark_dir>/<name>/benchmark.json
+together with the solver settings, so that a change of CFL, limiters or
+regrid_interval can be judged in minutes instead of a full 226,800 s run.
+
+Examples:
+    python benchmark.py --threads 8 --name base
+    python benchmark.py --threads 8 --no-gauges --compare _benchmark/base
+    python benchmark.py --set manning_coefficient 0.05 --tfinal 600
+    python benchmark.py --set cfl_desired 0.8 --set limiter vanleer \
+        --set regrid_interval 4 --compare _benchmark/base
+
+"""
+from __future__ import absolute_import
+from __future__ import print_function
+import os
+import sys
+import json
+import time
+import socket
+import subprocess
+
+from ensemble import exe, write_member, run_member, read_json, parse_value
+from runlog import read_log
+
+benchmark_dir = '_benchmark'
+
+# relative slow-down of the cell update rate reported as a regression:
+regression_tol = 0.1
+
+
+def solver_settings(rundata):
+    """The settings of rundata that a benchmark result depends on."""
+    clawdata = rundata.clawdata
+    amrdata = rundata.amrdata
+    return {'tfinal': clawdata.tfinal, 'steps_max': clawdata.steps_max,
+            'cfl_desired': clawdata.cfl_desired,
+            'cfl_max': clawdata.cfl_max, 'order': clawdata.order,
+            'transverse_waves': clawdata.transverse_waves,
+            'limiter': list(clawdata.limiter),
+            'amr_levels_max': amrdata.amr_levels_max,
+            'refinement_ratios': list(amrdata.refinement_ratios_x),
+            'regrid_interval': amrdata.regrid_interval,
+            'regrid_buffer_width': amrdata.regrid_buffer_width,
+            'clustering_cutoff': amrdata.clustering_cutoff,
+            'wave_tolerance': rundata.refinement_data.wave_tolerance,
+            'manning_coefficient': rundata.geo_data.manning_coefficient,
+            'num_regions': len(rundata.regiondata.regions),
+            'num_gauges': len(rundata.gaugedata.gauges)}
+
+
+def _git_commit():
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            stderr=subprocess.STDOUT).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmark(params=None, threads=1, name='benchmark',
+                  directory=benchmark_dir, exe_path=exe, verbose=True):
+    """
+    Run setrun(benchmark=True, **params) with threads OpenMP threads and
+    write the result to <directory>/<name>/benchmark.json.
+
+    OUTPUT:
+        result - dict with wall_time, steps, cell_updates per level,
+                 cell_updates_per_second and settings
+    """
+    from setrun import setrun
+    params = dict(params or {}, benchmark=True)
+    exe_path = os.path.abspath(exe_path)
+    if not os.path.exists(exe_path):
+        raise IOError("*** %s not found, run 'make .exe' first" % exe_path)
+
+    member_dir = os.path.abspath(os.path.join(directory, name))
+    write_member(params, member_dir)
+    member_dir, returncode, wall = run_member((member_dir, params,
+                                               exe_path, threads))
+    log = os.path.join(member_dir, '_output', 'run.log')
+    if returncode != 0:
+        raise RuntimeError("*** benchmark %s failed, see %s" % (name, log))
+
+    steps, timing = read_log(log)
+    if timing is None:
+        print("*** no timing summary in %s, the cell updates are unknown"
+              % log)
+    levels = sorted(set(steps) | set(timing['levels'] if timing else []))
+    updates = dict((level, timing['levels'][level]['cell_updates'])
+                   for level in levels if timing and level in timing['levels'])
+    total_updates = sum(u for u in updates.values() if u)
+    result = {'name': name, 'params': params, 'threads': threads,
+              'host': socket.gethostname(), 'commit': _git_commit(),
+              'date': time.strftime('%Y-%m-%d %H:%M:%S'),
+              'wall_time': wall,
+              'steps': dict((level, steps[level]['count'])
+                            for level in levels if level in steps),
+              't_final': max(s['t_final'] for s in steps.values())
+              if steps else None,
+              'cell_updates': updates,
+              'total_cell_updates': total_updates,
+              'cell_updates_per_second': _ratio(total_updates, wall)
+              if timing else None,
+              'timing': timing,
+              'settings': solver_settings(setrun(**params))}
+    with open(os.path.join(member_dir, 'benchmark.json'), 'w') as f:
+        json.dump(result, f, indent=1)
+    if verbose:
+        print_result(result)
+    return result
+
+
+def load_result(path):
+    """benchmark.json of a benchmark directory (or the file itself)."""
+    if os.path.isdir(path):
+        path = os.path.join(path, 'benchmark.json')
+    result = read_json(path)
+    if result is None:
+        raise IOError("*** %s not found" % path)
+    return result
+
+
+def _ratio(new, old):
+    """new / old, None if either is unknown or old is 0."""
+    if new is None or not old:
+        return None
+    return float(new) / old
+
+
+def _format(value, fmt):
+    return 'n/a' if value is None else fmt % value
+
+
+def print_result(result):
+    print("%s: %.1f s wall, %s cell updates/s, %i threads"
+          % (result['name'], result['wall_time'],
+             _format(result['cell_updates_per_second'], '%.3g'),
+             result['threads']))
+    for level in sorted(set(result['steps']) | set(result['cell_updates']),
+                        key=int):
+        print("  level %s: %8s steps %12.4g cell updates"
+              % (level, result['steps'].get(level, '-'),
+                 result['cell_updates'].get(level) or 0))
+
+
+def compare(result, reference, tol=regression_tol):
+    """
+    Compare result with a reference result, print the differences of
+    settings, wall time and update rate.
+
+    OUTPUT:
+        True if the cell update rate dropped by more than tol, False if
+        it did not or is unknown for either result
+    """
+    for key in sorted(set(result['settings']) | set(reference['settings'])):
+        new = result['settings'].get(key)
+        old = reference['settings'].get(key)
+        if new != old:
+            print("  setting %s: %s -> %s" % (key, old, new))
+    rate = _ratio(result['cell_updates_per_second'],
+                  reference['cell_updates_per_second'])
+    print("  wall time %.1f s -> %.1f s (x %s), cell updates/s x %s"
+          % (reference['wall_time'], result['wall_time'],
+             _format(_ratio(result['wall_time'], reference['wall_time']),
+                     '%.2f'),
+             _format(rate, '%.2f')))
+    return rate is not None and rate < 1. - tol
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--name', default='benchmark')
+    parser.add_argument('--threads', type=int, default=1,
+                        help='OMP_NUM_THREADS')
+    parser.add_argument('--tfinal', type=float, default=None,
+                        help='simulated seconds (default from setrun.py)')
+    parser.add_argument('--no-gauges', action='store_true',
+                        help="run with gauge_file='none'")
+    parser.add_argument('--set', nargs=2, action='append', default=[],
+                        metavar=('NAME', 'VALUE'),
+                        help='any other setrun argument')
+    parser.add_argument('--compare', default=None, metavar='REFERENCE',
+                        help='benchmark directory or .json to compare with')
+    parser.add_argument('--tol', type=float, default=regression_tol,
+                        help='allowed drop of the cell update rate')
+    parser.add_argument('--dir', default=benchmark_dir)
+    parser.add_argument('--exe', default=exe)
+    args = parser.parse_args()
+
+    params = dict((name, parse_value(value)) for name, value in args.set)
+    if args.tfinal is not None:
+        params['tfinal'] = args.tfinal
+    if args.no_gauges:
+        params['gauge_file'] = 'none'
+    result = run_benchmark(params, args.threads, args.name, args.dir,
+                           args.exe)
+    if args.compare:
+        reference = load_result(args.compare)
+        print("compared with %s:" % reference['name'])
+        if compare(result, reference, args.tol):
+            sys.exit("*** cell update rate dropped by more than %g%%"
+                     % (100 * args.tol))
+
+
+if __name__ == '__main__':
+    main()
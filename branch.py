@@ -0,0 +1,181 @@
+"""
+Run variants of the flood from one shared checkpoint.
+
+The trunk, setrun(**base) stopped at branch_time with a checkpoint at its
+end, is run once in
+    <branch_dir>/<trunk>/trunk/_output
+and every variant restarts from that checkpoint in its own directory
+    <branch_dir>/<trunk>/<variant>/_output
+so the lake drainage before branch_time is computed once for all of them.
+A variant may only change what xgeoclaw reads again at a restart
+(branchable: friction, gauges, regions, output, checkpoints, tfinal), not
+the grid or the initial condition.  Trunk and variants are skipped when
+done, as in ensemble.py.
+
+By default the branch time is 183600 s, the checkpoint of the original
+run, just before the downstream strip at the Brahmaputra confluence drops
+from level 4 to level 3.
+
+Example (three friction values and two region tables after 183600 s):
+    python branch.py --manning 0.03 0.04 0.05 \\
+                     --set region_file regions_a.csv,regions_b.csv --jobs 6
+
+"""
+from __future__ import absolute_import
+from __future__ import print_function
+import os
+import sys
+import json
+
+from ensemble import (exe, member_name, make_members, is_done, run_member,
+                      run_ensemble, setrun_args, write_rundata, parse_value)
+from checkpoint import list_checkpoints
+
+branch_dir = '_branches'
+branch_time = 183600.
+
+# setrun arguments a variant may change at a restart:
+branchable = ['manning_coefficient', 'gauge_file', 'region_file', 'compact',
+              'output_format', 'checkpoint_interval', 'tfinal']
+
+
+def check_variants(variants):
+    """Raise ValueError if a variant changes what a restart cannot."""
+    for variant in variants:
+        for key in variant:
+            if key not in branchable:
+                raise ValueError("*** %s cannot be changed at a restart, "
+                                 "only %s" % (key, ', '.join(branchable)))
+
+
+def trunk_name(base, time):
+    """Directory name of the trunk, e.g. 't183600_lake_volume81.0'."""
+    name = 't%g' % time
+    if base:
+        name += '_' + member_name(base)
+    return name
+
+
+def _checkpoint_at(outdir, time):
+    """The checkpoint in outdir at time (the end of the trunk), or None."""
+    for t, chk, tck in list_checkpoints(outdir):
+        if abs(t - time) <= 1e-6 * max(1., time):
+            return chk
+    return None
+
+
+def run_trunk(base, time=branch_time, directory=branch_dir, exe_path=exe,
+              threads=1, force=False, verbose=True):
+    """
+    Run setrun(**base) up to time unless it is done.
+
+    OUTPUT:
+        chk - path of the checkpoint at time
+    """
+    from setrun import setrun
+    trunk_dir = os.path.abspath(os.path.join(directory,
+                                             trunk_name(base, time), 'trunk'))
+    outdir = os.path.join(trunk_dir, '_output')
+    params = dict(base, tfinal=time)
+    chk = _checkpoint_at(outdir, time)
+    if not force and chk is not None and is_done(trunk_dir, params):
+        if verbose:
+            print("trunk to t = %g s is done" % time)
+        return chk
+
+    exe_path = os.path.abspath(exe_path)
+    if not os.path.exists(exe_path):
+        raise IOError("*** %s not found, run 'make .exe' first" % exe_path)
+    if not os.path.isdir(outdir):
+        os.makedirs(outdir)
+    with open(os.path.join(trunk_dir, 'params.json'), 'w') as f:
+        json.dump(params, f, indent=1)
+    rundata = setrun(**setrun_args(params, outdir))
+    # xgeoclaw checkpoints at tfinal for any checkpt_style but 0, so the
+    # checkpoints of base (e.g. checkpoint_interval) are kept:
+    if rundata.clawdata.checkpt_style == 0:
+        rundata.clawdata.checkpt_style = 1
+    write_rundata(rundata, outdir)
+    if os.path.exists(os.path.join(outdir, 'run.log')):
+        os.remove(os.path.join(outdir, 'run.log'))
+
+    if verbose:
+        print("running the trunk to t = %g s" % time)
+    returncode, wall = run_member((trunk_dir, params, exe_path, threads))[1:]
+    chk = _checkpoint_at(outdir, time)
+    if returncode != 0 or chk is None:
+        raise RuntimeError("*** trunk failed, see %s"
+                           % os.path.join(outdir, 'run.log'))
+    if verbose:
+        print("trunk done in %.0f s" % wall)
+    return chk
+
+
+def run_branches(base, variants, time=branch_time, jobs=1, threads=1,
+                 directory=branch_dir, exe_path=exe, force=False,
+                 verbose=True):
+    """
+    Run the trunk and then all variants (dicts of setrun arguments added
+    to base) from its checkpoint, jobs at a time.
+
+    OUTPUT:
+        results - as ensemble.run_ensemble
+    """
+    check_variants(variants)
+    chk = run_trunk(base, time, directory, exe_path, threads, force, verbose)
+    members = [dict(base, restart=chk, **variant) for variant in variants]
+    return run_ensemble(members, jobs, threads,
+                        os.path.join(directory, trunk_name(base, time)),
+                        exe_path, force, verbose)
+
+
+def main():
+    import argparse
+    import multiprocessing
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--time', type=float, default=branch_time,
+                        help='branch time in s (default %g)' % branch_time)
+    parser.add_argument('--base', nargs=2, action='append', default=[],
+                        metavar=('NAME', 'VALUE'),
+                        help='setrun argument of the trunk and all variants')
+    parser.add_argument('--manning', nargs='+', type=float,
+                        help='Manning coefficients')
+    parser.add_argument('--set', nargs=2, action='append', default=[],
+                        metavar=('NAME', 'VALUES'),
+                        help='other branchable setrun argument, comma '
+                             'separated values')
+    parser.add_argument('--threads', type=int, default=1)
+    parser.add_argument('--jobs', type=int, default=None,
+                        help='concurrent variants (default cores // threads)')
+    parser.add_argument('--dir', default=branch_dir)
+    parser.add_argument('--exe', default=exe)
+    parser.add_argument('--force', action='store_true',
+                        help='rerun the trunk and variants that are done')
+    args = parser.parse_args()
+
+    grid = {}
+    if args.manning:
+        grid['manning_coefficient'] = args.manning
+    for name, values in args.set:
+        grid[name] = [parse_value(v) for v in values.split(',')]
+    if not grid:
+        parser.error("no variants")
+    jobs = args.jobs
+    if jobs is None:
+        jobs = max(1, multiprocessing.cpu_count() // args.threads)
+
+    try:
+        base = dict((name, parse_value(value)) for name, value in args.base)
+        results = run_branches(base, make_members(grid),
+                               args.time, jobs, args.threads, args.dir,
+                               args.exe, args.force)
+    except ValueError as e:
+        parser.error(str(e))
+    failed = [r for r in results if r[1] != 0]
+    if failed:
+        sys.exit("*** %i variants failed, see run.log in %s"
+                 % (len(failed), ', '.join(r[0] for r in failed)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,185 @@
+"""
+Checkpoint times from a wall-clock budget, rotation of old checkpoints
+and the newest valid checkpoint for a restart.
+
+xgeoclaw writes a checkpoint as fort.chkNNNNN (NNNNN = level 1 steps)
+and then fort.tckNNNNN, whose first line holds the time.  A checkpoint is
+valid once its .tck file has that line and the .chk file is not empty, so
+a checkpoint cut short by a crash is never used.
+
+Checkpoint times are chosen so that at most interval seconds of wall time
+are lost in a crash: the wall time at which each frame of an earlier run
+was written (the modification times of its fort.t files) is interpolated
+to find the simulated time reached every interval seconds.  Without an
+earlier run, setrun.py checkpoints every checkpoint_steps level 1 steps.
+
+setrun(checkpoint_interval=3600) sets the times, setrun(restart='auto')
+restarts from the newest valid checkpoint in _output (run make with
+RESTART=True so that _output is kept), and ensemble.py removes all but
+the last keep_checkpoints checkpoints while a run goes on and resumes
+interrupted members.  By hand:
+    python checkpoint.py times _output --interval 3600
+    python checkpoint.py latest _output
+    python checkpoint.py rotate _output --keep 2 --watch
+
+"""
+from __future__ import absolute_import
+from __future__ import print_function
+import os
+import re
+import time
+import numpy as np
+
+from frameio import list_frames, frame_file, read_tfile
+
+# wall seconds between checkpoints:
+checkpoint_interval = 3600.
+
+# level 1 steps between checkpoints when there is no earlier run:
+checkpoint_steps = 2000
+
+# checkpoints kept by rotate:
+keep_checkpoints = 2
+
+_tck_re = re.compile(r'time\s*t\s*=\s*(\S+)')
+
+
+def wall_profile(outdir='_output'):
+    """
+    Simulated time and wall time since the first frame at each frame of
+    the run in outdir, None if it has fewer than 2 frames.
+
+    OUTPUT:
+        times, walls - increasing 1d arrays
+    """
+    if not os.path.isdir(outdir):
+        return None
+    times, walls = [], []
+    for frameno in list_frames(outdir):
+        fname = frame_file(outdir, 't', frameno)
+        times.append(read_tfile(frameno, outdir)['time'])
+        walls.append(os.path.getmtime(fname))
+    if len(times) < 2:
+        return None
+    order = np.argsort(times)
+    times = np.array(times)[order]
+    walls = np.array(walls)[order]
+    walls = np.maximum.accumulate(walls - walls[0])
+    return times, walls
+
+
+def checkpoint_times(tfinal, interval=checkpoint_interval, profile=None):
+    """
+    Simulated times at which interval, 2*interval, ... seconds of wall
+    time have passed according to profile = (times, walls), extrapolated
+    at the mean rate beyond its end, up to tfinal (excluded).
+    """
+    times, walls = profile
+    rate = (times[-1] - times[0]) / max(walls[-1], 1e-9)
+    targets = np.arange(interval, walls[-1] + (tfinal - times[-1])
+                        / max(rate, 1e-9), interval)
+    inside = targets <= walls[-1]
+    result = np.interp(targets[inside], walls, times).tolist()
+    result += (times[-1] + (targets[~inside] - walls[-1]) * rate).tolist()
+    return [t for t in result if t < tfinal]
+
+
+def _tck_time(fname):
+    try:
+        with open(fname) as f:
+            match = _tck_re.search(f.readline())
+    except IOError:
+        return None
+    if match is None:
+        return None
+    return float(match.group(1).replace('D', 'E').replace('d', 'e'))
+
+
+def list_checkpoints(outdir='_output'):
+    """
+    The valid checkpoints in outdir, oldest first.
+
+    OUTPUT:
+        list of (time, chk_file, tck_file)
+    """
+    checkpoints = []
+    if not os.path.isdir(outdir):
+        return checkpoints
+    for name in os.listdir(outdir):
+        if not (name.startswith('fort.chk') and name[8:].isdigit()):
+            continue
+        chk = os.path.join(outdir, name)
+        tck = os.path.join(outdir, 'fort.tck' + name[8:])
+        t = _tck_time(tck)
+        if t is not None and os.path.getsize(chk) > 0:
+            checkpoints.append((t, chk, tck))
+    return sorted(checkpoints)
+
+
+def latest_checkpoint(outdir='_output'):
+    """Path of the newest valid checkpoint in outdir, None if there is none."""
+    checkpoints = list_checkpoints(outdir)
+    if not checkpoints:
+        return None
+    return checkpoints[-1][1]
+
+
+def rotate(outdir='_output', keep=keep_checkpoints):
+    """
+    Remove all but the newest keep valid checkpoints of outdir (one being
+    written is left alone).
+
+    OUTPUT:
+        removed - list of the removed fort.chk files
+    """
+    removed = []
+    for t, chk, tck in list_checkpoints(outdir)[:-keep or None]:
+        for fname in (chk, tck):
+            if os.path.exists(fname):
+                os.remove(fname)
+        removed.append(chk)
+    return removed
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    sub = parser.add_subparsers(dest='command')
+    p = sub.add_parser('times', help='checkpoint times from an earlier run')
+    p.add_argument('outdir', nargs='?', default='_output')
+    p.add_argument('--interval', type=float, default=checkpoint_interval,
+                   help='wall seconds between checkpoints')
+    p.add_argument('--tfinal', type=float, default=226800.)
+    p = sub.add_parser('latest', help='newest valid checkpoint')
+    p.add_argument('outdir', nargs='?', default='_output')
+    p = sub.add_parser('rotate', help='remove old checkpoints')
+    p.add_argument('outdir', nargs='?', default='_output')
+    p.add_argument('--keep', type=int, default=keep_checkpoints)
+    p.add_argument('--watch', action='store_true',
+                   help='keep rotating every minute until interrupted')
+    args = parser.parse_args()
+
+    if args.command == 'times':
+        profile = wall_profile(args.outdir)
+        if profile is None:
+            parser.error("no frames in %s to time" % args.outdir)
+        print(' '.join('%.0f' % t for t in
+                       checkpoint_times(args.tfinal, args.interval, profile)))
+    elif args.command == 'latest':
+        chk = latest_checkpoint(args.outdir)
+        if chk is None:
+            parser.exit(1, "no valid checkpoint in %s\n" % args.outdir)
+        print(chk)
+    elif args.command == 'rotate':
+        while True:
+            for chk in rotate(args.outdir, args.keep):
+                print("removed %s" % chk)
+            if not args.watch:
+                break
+            time.sleep(60)
+    else:
+        parser.print_help()
+
+
+if __name__ == '__main__':
+    main()
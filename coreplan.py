@@ -0,0 +1,236 @@
+"""
+Plan how to split the cores of a node between OpenMP threads per run and
+concurrent ensemble members.
+
+A short trial of setrun.py (tfinal cut to trial_tfinal) is run alone at
+each of several thread counts, in
+    <coreplan_dir>/threads<N>/_output
+and the wall times are fitted with
+    T(n) = a + b/n + c*(n - 1)
+(a: serial part such as reading the topography, b: parallel work, c: cost
+of each extra thread, which makes scaling flatten on the 255 x 222 coarse
+grid and on small level-5 patches).  For every thread count t, jobs =
+cores // t runs can share the node, and the split giving the most runs
+per hour, or the shortest time for a given number of members, is
+recommended for ensemble.py --threads t --jobs jobs.
+
+The trials run one at a time, so the fit ignores runs competing for
+memory bandwidth; --verify runs the recommended number of trials at once
+to check the prediction.
+
+Example:
+    python coreplan.py --threads 1 2 4 8 16 --members 15 --verify
+
+"""
+from __future__ import absolute_import
+from __future__ import print_function
+import os
+import json
+import multiprocessing
+import numpy as np
+
+from ensemble import exe, write_member, run_member, read_json
+
+coreplan_dir = '_coreplan'
+
+# simulated seconds of a trial, enough for the first regrids on all levels:
+trial_tfinal = 1800.
+
+
+def trial_dir(directory, threads):
+    return os.path.abspath(os.path.join(directory, 'threads%i' % threads))
+
+
+def run_trials(thread_counts, tfinal=trial_tfinal, directory=coreplan_dir,
+               exe_path=exe, force=False, verbose=True):
+    """
+    Run one trial for each thread count, one after the other, reusing the
+    timings of trials already done with the same tfinal unless force.
+
+    OUTPUT:
+        walls - dict mapping threads to wall time in seconds
+    """
+    exe_path = os.path.abspath(exe_path)
+    if not os.path.exists(exe_path):
+        raise IOError("*** %s not found, run 'make .exe' first" % exe_path)
+
+    params = {'tfinal': tfinal}
+    walls = {}
+    for threads in thread_counts:
+        member_dir = trial_dir(directory, threads)
+        done = read_json(os.path.join(member_dir, 'done.json'))
+        if not force and done is not None and done['returncode'] == 0 \
+                and done['params'] == params and done['threads'] == threads:
+            walls[threads] = done['wall_time']
+            if verbose:
+                print("%3i threads: %8.1f s (done)" % (threads, walls[threads]))
+            continue
+        write_member(params, member_dir)
+        member_dir, returncode, wall = run_member((member_dir, params,
+                                                   exe_path, threads))
+        if returncode != 0:
+            raise RuntimeError("*** trial with %i threads failed, see %s"
+                               % (threads, os.path.join(member_dir, '_output',
+                                                        'run.log')))
+        walls[threads] = wall
+        if verbose:
+            print("%3i threads: %8.1f s" % (threads, wall))
+    return walls
+
+
+def fit_scaling(threads, walls):
+    """
+    Least squares fit of T(n) = a + b/n + c*(n - 1) to the wall times, with
+    c = 0 if there are fewer than 4 trials or the fit gives c < 0, and
+    a = 0 if the fit gives a < 0.
+
+    OUTPUT:
+        coeffs - [a, b, c]
+    """
+    n = np.asarray(threads, dtype=np.float64)
+    T = np.asarray(walls, dtype=np.float64)
+    columns = [np.ones_like(n), 1. / n, n - 1.]
+    use = [True, True, len(n) >= 4]
+    while True:
+        A = np.column_stack([col for col, u in zip(columns, use) if u])
+        fit = np.linalg.lstsq(A, T, rcond=None)[0]
+        coeffs = np.zeros(3)
+        coeffs[np.array(use)] = fit
+        negative = [k for k in (2, 0) if use[k] and coeffs[k] < 0]
+        if not negative:
+            return coeffs
+        use[negative[0]] = False
+
+
+def predicted_time(threads, coeffs):
+    """Wall time T(threads) of one run from the fitted coefficients."""
+    a, b, c = coeffs
+    n = np.asarray(threads, dtype=np.float64)
+    return a + b / n + c * (n - 1.)
+
+
+def plan(coeffs, cores, members=None):
+    """
+    Compare all splits of cores into threads x jobs.
+
+    OUTPUT:
+        rows - list of dicts with threads, jobs, run_time (s), runs_per_hour
+               and, if members is given, makespan (s), best first: most
+               runs per hour, or shortest makespan for members runs, with
+               fewer jobs (less memory) breaking ties.
+    """
+    if cores < 1:
+        raise ValueError("*** cores must be at least 1, not %s" % cores)
+    if members is not None and members < 1:
+        raise ValueError("*** members must be at least 1, not %s" % members)
+    rows = []
+    for threads in range(1, cores + 1):
+        jobs = cores // threads
+        if members is not None:
+            jobs = min(jobs, members)
+        run_time = float(predicted_time(threads, coeffs))
+        row = {'threads': threads, 'jobs': jobs, 'run_time': run_time,
+               'runs_per_hour': 3600. * jobs / run_time}
+        if members is not None:
+            row['makespan'] = -(-members // jobs) * run_time
+        rows.append(row)
+    if members is None:
+        rows.sort(key=lambda r: (-r['runs_per_hour'], r['jobs']))
+    else:
+        rows.sort(key=lambda r: (r['makespan'], r['jobs']))
+    return rows
+
+
+def verify(threads, jobs, tfinal=trial_tfinal, directory=coreplan_dir,
+           exe_path=exe):
+    """
+    Run jobs trials of threads each at the same time.
+
+    OUTPUT:
+        walls - list of the wall times in seconds
+    """
+    params = {'tfinal': tfinal}
+    exe_path = os.path.abspath(exe_path)
+    tasks = []
+    for k in range(jobs):
+        member_dir = os.path.abspath(os.path.join(
+            directory, 'verify_threads%i_job%i' % (threads, k)))
+        write_member(params, member_dir)
+        tasks.append((member_dir, params, exe_path, threads))
+    pool = multiprocessing.Pool(jobs)
+    try:
+        results = pool.map(run_member, tasks)
+    finally:
+        pool.close()
+        pool.join()
+    failed = [r[0] for r in results if r[1] != 0]
+    if failed:
+        raise RuntimeError("*** verify runs failed, see run.log in %s"
+                           % ', '.join(failed))
+    return [r[2] for r in results]
+
+
+def main():
+    import argparse
+    cores = multiprocessing.cpu_count()
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--threads', nargs='+', type=int, default=None,
+                        help='thread counts to try (default 1, 2, 4, ... '
+                             'up to the cores)')
+    parser.add_argument('--cores', type=int, default=cores,
+                        help='cores of the node (default %i)' % cores)
+    parser.add_argument('--members', type=int, default=None,
+                        help='plan for this many ensemble members')
+    parser.add_argument('--tfinal', type=float, default=trial_tfinal,
+                        help='simulated seconds of each trial')
+    parser.add_argument('--dir', default=coreplan_dir)
+    parser.add_argument('--exe', default=exe)
+    parser.add_argument('--force', action='store_true',
+                        help='rerun trials that are done')
+    parser.add_argument('--verify', action='store_true',
+                        help='run the recommended jobs at once to check')
+    args = parser.parse_args()
+
+    thread_counts = args.threads
+    if thread_counts is None:
+        thread_counts = [2**k for k in range(args.cores.bit_length())]
+    if args.cores < 1 or (args.members is not None and args.members < 1):
+        parser.error("--cores and --members must be at least 1")
+    walls = run_trials(thread_counts, args.tfinal, args.dir, args.exe,
+                       args.force)
+    threads = sorted(walls)
+    coeffs = fit_scaling(threads, [walls[n] for n in threads])
+    rows = plan(coeffs, args.cores, args.members)
+    best = rows[0]
+
+    print("\nT(n) = %.1f + %.1f/n + %.2f*(n-1) s" % tuple(coeffs))
+    print("threads  jobs  run time (s)  runs/hour"
+          + ("  makespan (s)" if args.members else ""))
+    for row in sorted(rows, key=lambda r: r['threads']):
+        print("%7i %5i %13.1f %10.2f" % (row['threads'], row['jobs'],
+                                         row['run_time'],
+                                         row['runs_per_hour'])
+              + (" %13.0f" % row['makespan'] if args.members else "")
+              + ("  <--" if row is best else ""))
+    print("\nRecommended: python ensemble.py --threads %i --jobs %i ..."
+          % (best['threads'], best['jobs']))
+
+    report = {'cores': args.cores, 'tfinal': args.tfinal,
+              'members': args.members,
+              'trials': [{'threads': n, 'wall_time': walls[n]}
+                         for n in threads],
+              'coeffs': list(coeffs), 'plan': rows, 'best': best}
+    if args.verify:
+        verify_walls = verify(best['threads'], best['jobs'], args.tfinal,
+                              args.dir, args.exe)
+        report['verify'] = verify_walls
+        print("Verify: %i runs of %i threads at once took %.1f s each "
+              "(max %.1f s), predicted %.1f s"
+              % (best['jobs'], best['threads'], np.mean(verify_walls),
+                 max(verify_walls), best['run_time']))
+    with open(os.path.join(args.dir, 'plan.json'), 'w') as f:
+        json.dump(report, f, indent=1)
+
+
+if __name__ == '__main__':
+    main()
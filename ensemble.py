@@ -0,0 +1,260 @@
+"""
+Run an ensemble of variants of setrun.py on a local process pool.
+
+Each member is a set of keyword arguments to setrun(), e.g. lake_volume
+and manning_coefficient, taken from the product of the values given on
+the command line.  Every member gets its own directory
+    <ensemble_dir>/<name>/params.json
+    <ensemble_dir>/<name>/_output/      -- data files, output and run.log
+and runs the one compiled xgeoclaw there with OMP_NUM_THREADS = threads.
+Members setting the lake level fill the lake in qinit.f90 rather than
+from lake_qinit.xyz, which holds one stage (see setrun_args).
+Members are run jobs at a time; a member whose done.json records a
+successful run with the same parameters is skipped, and one with a valid
+checkpoint restarts from it (unless --force), so an interrupted sweep is
+resumed by running the same command again.  Only the last two checkpoints
+of a run are kept (see checkpoint.py).
+
+Example (a 5 x 3 sweep, 4 runs of 8 threads at a time):
+    python ensemble.py --lake-volume 10 50 81 200 500 \\
+                       --manning 0.03 0.04 0.05 --jobs 4 --threads 8
+
+"""
+from __future__ import absolute_import
+from __future__ import print_function
+import os
+import ast
+import sys
+import json
+import time
+import itertools
+import subprocess
+
+from checkpoint import keep_checkpoints, latest_checkpoint, rotate
+
+ensemble_dir = '_ensemble'
+exe = 'xgeoclaw'
+
+# seconds between checks for old checkpoints during a run:
+rotate_every = 10.
+
+
+def member_name(params):
+    """
+    Directory name of a member, e.g. 'lake_stage3088.0'.  The checkpoint
+    a member restarts from (params['restart']) is not part of it.
+    """
+    return '_'.join('%s%s' % (key, params[key]) for key in sorted(params)
+                    if key != 'restart')
+
+
+def parse_value(text):
+    """
+    A setrun argument given on the command line as text: a Python literal
+    (number, True, None, list, ...) if it is one, e.g. '0.05' -> 0.05,
+    and the text itself otherwise, e.g. 'regions_a.csv'.
+    """
+    try:
+        return ast.literal_eval(text)
+    except (ValueError, SyntaxError):
+        return text
+
+
+def make_members(grid):
+    """
+    All combinations of the values in grid, a dict mapping setrun
+    keyword arguments to lists of values, as a list of dicts.
+    """
+    keys = sorted(grid)
+    return [dict(zip(keys, values))
+            for values in itertools.product(*[grid[k] for k in keys])]
+
+
+def read_json(fname):
+    if not os.path.exists(fname):
+        return None
+    with open(fname) as f:
+        return json.load(f)
+
+
+def is_done(member_dir, params):
+    """True if member_dir holds a successful run with these parameters."""
+    done = read_json(os.path.join(member_dir, 'done.json'))
+    return done is not None and done['returncode'] == 0 \
+        and done['params'] == params
+
+
+def setrun_args(params, outdir):
+    """
+    Keyword arguments to setrun() for a member with params writing to
+    outdir.  A member setting lake_stage or lake_volume fills the lake in
+    qinit.f90 (lake_qinit 'none'), unless it names its own lake_qinit:
+    lake_qinit.xyz was made for one stage only.
+    """
+    args = dict(params, outdir=outdir)
+    if ('lake_stage' in params or 'lake_volume' in params) \
+            and 'lake_qinit' not in params:
+        args['lake_qinit'] = 'none'
+    return args
+
+
+def write_member(params, member_dir, restart=False):
+    """
+    Write the data files of setrun(**params) into member_dir/_output, set
+    to restart from the newest valid checkpoint there if restart.
+    """
+    from setrun import setrun
+    outdir = os.path.join(member_dir, '_output')
+    if not os.path.isdir(outdir):
+        os.makedirs(outdir)
+    with open(os.path.join(member_dir, 'params.json'), 'w') as f:
+        json.dump(params, f, indent=1)
+
+    args = setrun_args(params, outdir)
+    if restart and latest_checkpoint(outdir) is not None:
+        rundata = setrun(**dict(args, restart=outdir))
+    else:
+        rundata = setrun(**args)
+        if os.path.exists(os.path.join(outdir, 'run.log')):
+            os.remove(os.path.join(outdir, 'run.log'))
+    write_rundata(rundata, outdir)
+    return outdir
+
+
+def write_rundata(rundata, outdir):
+    """Write the data files of rundata into outdir."""
+    cwd = os.getcwd()
+    os.chdir(outdir)
+    try:
+        rundata.write()
+    finally:
+        os.chdir(cwd)
+
+
+def run_member(task):
+    """
+    Run xgeoclaw for one member (in a pool worker), keeping only the last
+    keep_checkpoints checkpoints while it runs.
+
+    INPUT:
+        task - (member_dir, params, exe, threads)
+    OUTPUT:
+        member_dir, returncode, wall time in seconds
+    """
+    member_dir, params, exe_path, threads = task
+    outdir = os.path.join(member_dir, '_output')
+    env = dict(os.environ, OMP_NUM_THREADS=str(threads))
+    tstart = time.time()
+    # append, so the log of a run resumed from a checkpoint is kept:
+    with open(os.path.join(outdir, 'run.log'), 'a') as log:
+        proc = subprocess.Popen([exe_path], cwd=outdir, env=env,
+                                stdout=log, stderr=subprocess.STDOUT)
+        last_rotate = time.time()
+        while proc.poll() is None:
+            time.sleep(0.5)
+            if time.time() - last_rotate > rotate_every:
+                rotate(outdir, keep_checkpoints)
+                last_rotate = time.time()
+        returncode = proc.returncode
+    rotate(outdir, keep_checkpoints)
+    wall = time.time() - tstart
+    with open(os.path.join(member_dir, 'done.json'), 'w') as f:
+        json.dump({'params': params, 'returncode': returncode,
+                   'wall_time': wall, 'threads': threads}, f, indent=1)
+    return member_dir, returncode, wall
+
+
+def run_ensemble(members, jobs=1, threads=1, directory=ensemble_dir,
+                 exe_path=exe, force=False, verbose=True):
+    """
+    Write and run all members, jobs at a time with threads each, skipping
+    the ones already done unless force.
+
+    OUTPUT:
+        results - list of (member_dir, returncode, wall time) of the runs
+                  made now
+    """
+    import multiprocessing
+    exe_path = os.path.abspath(exe_path)
+    if not os.path.exists(exe_path):
+        raise IOError("*** %s not found, run 'make .exe' first" % exe_path)
+
+    tasks = []
+    for params in members:
+        member_dir = os.path.abspath(os.path.join(directory,
+                                                  member_name(params)))
+        if not force and is_done(member_dir, params):
+            if verbose:
+                print("skip %s (done)" % member_name(params))
+            continue
+        write_member(params, member_dir, restart=not force)
+        tasks.append((member_dir, params, exe_path, threads))
+
+    results = []
+    if not tasks:
+        return results
+    pool = multiprocessing.Pool(min(jobs, len(tasks)))
+    try:
+        for result in pool.imap_unordered(run_member, tasks):
+            results.append(result)
+            if verbose:
+                member_dir, returncode, wall = result
+                print("%s %s in %.0f s (%i/%i)"
+                      % ('done' if returncode == 0 else 'FAILED',
+                         os.path.basename(member_dir), wall,
+                         len(results), len(tasks)))
+    finally:
+        pool.close()
+        pool.join()
+    return results
+
+
+def main():
+    import argparse
+    import multiprocessing
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--lake-volume', nargs='+', type=float,
+                        help='lake volumes in km^3')
+    parser.add_argument('--lake-stage', nargs='+', type=float,
+                        help='lake levels in m')
+    parser.add_argument('--manning', nargs='+', type=float,
+                        help='Manning coefficients')
+    parser.add_argument('--set', nargs=2, action='append', default=[],
+                        metavar=('NAME', 'VALUES'),
+                        help='any other setrun argument, comma separated '
+                             'values, e.g. --set gauge_file a.csv,b.csv')
+    parser.add_argument('--threads', type=int, default=1,
+                        help='OMP_NUM_THREADS of each run')
+    parser.add_argument('--jobs', type=int, default=None,
+                        help='concurrent runs (default cores // threads)')
+    parser.add_argument('--dir', default=ensemble_dir)
+    parser.add_argument('--exe', default=exe)
+    parser.add_argument('--force', action='store_true',
+                        help='rerun members that are done')
+    args = parser.parse_args()
+
+    grid = {}
+    if args.lake_volume:
+        grid['lake_volume'] = args.lake_volume
+    if args.lake_stage:
+        grid['lake_stage'] = args.lake_stage
+    if args.manning:
+        grid['manning_coefficient'] = args.manning
+    for name, values in args.set:
+        grid[name] = [parse_value(v) for v in values.split(',')]
+    if not grid:
+        parser.error("no parameters to vary")
+
+    jobs = args.jobs
+    if jobs is None:
+        jobs = max(1, multiprocessing.cpu_count() // args.threads)
+    results = run_ensemble(make_members(grid), jobs, args.threads, args.dir,
+                           args.exe, args.force)
+    failed = [r for r in results if r[1] != 0]
+    if failed:
+        sys.exit("*** %i members failed, see run.log in %s"
+                 % (len(failed), ', '.join(r[0] for r in failed)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,323 @@
+"""
+Memory-mapped fgmax results and raster bands exported window by window.
+
+xgeoclaw writes the maxima of fixed grid NN to fort.FGNN.valuemax, one
+line per point:
+    x, y, level, values, times of the values, arrival time
+with the values h, speed, momentum, momentum flux, hmin for
+num_fgmax_val = 5 (h, speed for 2, h for 1); the arrival time is the
+first time the surface was above sea level, i.e. the point was wet (see
+makefgmax.py).  The topography goes to
+fort.FGNN.aux1 (x, y and B on every level).  build_cache parses these
+once, in chunks of a bounded number of lines, onto the grid of the points
+(the fgmax grid of makefgmax.py or any uniform grid) and writes one .npy
+array [j,i] per field into <outdir>/fgmax_cache/NN, NaN where there is no
+point:
+    h  speed  momentum  momentum_flux  hmin  t_h  ...  arrival  level  B
+load_cache memory maps them, so a window of the valley is read without
+touching the rest.  The cache is rebuilt when the fgmax output changes.
+
+write_band writes one field as a north-up float32 raster, an ESRI .flt
+band with its .hdr and .prj (read by GDAL and QGIS) or, if rasterio is
+installed, a GeoTIFF, copying window_rows rows at a time:
+    python fgmaxio.py _output --export h arrival -o maps
+
+"""
+from __future__ import absolute_import
+from __future__ import print_function
+import os
+import json
+from itertools import islice
+import numpy as np
+
+from gaugeio import _data_lines, _count_rows, _source_state
+
+
+cache_dirname = 'fgmax_cache'
+
+# names of the values written by GeoClaw for num_fgmax_val = 1, 2, 5:
+fgmax_fields = {1: ['h'], 2: ['h', 'speed'],
+                5: ['h', 'speed', 'momentum', 'momentum_flux', 'hmin']}
+
+# rows copied at a time by write_band:
+window_rows = 512
+
+nodata_value = -9999.
+
+wgs84_wkt = 'GEOGCS["WGS 84",DATUM["WGS_1984",SPHEROID["WGS 84",6378137,' \
+            '298.257223563]],PRIMEM["Greenwich",0],UNIT["degree",' \
+            '0.0174532925199433]]'
+
+
+def fgmax_files(outdir='_output', fgno=1):
+    """The valuemax and aux1 files of fixed grid fgno in outdir."""
+    return (os.path.join(outdir, 'fort.FG%i.valuemax' % fgno),
+            os.path.join(outdir, 'fort.FG%i.aux1' % fgno))
+
+
+def field_names(ncols):
+    """Column names for a valuemax file with ncols columns."""
+    nv = (ncols - 4) // 2
+    if 2 * nv + 4 != ncols:
+        raise ValueError("*** expected 2 * num_fgmax_val + 4 columns, "
+                         "found %i" % ncols)
+    names = fgmax_fields.get(nv, ['q%i' % (m + 1) for m in range(nv)])
+    return ['x', 'y', 'level'] + names + ['t_' + n for n in names] \
+        + ['arrival']
+
+
+def _chunks(fname, chunk_lines):
+    """Values of the data lines of fname, chunk_lines rows at a time."""
+    with open(fname) as f:
+        lines = _data_lines(f)
+        while True:
+            chunk = list(islice(lines, chunk_lines))
+            if not chunk:
+                break
+            yield np.array(' '.join(chunk).replace('D', 'E').split(),
+                           dtype=np.float64).reshape((len(chunk), -1))
+
+
+def point_grid(x, y):
+    """
+    Lower left point x1, y1, spacing dx, dy and size nx, ny of the uniform
+    grid through the points x, y.
+    """
+    grid = []
+    for v in (x, y):
+        u = np.unique(np.round(v, 10))
+        d = np.diff(u).min() if len(u) > 1 else 1.
+        grid.append((u[0], d, int(round((u[-1] - u[0]) / d)) + 1))
+    (x1, dx, nx), (y1, dy, ny) = grid
+    return x1, y1, dx, dy, nx, ny
+
+
+def _grid_index(v, v1, d):
+    k = np.round((v - v1) / d).astype(np.int64)
+    if np.any(np.abs(v1 + k * d - v) > 1e-3 * d):
+        raise ValueError("*** fgmax points are not on a uniform grid")
+    return k
+
+
+def cache_is_current(outdir='_output', fgno=1, cachedir=None):
+    """True if the cache in cachedir was built from the current output."""
+    if cachedir is None:
+        cachedir = os.path.join(outdir, cache_dirname, '%02i' % fgno)
+    manifest = os.path.join(cachedir, 'manifest.json')
+    if not os.path.exists(manifest):
+        return False
+    with open(manifest) as f:
+        sources = json.load(f)['sources']
+    return sources == _source_state([f for f in fgmax_files(outdir, fgno)
+                                     if os.path.exists(f)])
+
+
+def build_cache(outdir='_output', fgno=1, cachedir=None, chunk_lines=100000,
+                force=False, verbose=False):
+    """
+    Parse the fgmax output of fixed grid fgno in outdir into the cache.
+
+    The point coordinates are read in a first pass to find the grid, the
+    .npy files are preallocated at their final size, and the values are
+    then parsed and scattered in chunks of at most chunk_lines lines.
+
+    OUTPUT:
+        cachedir - where the cache was written
+    """
+    if cachedir is None:
+        cachedir = os.path.join(outdir, cache_dirname, '%02i' % fgno)
+    if not force and cache_is_current(outdir, fgno, cachedir):
+        return cachedir
+    valuemax, aux = fgmax_files(outdir, fgno)
+    if not os.path.exists(valuemax):
+        raise IOError("*** No fgmax output %s" % valuemax)
+    if not os.path.isdir(cachedir):
+        os.makedirs(cachedir)
+
+    npoints, ncols = _count_rows(valuemax)
+    names = field_names(ncols)
+    x = np.empty(npoints)
+    y = np.empty(npoints)
+    row = 0
+    for values in _chunks(valuemax, chunk_lines):
+        x[row:row + len(values)] = values[:, 0]
+        y[row:row + len(values)] = values[:, 1]
+        row += len(values)
+    x1, y1, dx, dy, nx, ny = point_grid(x, y)
+    del x, y
+
+    fields = {}
+    for name in names[2:] + ['B']:
+        if name == 'B' and not os.path.exists(aux):
+            continue
+        dtype = np.int16 if name == 'level' else np.float64
+        fields[name] = np.lib.format.open_memmap(
+            os.path.join(cachedir, name + '.npy'), mode='w+', dtype=dtype,
+            shape=(ny, nx))
+        fields[name][:] = 0 if name == 'level' else np.nan
+
+    for values in _chunks(valuemax, chunk_lines):
+        i = _grid_index(values[:, 0], x1, dx)
+        j = _grid_index(values[:, 1], y1, dy)
+        for m, name in enumerate(names[2:]):
+            fields[name][j, i] = values[:, m + 2]
+    if 'B' in fields:
+        # B on the level each point was recorded on (column level + 1):
+        for values in _chunks(aux, chunk_lines):
+            i = _grid_index(values[:, 0], x1, dx)
+            j = _grid_index(values[:, 1], y1, dy)
+            level = np.clip(fields['level'][j, i], 1, values.shape[1] - 2)
+            fields['B'][j, i] = values[np.arange(len(values)), level + 1]
+    if verbose:
+        print("  %s: %i points on a %i x %i grid"
+              % (os.path.basename(valuemax), npoints, nx, ny))
+
+    for array in fields.values():
+        array.flush()
+    names = [n for n in names[2:] + ['B'] if n in fields]
+    del fields
+    with open(os.path.join(cachedir, 'manifest.json'), 'w') as f:
+        json.dump({'fields': names, 'points': npoints,
+                   'grid': [x1, y1, dx, dy, nx, ny],
+                   'sources': _source_state([f for f in (valuemax, aux)
+                                             if os.path.exists(f)])}, f)
+    return cachedir
+
+
+class FGmaxCache(object):
+    """
+    Memory-mapped fgmax results.  fields maps names to arrays [j,i] at the
+    points x[i], y[j]; window() returns views of a part of the grid.
+    """
+
+    def __init__(self, cachedir):
+        self.cachedir = cachedir
+        with open(os.path.join(cachedir, 'manifest.json')) as f:
+            manifest = json.load(f)
+        self.names = manifest['fields']
+        self.npoints = manifest['points']
+        x1, y1, self.dx, self.dy, nx, ny = manifest['grid']
+        self.x = x1 + self.dx * np.arange(nx)
+        self.y = y1 + self.dy * np.arange(ny)
+        self.fields = dict((name, np.load(os.path.join(cachedir,
+                                                       name + '.npy'),
+                                          mmap_mode='r'))
+                           for name in self.names)
+
+    @property
+    def shape(self):
+        return len(self.y), len(self.x)
+
+    def window(self, x1, x2, y1, y2, names=None):
+        """
+        The points in [x1, x2] x [y1, y2].
+
+        OUTPUT:
+            x, y - coordinates of the window
+            fields - dict of views [j,i] of the fields (all or names)
+        """
+        i1 = np.searchsorted(self.x, x1, side='left')
+        i2 = np.searchsorted(self.x, x2, side='right')
+        j1 = np.searchsorted(self.y, y1, side='left')
+        j2 = np.searchsorted(self.y, y2, side='right')
+        s = (slice(j1, j2), slice(i1, i2))
+        return self.x[i1:i2], self.y[j1:j2], \
+            dict((n, self.fields[n][s]) for n in (names or self.names))
+
+
+def load_cache(outdir='_output', fgno=1, cachedir=None, **kwargs):
+    """
+    Return an FGmaxCache for fixed grid fgno in outdir, building or
+    refreshing it first if needed (kwargs are passed to build_cache).
+    """
+    return FGmaxCache(build_cache(outdir, fgno, cachedir, **kwargs))
+
+
+def _write_tif(fname, cache, name, rows):
+    try:
+        import rasterio
+        from rasterio.transform import from_origin
+        from rasterio.windows import Window
+    except ImportError:
+        raise IOError("*** writing %s needs rasterio, write a .flt band "
+                      "instead" % fname)
+    ny, nx = cache.shape
+    transform = from_origin(cache.x[0] - cache.dx / 2,
+                            cache.y[-1] + cache.dy / 2, cache.dx, cache.dy)
+    with rasterio.open(fname, 'w', driver='GTiff', width=nx, height=ny,
+                       count=1, dtype='float32', crs='EPSG:4326',
+                       transform=transform, nodata=nodata_value,
+                       tiled=True, compress='deflate') as dst:
+        for j2 in range(ny, 0, -rows):
+            j1 = max(j2 - rows, 0)
+            band = _band_rows(cache, name, j1, j2)
+            dst.write(band, 1, window=Window(0, ny - j2, nx, j2 - j1))
+
+
+def _band_rows(cache, name, j1, j2):
+    """Rows j1:j2 of a field, north up, as float32 with nodata_value."""
+    band = np.asarray(cache.fields[name][j1:j2], dtype=np.float32)[::-1]
+    band[~np.isfinite(band)] = nodata_value
+    return band
+
+
+def write_band(fname, cache, name, rows=window_rows):
+    """
+    Write the field name of cache as a north-up float32 raster: a GeoTIFF
+    if fname ends with .tif (needs rasterio), else an ESRI .flt band with
+    .hdr and .prj files.  Only rows rows are held in memory at a time.
+    """
+    if fname.endswith('.tif'):
+        _write_tif(fname, cache, name, rows)
+        return
+    base = os.path.splitext(fname)[0]
+    ny, nx = cache.shape
+    out = np.memmap(base + '.flt', dtype='<f4', mode='w+', shape=(ny, nx))
+    for j1 in range(0, ny, rows):
+        j2 = min(j1 + rows, ny)
+        out[ny - j2:ny - j1] = _band_rows(cache, name, j1, j2)
+    out.flush()
+    del out
+    with open(base + '.hdr', 'w') as f:
+        f.write("NROWS %i\nNCOLS %i\nNBANDS 1\nNBITS 32\nPIXELTYPE FLOAT\n"
+                "BYTEORDER I\nLAYOUT BIL\nULXMAP %.10f\nULYMAP %.10f\n"
+                "XDIM %.10f\nYDIM %.10f\nNODATA %g\n"
+                % (ny, nx, cache.x[0], cache.y[-1], cache.dx, cache.dy,
+                   nodata_value))
+    with open(base + '.prj', 'w') as f:
+        f.write(wgs84_wkt + '\n')
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('outdir', nargs='?', default='_output')
+    parser.add_argument('--fgno', type=int, default=1)
+    parser.add_argument('--export', nargs='+', default=[],
+                        metavar='FIELD', help='fields to write as rasters')
+    parser.add_argument('--format', choices=['flt', 'tif'], default='flt')
+    parser.add_argument('-o', '--output', default='.',
+                        help='directory of the rasters')
+    parser.add_argument('--force', action='store_true',
+                        help='rebuild the cache')
+    args = parser.parse_args()
+
+    cache = load_cache(args.outdir, args.fgno, force=args.force,
+                       verbose=True)
+    print("Cached %i points, %i x %i grid, fields %s in %s"
+          % (cache.npoints, cache.shape[1], cache.shape[0],
+             ', '.join(cache.names), cache.cachedir))
+    unknown = [n for n in args.export if n not in cache.names]
+    if unknown:
+        parser.error("unknown fields %s" % ', '.join(unknown))
+    if args.export and not os.path.isdir(args.output):
+        os.makedirs(args.output)
+    for name in args.export:
+        fname = os.path.join(args.output, 'fgmax%i_%s.%s'
+                             % (args.fgno, name, args.format))
+        write_band(fname, cache, name)
+        print("Wrote %s" % fname)
+
+
+if __name__ == '__main__':
+    main()
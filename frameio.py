@@ -0,0 +1,435 @@
+"""
+Fast NumPy readers for the AMR frames written by xgeoclaw.
+
+Each output frame NNNN consists of
+    fort.tNNNN  -- time, number of components, number of patches, ...
+    fort.qNNNN  -- a header per patch, followed by the data if ascii
+    fort.bNNNN  -- the data of all patches if output_format = 'binary'
+
+The readers below return one Patch per AMR grid with the solution as a
+NumPy array q[m,i,j] (ghost cells removed), m = 0..3 for h, hu, hv, eta.
+Binary frames are memory mapped, so nothing is copied until it is used.
+FrameIndex keeps the level, bounding box and file offset of every patch
+so that read_window reads only the patches in a part of the domain.
+
+NetCDF frames are not handled here, read those with clawpack.pyclaw.
+
+"""
+from __future__ import absolute_import
+from __future__ import print_function
+import os
+import itertools
+import numpy as np
+
+
+# number of lines in the header written for each patch in fort.qNNNN:
+patch_header_lines = 8
+
+# directory in outdir holding the patch index of each frame:
+index_dirname = 'frame_index'
+
+index_dtype = np.dtype([('grid_number', np.int64), ('level', np.int32),
+                        ('mx', np.int32), ('my', np.int32),
+                        ('xlow', np.float64), ('ylow', np.float64),
+                        ('dx', np.float64), ('dy', np.float64),
+                        ('offset', np.int64)])
+
+
+class Patch(object):
+    """
+    One AMR patch of a frame.  q has shape (num_components, mx, my) and
+    index [m, i, j] refers to the cell centred at x[i], y[j].
+    """
+
+    def __init__(self, grid_number, level, mx, my, xlow, ylow, dx, dy,
+                 q=None):
+        self.grid_number = grid_number
+        self.level = level
+        self.mx = mx
+        self.my = my
+        self.xlow = xlow
+        self.ylow = ylow
+        self.dx = dx
+        self.dy = dy
+        self.q = q
+
+    @property
+    def xup(self):
+        return self.xlow + self.mx * self.dx
+
+    @property
+    def yup(self):
+        return self.ylow + self.my * self.dy
+
+    @property
+    def x(self):
+        return self.xlow + (np.arange(self.mx) + 0.5) * self.dx
+
+    @property
+    def y(self):
+        return self.ylow + (np.arange(self.my) + 0.5) * self.dy
+
+    def __repr__(self):
+        return "Patch(grid=%i, level=%i, %ix%i, [%g,%g]x[%g,%g])" \
+            % (self.grid_number, self.level, self.mx, self.my,
+               self.xlow, self.xup, self.ylow, self.yup)
+
+
+def frame_file(outdir, prefix, frameno):
+    """Return the path of fort.<prefix>NNNN in outdir."""
+    return os.path.join(outdir, 'fort.%s%s' % (prefix, str(frameno).zfill(4)))
+
+
+def read_tfile(frameno, outdir='_output'):
+    """
+    Read fort.tNNNN and return its entries as a dict, e.g.
+    {'time': 0.0, 'meqn': 3, 'ngrids': 1, 'naux': 3, 'ndim': 2, ...}.
+    """
+    info = {}
+    with open(frame_file(outdir, 't', frameno)) as f:
+        for line in f:
+            tokens = line.split()
+            if len(tokens) < 2:
+                continue
+            value, key = tokens[0], tokens[1]
+            if key == 'time':
+                info[key] = float(value)
+            else:
+                try:
+                    info[key] = int(value)
+                except ValueError:
+                    info[key] = value
+    info.setdefault('nghost', 2)
+    return info
+
+
+def frame_format(frameno, outdir='_output'):
+    """Return 'binary' if fort.bNNNN exists, otherwise 'ascii'."""
+    if os.path.exists(frame_file(outdir, 'b', frameno)):
+        return 'binary'
+    return 'ascii'
+
+
+def _parse_header(lines):
+    """Build a Patch (without data) from the 8 header lines of a patch."""
+    values = [line.split()[0] for line in lines]
+    grid_number, level, mx, my = [int(v) for v in values[:4]]
+    xlow, ylow, dx, dy = [float(v.replace('D', 'E')) for v in values[4:]]
+    return Patch(grid_number, level, mx, my, xlow, ylow, dx, dy)
+
+
+def read_headers(frameno, outdir='_output'):
+    """
+    Return the list of Patch headers of a frame, without data.  For ascii
+    frames the data lines between the headers are skipped unparsed.
+    """
+    skip_data = not os.path.exists(frame_file(outdir, 'b', frameno))
+    patches = []
+    with open(frame_file(outdir, 'q', frameno)) as f:
+        lines = (line for line in f if line.strip())
+        while True:
+            header = list(itertools.islice(lines, patch_header_lines))
+            if not header:
+                break
+            patch = _parse_header(header)
+            patches.append(patch)
+            if skip_data:
+                # skip the data, one cell per line:
+                for _ in itertools.islice(lines, patch.mx * patch.my):
+                    pass
+    return patches
+
+
+def _read_binary(frameno, outdir, nghost):
+    patches = read_headers(frameno, outdir)
+    data = np.memmap(frame_file(outdir, 'b', frameno), dtype=np.float64,
+                     mode='r')
+    sizes = [(p.mx + 2*nghost) * (p.my + 2*nghost) for p in patches]
+    if sum(sizes) == 0:
+        return patches
+    num_components, rem = divmod(data.size, sum(sizes))
+    if rem != 0:
+        raise IOError("*** %s does not match the patch headers"
+                      % frame_file(outdir, 'b', frameno))
+
+    start = 0
+    for patch, size in zip(patches, sizes):
+        stop = start + num_components * size
+        q = data[start:stop].reshape((num_components, patch.mx + 2*nghost,
+                                      patch.my + 2*nghost), order='F')
+        patch.q = q[:, nghost:nghost + patch.mx, nghost:nghost + patch.my]
+        start = stop
+    return patches
+
+
+def _read_ascii(frameno, outdir):
+    with open(frame_file(outdir, 'q', frameno)) as f:
+        lines = [line for line in f if line.strip()]
+
+    patches = []
+    k = 0
+    while k < len(lines):
+        patch = _parse_header(lines[k:k + patch_header_lines])
+        k += patch_header_lines
+        ncells = patch.mx * patch.my
+        block = ' '.join(lines[k:k + ncells])
+        values = np.array(block.replace('D', 'E').split(), dtype=np.float64)
+        # data is written with i varying fastest, one cell per line:
+        q = values.reshape((patch.my, patch.mx, -1))
+        patch.q = q.transpose((2, 1, 0))
+        patches.append(patch)
+        k += ncells
+    return patches
+
+
+def read_frame(frameno, outdir='_output', file_format=None):
+    """
+    Read frame frameno from outdir.
+
+    INPUT:
+        file_format 'ascii' or 'binary'; detected from the files if None.
+
+    OUTPUT:
+        time, patches - the frame time and a list of Patch objects
+    """
+    info = read_tfile(frameno, outdir)
+    if file_format is None:
+        file_format = frame_format(frameno, outdir)
+    if file_format == 'binary':
+        patches = _read_binary(frameno, outdir, info['nghost'])
+    elif file_format == 'ascii':
+        patches = _read_ascii(frameno, outdir)
+    else:
+        raise ValueError("*** Cannot read %r frames, use clawpack.pyclaw"
+                         % file_format)
+    return info['time'], patches
+
+
+def _scan_ascii(fname):
+    """
+    Headers of the patches in an ascii fort.q file and the byte offset of
+    the first data line of each, from one pass over its lines.
+    """
+    headers = []
+    offsets = []
+    header = []
+    data_left = 0
+    pos = 0
+    with open(fname, 'rb') as f:
+        for line in f:
+            start = pos
+            pos += len(line)
+            if not line.strip():
+                continue
+            if data_left > 0:
+                data_left -= 1
+                continue
+            header.append(line.decode())
+            if len(header) == patch_header_lines:
+                patch = _parse_header(header)
+                headers.append(patch)
+                offsets.append(pos)
+                data_left = patch.mx * patch.my
+                header = []
+    return headers, offsets
+
+
+class FrameIndex(object):
+    """
+    The patches of a frame as a structured array (index_dtype): level,
+    bounding box and the offset of the data of each patch, in values of
+    fort.bNNNN for binary frames or in bytes of fort.qNNNN for ascii
+    frames.  read() loads only the patches intersecting a window, from a
+    memory map of fort.b or by seeking in fort.q.
+
+    The index is built by scanning the headers once and saved in
+    <outdir>/frame_index/NNNN.npy, which is used while it is newer than
+    the frame files.
+    """
+
+    def __init__(self, frameno, outdir='_output'):
+        self.frameno = frameno
+        self.outdir = outdir
+        info = read_tfile(frameno, outdir)
+        self.time = info['time']
+        self.nghost = info['nghost']
+        self.file_format = frame_format(frameno, outdir)
+        self.patches = self._load()
+        self.num_components = None
+        self._data = None
+        if self.file_format == 'binary' and len(self.patches):
+            self._data = np.memmap(frame_file(outdir, 'b', frameno),
+                                   dtype=np.float64, mode='r')
+            p = self.patches
+            cells = ((p['mx'] + 2 * self.nghost)
+                     * (p['my'] + 2 * self.nghost)).sum()
+            self.num_components, rem = divmod(self._data.size, cells)
+            if rem != 0:
+                raise IOError("*** %s does not match the patch headers"
+                              % frame_file(outdir, 'b', frameno))
+            # offsets were counted in cells:
+            self.patches['offset'] *= self.num_components
+
+    def _load(self):
+        fname = os.path.join(self.outdir, index_dirname,
+                             '%04i.npy' % self.frameno)
+        sources = [frame_file(self.outdir, prefix, self.frameno)
+                   for prefix in ('q', 'b')]
+        sources = [f for f in sources if os.path.exists(f)]
+        if os.path.exists(fname) and all(os.path.getmtime(fname)
+                                          >= os.path.getmtime(f)
+                                          for f in sources):
+            return np.load(fname)
+
+        if self.file_format == 'binary':
+            headers = read_headers(self.frameno, self.outdir)
+            sizes = [(p.mx + 2 * self.nghost) * (p.my + 2 * self.nghost)
+                     for p in headers]
+            offsets = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+        else:
+            headers, offsets = _scan_ascii(sources[0])
+        patches = np.zeros(len(headers), dtype=index_dtype)
+        for k, (p, offset) in enumerate(zip(headers, offsets)):
+            patches[k] = (p.grid_number, p.level, p.mx, p.my, p.xlow,
+                          p.ylow, p.dx, p.dy, offset)
+        if not os.path.isdir(os.path.dirname(fname)):
+            os.makedirs(os.path.dirname(fname))
+        np.save(fname, patches)
+        return patches
+
+    def select(self, x1, x2, y1, y2, levels=None):
+        """Indices of the patches intersecting [x1, x2] x [y1, y2]."""
+        p = self.patches
+        hit = (p['xlow'] < x2) & (p['xlow'] + p['mx'] * p['dx'] > x1) \
+            & (p['ylow'] < y2) & (p['ylow'] + p['my'] * p['dy'] > y1)
+        if levels is not None:
+            hit &= np.isin(p['level'], levels)
+        return np.flatnonzero(hit)
+
+    def patch(self, k):
+        """Patch k with its data."""
+        e = self.patches[k]
+        patch = Patch(int(e['grid_number']), int(e['level']), int(e['mx']),
+                      int(e['my']), float(e['xlow']), float(e['ylow']),
+                      float(e['dx']), float(e['dy']))
+        if self.file_format == 'binary':
+            ng = self.nghost
+            shape = (self.num_components, patch.mx + 2 * ng,
+                     patch.my + 2 * ng)
+            start = int(e['offset'])
+            q = self._data[start:start + int(np.prod(shape))]
+            q = q.reshape(shape, order='F')
+            patch.q = q[:, ng:ng + patch.mx, ng:ng + patch.my]
+        else:
+            ncells = patch.mx * patch.my
+            with open(frame_file(self.outdir, 'q', self.frameno), 'rb') as f:
+                f.seek(int(e['offset']))
+                lines = (line for line in f if line.strip())
+                block = b' '.join(itertools.islice(lines, ncells)).decode()
+            values = np.array(block.replace('D', 'E').split(),
+                              dtype=np.float64)
+            patch.q = values.reshape((patch.my, patch.mx, -1)) \
+                .transpose((2, 1, 0))
+        return patch
+
+    def read(self, x1, x2, y1, y2, levels=None):
+        """The patches (with data) intersecting [x1, x2] x [y1, y2]."""
+        return [self.patch(k) for k in self.select(x1, x2, y1, y2, levels)]
+
+
+def read_window(frameno, x1, x2, y1, y2, outdir='_output', levels=None):
+    """
+    Read only the patches of frame frameno intersecting [x1, x2] x [y1, y2]
+    (and on levels, if given), see FrameIndex.
+
+    OUTPUT:
+        time, patches - the frame time and a list of Patch objects
+    """
+    index = FrameIndex(frameno, outdir)
+    return index.time, index.read(x1, x2, y1, y2, levels)
+
+
+def fill_grid(patches, x1, y1, dx, dy, nx, ny, values=None, fill=np.nan):
+    """
+    Sample patches on the uniform grid of nx x ny cells of size dx x dy
+    with lower left corner (x1, y1): each grid cell takes the value of the
+    cell of the finest patch that contains its centre.
+
+    INPUT:
+        values - function returning the array [i,j] to sample for a patch,
+                 default the depth patch.q[0]
+        fill - value where no patch contains the centre
+
+    OUTPUT:
+        grid, level - arrays [j,i] of the values and of the patch levels
+                      (0 where not covered)
+    """
+    if values is None:
+        values = lambda patch: patch.q[0]
+    xc = x1 + (np.arange(nx) + 0.5) * dx
+    yc = y1 + (np.arange(ny) + 0.5) * dy
+    grid = np.full((ny, nx), fill, dtype=np.float64)
+    level = np.zeros((ny, nx), dtype=np.int32)
+    for patch in sorted(patches, key=lambda p: p.level):
+        i1, i2 = np.searchsorted(xc, [patch.xlow, patch.xup])
+        j1, j2 = np.searchsorted(yc, [patch.ylow, patch.yup])
+        if i1 == i2 or j1 == j2:
+            continue
+        pi = np.minimum(((xc[i1:i2] - patch.xlow) / patch.dx).astype(int),
+                        patch.mx - 1)
+        pj = np.minimum(((yc[j1:j2] - patch.ylow) / patch.dy).astype(int),
+                        patch.my - 1)
+        grid[j1:j2, i1:i2] = np.asarray(values(patch))[np.ix_(pi, pj)].T
+        level[j1:j2, i1:i2] = patch.level
+    return grid, level
+
+
+def composite(patches, x1, y1, dx, dy, nx, ny, fill=np.nan):
+    """
+    All components of patches on the uniform grid of fill_grid, each grid
+    cell taking the values of the finest patch that contains its centre.
+
+    OUTPUT:
+        q, level - arrays [m,j,i] of the components and [j,i] of the patch
+                   levels (0 where not covered)
+    """
+    xc = x1 + (np.arange(nx) + 0.5) * dx
+    yc = y1 + (np.arange(ny) + 0.5) * dy
+    q = None
+    level = np.zeros((ny, nx), dtype=np.int32)
+    for patch in sorted(patches, key=lambda p: p.level):
+        if q is None:
+            q = np.full((patch.q.shape[0], ny, nx), fill, dtype=np.float64)
+        i1, i2 = np.searchsorted(xc, [patch.xlow, patch.xup])
+        j1, j2 = np.searchsorted(yc, [patch.ylow, patch.yup])
+        if i1 == i2 or j1 == j2:
+            continue
+        pi = np.minimum(((xc[i1:i2] - patch.xlow) / patch.dx).astype(int),
+                        patch.mx - 1)
+        pj = np.minimum(((yc[j1:j2] - patch.ylow) / patch.dy).astype(int),
+                        patch.my - 1)
+        q[:, j1:j2, i1:i2] = np.asarray(patch.q)[:, pi][:, :, pj] \
+            .transpose((0, 2, 1))
+        level[j1:j2, i1:i2] = patch.level
+    return q, level
+
+
+def list_frames(outdir='_output'):
+    """Return the sorted frame numbers that have a fort.t file in outdir."""
+    frames = []
+    for fname in os.listdir(outdir):
+        if fname.startswith('fort.t') and fname[6:].isdigit():
+            frames.append(int(fname[6:]))
+    return sorted(frames)
+
+
+if __name__ == '__main__':
+    # Summarise a frame, e.g.  python frameio.py 1 _output
+    import sys
+    frameno = int(sys.argv[1]) if len(sys.argv) > 1 else 0
+    outdir = sys.argv[2] if len(sys.argv) > 2 else '_output'
+    time, patches = read_frame(frameno, outdir)
+    print("Frame %i at t = %g: %i patches" % (frameno, time, len(patches)))
+    for level in sorted(set(p.level for p in patches)):
+        cells = sum(p.mx * p.my for p in patches if p.level == level)
+        print("  level %i: %i cells" % (level, cells))
@@ -0,0 +1,216 @@
+"""
+Streaming reader for the gaugeNNNNN.txt files written by xgeoclaw, with a
+columnar cache.
+
+build_cache parses all gauge files of an output directory in chunks of a
+bounded number of lines and writes one .npy file per column into
+<outdir>/gauge_cache, with the rows of all gauges one after the other:
+    level.npy  t.npy  h.npy  hu.npy  hv.npy  eta.npy
+    index.npy  -- gaugeno, x, y, start, stop for each gauge
+load_cache memory maps these files, so that GaugeCache.gauge(n) returns
+views of the arrays without reading or copying anything else.
+
+The cache is rebuilt when the gauge files change (size or mtime).
+
+"""
+from __future__ import absolute_import
+from __future__ import print_function
+import os
+import re
+import json
+from itertools import islice
+import numpy as np
+
+
+cache_dirname = 'gauge_cache'
+
+# names of the columns written by GeoClaw after level and time:
+geoclaw_fields = ['h', 'hu', 'hv', 'eta']
+
+index_dtype = np.dtype([('gaugeno', np.int64), ('x', np.float64),
+                        ('y', np.float64), ('start', np.int64),
+                        ('stop', np.int64)])
+
+header_re = re.compile(r'gauge_id=\s*(\d+)\s+location=\(\s*(\S+)\s+(\S+)\s*\)')
+
+
+def list_gauge_files(outdir='_output'):
+    """Return the gaugeNNNNN.txt files in outdir, sorted by gauge number."""
+    fnames = [f for f in os.listdir(outdir)
+              if f.startswith('gauge') and f.endswith('.txt')
+              and f[5:-4].isdigit()]
+    fnames.sort(key=lambda f: int(f[5:-4]))
+    return [os.path.join(outdir, f) for f in fnames]
+
+
+def read_gauge_header(fname):
+    """Return gaugeno, x, y from the first line of a gauge file."""
+    with open(fname) as f:
+        line = f.readline()
+    match = header_re.search(line)
+    if match is None:
+        raise IOError("*** %s: cannot parse gauge header %r" % (fname, line))
+    return (int(match.group(1)), float(match.group(2).replace('D', 'E')),
+            float(match.group(3).replace('D', 'E')))
+
+
+def _data_lines(f):
+    for line in f:
+        if line.strip() and not line.lstrip().startswith('#'):
+            yield line
+
+
+def _count_rows(fname):
+    """Return the number of data rows and the number of columns."""
+    nrows = 0
+    ncols = 0
+    with open(fname) as f:
+        for line in _data_lines(f):
+            if nrows == 0:
+                ncols = len(line.split())
+            nrows += 1
+    return nrows, ncols
+
+
+def field_names(ncols):
+    """Column names for a gauge file with ncols columns."""
+    nq = ncols - 2
+    if nq == len(geoclaw_fields):
+        return ['level', 't'] + geoclaw_fields
+    return ['level', 't'] + ['q%i' % (m + 1) for m in range(nq)]
+
+
+def _source_state(fnames):
+    return [[os.path.basename(f), os.path.getsize(f),
+             os.path.getmtime(f)] for f in fnames]
+
+
+def cache_is_current(outdir='_output', cachedir=None):
+    """True if the cache in cachedir was built from the current gauge files."""
+    if cachedir is None:
+        cachedir = os.path.join(outdir, cache_dirname)
+    manifest = os.path.join(cachedir, 'manifest.json')
+    if not os.path.exists(manifest):
+        return False
+    with open(manifest) as f:
+        sources = json.load(f)['sources']
+    return sources == _source_state(list_gauge_files(outdir))
+
+
+def build_cache(outdir='_output', cachedir=None, chunk_lines=100000,
+                force=False, verbose=False):
+    """
+    Parse the gauge files in outdir into the columnar cache.
+
+    Memory use is bounded by chunk_lines: each file is counted once, the
+    .npy files are preallocated at their final size, and the rows are then
+    parsed and copied in chunks of at most chunk_lines lines.
+
+    OUTPUT:
+        cachedir - where the cache was written
+    """
+    if cachedir is None:
+        cachedir = os.path.join(outdir, cache_dirname)
+    if not force and cache_is_current(outdir, cachedir):
+        return cachedir
+    if not os.path.isdir(cachedir):
+        os.makedirs(cachedir)
+
+    fnames = list_gauge_files(outdir)
+    if not fnames:
+        raise IOError("*** No gauge files in %s" % outdir)
+
+    index = np.zeros(len(fnames), dtype=index_dtype)
+    ncols = 0
+    start = 0
+    for k, fname in enumerate(fnames):
+        nrows, nc = _count_rows(fname)
+        ncols = max(ncols, nc)
+        gaugeno, x, y = read_gauge_header(fname)
+        index[k] = (gaugeno, x, y, start, start + nrows)
+        start += nrows
+    total = start
+
+    names = field_names(ncols)
+    fields = {}
+    for name in names:
+        dtype = np.int16 if name == 'level' else np.float64
+        fields[name] = np.lib.format.open_memmap(
+            os.path.join(cachedir, name + '.npy'), mode='w+', dtype=dtype,
+            shape=(total,))
+
+    for k, fname in enumerate(fnames):
+        row = index['start'][k]
+        with open(fname) as f:
+            lines = _data_lines(f)
+            while True:
+                chunk = list(islice(lines, chunk_lines))
+                if not chunk:
+                    break
+                values = np.array(' '.join(chunk).replace('D', 'E').split(),
+                                  dtype=np.float64).reshape((len(chunk), -1))
+                for m, name in enumerate(names):
+                    fields[name][row:row + len(chunk)] = values[:, m]
+                row += len(chunk)
+        if verbose:
+            print("  %s: %i rows" % (os.path.basename(fname),
+                                     index['stop'][k] - index['start'][k]))
+
+    for array in fields.values():
+        array.flush()
+    del fields
+    np.save(os.path.join(cachedir, 'index.npy'), index)
+    with open(os.path.join(cachedir, 'manifest.json'), 'w') as f:
+        json.dump({'fields': names, 'sources': _source_state(fnames)}, f)
+    return cachedir
+
+
+class GaugeCache(object):
+    """
+    Memory-mapped gauge data.  fields maps column names to 1d arrays with
+    the rows of all gauges; gauge(n) returns the rows of gauge n.
+    """
+
+    def __init__(self, cachedir):
+        self.cachedir = cachedir
+        with open(os.path.join(cachedir, 'manifest.json')) as f:
+            self.names = json.load(f)['fields']
+        self.index = np.load(os.path.join(cachedir, 'index.npy'))
+        self.fields = dict((name, np.load(os.path.join(cachedir,
+                                                       name + '.npy'),
+                                          mmap_mode='r'))
+                           for name in self.names)
+        self._row = dict((int(g), k)
+                         for k, g in enumerate(self.index['gaugeno']))
+
+    @property
+    def gaugenos(self):
+        return self.index['gaugeno']
+
+    def location(self, gaugeno):
+        entry = self.index[self._row[gaugeno]]
+        return entry['x'], entry['y']
+
+    def gauge(self, gaugeno):
+        """Return a dict of views of the columns of gauge gaugeno."""
+        entry = self.index[self._row[gaugeno]]
+        s = slice(entry['start'], entry['stop'])
+        return dict((name, self.fields[name][s]) for name in self.names)
+
+
+def load_cache(outdir='_output', cachedir=None, **kwargs):
+    """
+    Return a GaugeCache for outdir, building or refreshing it first if
+    needed (kwargs are passed to build_cache).
+    """
+    return GaugeCache(build_cache(outdir, cachedir, **kwargs))
+
+
+if __name__ == '__main__':
+    # Build the cache, e.g.  python gaugeio.py _output
+    import sys
+    outdir = sys.argv[1] if len(sys.argv) > 1 else '_output'
+    cache = load_cache(outdir, verbose=True)
+    print("Cached %i gauges, %i rows, fields %s in %s"
+          % (len(cache.index), cache.fields['t'].size,
+             ', '.join(cache.names), cache.cachedir))
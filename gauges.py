@@ -0,0 +1,98 @@
+"""
+Gauge tables for setrun.py.
+
+A gauge table is a CSV file (comment lines starting with #) or a .npy
+array with one row per gauge:
+    gaugeno, x, y [, t1, t2, min_time_increment]
+The time columns are optional; missing ones are filled in from the
+defaults passed to load_gauges, so that the usual table only holds the
+positions of the stations.
+
+"""
+from __future__ import absolute_import
+from __future__ import print_function
+import numpy as np
+
+
+# default output window and interval of the cross-section gauges:
+gauge_t1 = 0.
+gauge_t2 = 226800.
+gauge_dt = 660.
+
+
+def read_table(fname):
+    """Return the gauge table in fname as a 2d float array."""
+    if fname.endswith('.npy'):
+        table = np.load(fname)
+    else:
+        table = np.loadtxt(fname, delimiter=',', comments='#', ndmin=2)
+    table = np.atleast_2d(np.asarray(table, dtype=np.float64))
+    if table.shape[1] not in (3, 6):
+        raise ValueError("*** %s: expected 3 or 6 columns, found %i"
+                         % (fname, table.shape[1]))
+    return table
+
+
+def write_table(fname, gaugeno, x, y, header=''):
+    """Write gauge numbers and positions to a CSV (or .npy) gauge table."""
+    table = np.column_stack((gaugeno, x, y))
+    if fname.endswith('.npy'):
+        np.save(fname, table)
+    else:
+        np.savetxt(fname, table, fmt=['%i', '%.6f', '%.6f'], delimiter=',',
+                   header=header)
+
+
+def check_gauges(table, lower=None, upper=None):
+    """
+    Raise ValueError if gauge numbers are not unique integers or if any
+    gauge lies outside the rectangle [lower[0],upper[0]] x [lower[1],upper[1]].
+    """
+    gaugeno = table[:, 0]
+    if np.any(gaugeno != np.round(gaugeno)):
+        raise ValueError("*** Gauge numbers must be integers")
+    unique, counts = np.unique(gaugeno, return_counts=True)
+    if np.any(counts > 1):
+        raise ValueError("*** Duplicate gauge numbers: %s"
+                         % unique[counts > 1].astype(int).tolist())
+    if lower is not None and upper is not None:
+        x, y = table[:, 1], table[:, 2]
+        outside = (x < lower[0]) | (x > upper[0]) \
+                  | (y < lower[1]) | (y > upper[1])
+        if np.any(outside):
+            raise ValueError("*** Gauges outside the domain: %s"
+                             % gaugeno[outside].astype(int).tolist())
+
+
+def load_gauges(fname, lower=None, upper=None, t1=gauge_t1, t2=gauge_t2,
+                dt=gauge_dt):
+    """
+    Read a gauge table and return it in the form expected by
+    rundata.gaugedata.gauges, i.e. a list of
+        [gaugeno, x, y, t1, t2, min_time_increment]
+
+    INPUT:
+        fname - CSV or .npy gauge table
+        lower, upper - domain corners (clawdata.lower, clawdata.upper);
+                       gauges outside raise ValueError
+        t1, t2, dt - used when the table has no time columns
+    """
+    table = read_table(fname)
+    check_gauges(table, lower, upper)
+    if table.shape[1] == 3:
+        times = np.empty((table.shape[0], 3))
+        times[:] = [t1, t2, dt]
+        table = np.hstack((table, times))
+    gauges = table.tolist()
+    for gauge in gauges:
+        gauge[0] = int(gauge[0])
+    return gauges
+
+
+if __name__ == '__main__':
+    # Check a gauge table, e.g.  python gauges.py gauges_xs.csv
+    import sys
+    fname = sys.argv[1] if len(sys.argv) > 1 else 'gauges_xs.csv'
+    gauges = load_gauges(fname)
+    print("%s: %i gauges, numbers %i to %i"
+          % (fname, len(gauges), gauges[0][0], gauges[-1][0]))
@@ -0,0 +1,199 @@
+"""
+Peak discharge, stage and arrival time at the cross-section gauges.
+
+The gauge output is read through the column cache of gaugeio.py.  The
+gauges are split into contiguous blocks that are reduced in a process
+pool, each block with one pass of segmented NumPy reductions over its
+rows.  The result is one table ordered by distance downstream, measured
+along the line through the gauges in gauge number order.
+
+Discharge is per unit width, |(hu, hv)| in m^2/s, since each gauge is a
+point of the cross section.  The arrival time is the first time the
+surface has risen by more than arrival_tol above its initial value.  The
+flood passes a gauge from flow_start to flow_end, the first and last time
+the discharge exceeds passage_fraction of its peak (this also holds in the
+lake, where the surface falls).
+
+Example:
+    python gaugestats.py _output -j 8 -o gauge_summary.csv
+
+"""
+from __future__ import absolute_import
+from __future__ import print_function
+import os
+import numpy as np
+
+from gaugeio import load_cache, GaugeCache
+from makegauges import arc_length
+
+# rise of eta (m) above its initial value that counts as arrival:
+arrival_tol = 0.1
+
+# fraction of the peak discharge that bounds the passage of the flood:
+passage_fraction = 0.05
+
+summary_fields = ['gaugeno', 'x', 'y', 'distance_km', 'arrival_time',
+                  'peak_h', 'peak_eta', 't_peak_eta', 'peak_q', 't_peak_q',
+                  'flow_start', 'flow_end']
+
+_cache = None
+
+
+def _init_worker(cachedir):
+    global _cache
+    _cache = GaugeCache(cachedir)
+
+
+def _first_true(mask, starts, stops):
+    """Index of the first True of mask in each [start, stop), or -1."""
+    idx = np.flatnonzero(mask)
+    pos = np.searchsorted(idx, starts)
+    first = np.full(len(starts), -1, dtype=np.int64)
+    found = pos < len(idx)
+    found[found] = idx[pos[found]] < stops[found]
+    first[found] = idx[pos[found]]
+    return first
+
+
+def _last_true(mask, starts, stops):
+    """Index of the last True of mask in each [start, stop), or -1."""
+    idx = np.flatnonzero(mask)
+    pos = np.searchsorted(idx, stops) - 1
+    last = np.full(len(starts), -1, dtype=np.int64)
+    found = pos >= 0
+    found[found] = idx[pos[found]] >= starts[found]
+    last[found] = idx[pos[found]]
+    return last
+
+
+def _segment_peak(values, t, starts, stops):
+    """Max of values over each segment and the first time it is reached."""
+    peak = np.maximum.reduceat(values, starts)
+    lengths = stops - starts
+    first = _first_true(values == np.repeat(peak, lengths), starts, stops)
+    return peak, t[first]
+
+
+def block_stats(block, cache=None, tol=arrival_tol):
+    """
+    Statistics for the gauges with index entries block[0]:block[1] of
+    the cache (the worker's cache if None), as a dict of arrays.
+    """
+    if cache is None:
+        cache = _cache
+    index = cache.index[block[0]:block[1]]
+    index = index[index['stop'] > index['start']]
+    row0, row1 = index['start'][0], index['stop'][-1]
+    starts = index['start'] - row0
+    stops = index['stop'] - row0
+
+    f = cache.fields
+    t = np.asarray(f['t'][row0:row1])
+    h = np.asarray(f['h'][row0:row1])
+    eta = np.asarray(f['eta'][row0:row1])
+    q = np.hypot(f['hu'][row0:row1], f['hv'][row0:row1])
+
+    stats = {}
+    stats['gaugeno'] = index['gaugeno']
+    stats['x'] = index['x']
+    stats['y'] = index['y']
+    stats['peak_h'] = np.maximum.reduceat(h, starts)
+    stats['peak_eta'], stats['t_peak_eta'] = _segment_peak(eta, t, starts,
+                                                           stops)
+    stats['peak_q'], stats['t_peak_q'] = _segment_peak(q, t, starts, stops)
+
+    eta0 = np.repeat(eta[starts], stops - starts)
+    first = _first_true(eta - eta0 > tol, starts, stops)
+    stats['arrival_time'] = np.where(first >= 0, t[first], np.nan)
+
+    passing = q > np.repeat(passage_fraction * stats['peak_q'],
+                            stops - starts)
+    first = _first_true(passing, starts, stops)
+    last = _last_true(passing, starts, stops)
+    stats['flow_start'] = np.where(first >= 0, t[first], np.nan)
+    stats['flow_end'] = np.where(last >= 0, t[last], np.nan)
+    return stats
+
+
+def _block_stats(args):
+    block, tol = args
+    return block_stats(block, tol=tol)
+
+
+def gauge_summary(outdir='_output', nprocs=None, tol=arrival_tol,
+                  blocks_per_proc=4):
+    """
+    Return the per-gauge summary as a structured array ordered by
+    distance downstream.
+
+    INPUT:
+        nprocs - size of the process pool (default: all cores); 1 runs
+                 in this process
+        tol - eta rise that defines the arrival time
+    """
+    import multiprocessing
+    cache = load_cache(outdir)
+    ngauges = len(cache.index)
+    if nprocs is None:
+        nprocs = multiprocessing.cpu_count()
+    nblocks = max(1, min(ngauges, nprocs * blocks_per_proc))
+    edges = np.linspace(0, ngauges, nblocks + 1).astype(int)
+    rows = cache.index['stop'] - cache.index['start']
+    blocks = [(a, b) for a, b in zip(edges[:-1], edges[1:])
+              if rows[a:b].sum() > 0]
+
+    if nprocs == 1:
+        results = [block_stats(b, cache, tol) for b in blocks]
+    else:
+        pool = multiprocessing.Pool(nprocs, _init_worker, (cache.cachedir,))
+        try:
+            results = pool.map(_block_stats, [(b, tol) for b in blocks])
+        finally:
+            pool.close()
+            pool.join()
+
+    stats = dict((name, np.concatenate([r[name] for r in results]))
+                 for name in results[0])
+
+    order = np.argsort(stats['gaugeno'])
+    for name in stats:
+        stats[name] = stats[name][order]
+    stats['distance_km'] = arc_length(stats['x'], stats['y']) / 1e3
+
+    summary = np.zeros(len(order), dtype=[(name, np.float64)
+                                          for name in summary_fields])
+    for name in summary_fields:
+        summary[name] = stats[name]
+    return summary[np.argsort(summary['distance_km'], kind='stable')]
+
+
+def write_summary(fname, summary):
+    """Write the summary table as CSV."""
+    fmt = ['%i', '%.6f', '%.6f', '%.3f'] + ['%.6g'] * (len(summary_fields) - 4)
+    np.savetxt(fname, np.column_stack([summary[name]
+                                       for name in summary_fields]),
+               fmt=fmt, delimiter=',', header=','.join(summary_fields),
+               comments='')
+
+
+def main():
+    import argparse
+    import time
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('outdir', nargs='?', default='_output')
+    parser.add_argument('-o', '--output', default=None,
+                        help='CSV file (default <outdir>/gauge_summary.csv)')
+    parser.add_argument('-j', '--nprocs', type=int, default=None)
+    parser.add_argument('--arrival-tol', type=float, default=arrival_tol)
+    args = parser.parse_args()
+
+    tstart = time.time()
+    summary = gauge_summary(args.outdir, args.nprocs, args.arrival_tol)
+    fname = args.output or os.path.join(args.outdir, 'gauge_summary.csv')
+    write_summary(fname, summary)
+    print("Wrote %i gauges to %s in %.1f s"
+          % (len(summary), fname, time.time() - tstart))
+
+
+if __name__ == '__main__':
+    main()
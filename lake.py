@@ -0,0 +1,190 @@
+"""
+Outline, depth and volume of the lake filled by qinit.f90.
+
+The outline is a list of polygons, each a list of (x, y) vertices; a cell
+is in the lake if its centre is inside any of them.  By default these are
+the five boxes that used to be hard-coded in qinit.f90.  Another outline
+can be read from a text file with one "x y" (or "x, y") vertex per line
+and a blank line between polygons.
+
+setrun.py writes the stage and outline to lake.data through LakeData,
+which lake_module.f90 reads at the first call to qinit, so one xgeoclaw
+binary serves any lake level.  Alternatively
+makeqinit.py computes the lake depth once on a grid and writes the lake
+surface as a qinit file.
+
+"""
+from __future__ import absolute_import
+from __future__ import print_function
+import os
+import numpy as np
+
+from clawpack.clawutil import data
+
+
+# lake level (m) giving the 81 km^3 lake:
+lake_stage = 3088.
+
+# same as geo_data.earth_radius in setrun.py:
+earth_radius = 6367.5e3
+
+# boxes [x1, x2, y1, y2] of the original qinit.f90, box 4 contains the dam:
+lake_boxes = [[93.0, 93.53, 28.94, 29.23],
+              [93.53, 94.3, 29.05, 29.31],
+              [94.3, 94.49, 29.23, 29.4],
+              [94.33, 94.96, 29.4, 29.6],
+              [94.02, 94.46, 29.6, 29.78]]
+
+
+def box_polygon(box):
+    """The polygon (counterclockwise vertices) of box [x1, x2, y1, y2]."""
+    x1, x2, y1, y2 = box
+    return [(x1, y1), (x2, y1), (x2, y2), (x1, y2)]
+
+
+lake_polygons = [box_polygon(box) for box in lake_boxes]
+
+
+def read_polygons(fname):
+    """Read polygons from fname, vertices "x y" separated by blank lines."""
+    polygons = []
+    polygon = []
+    with open(fname) as f:
+        for line in f:
+            line = line.split('#')[0].replace(',', ' ').strip()
+            if not line:
+                if polygon:
+                    polygons.append(polygon)
+                polygon = []
+                continue
+            x, y = [float(v) for v in line.split()[:2]]
+            polygon.append((x, y))
+    if polygon:
+        polygons.append(polygon)
+    for polygon in polygons:
+        if len(polygon) < 3:
+            raise ValueError("*** %s: polygon with fewer than 3 vertices"
+                             % fname)
+    return polygons
+
+
+def lake_mask(x, y, polygons=lake_polygons):
+    """
+    Boolean mask[j,i], True where (x[i], y[j]) is strictly inside one of
+    the polygons (even-odd rule, one pass per polygon edge).  The rule is
+    that of fill_lake in lake_module.f90: rows on or beyond the lowest or
+    highest vertex and points on a crossing edge are outside.
+    """
+    X = np.asarray(x)[None, :]
+    Y = np.asarray(y)[:, None]
+    mask = np.zeros((len(y), len(x)), dtype=bool)
+    for polygon in polygons:
+        vx, vy = np.array(polygon, dtype=np.float64).T
+        inside = np.zeros_like(mask)
+        on_edge = np.zeros_like(mask)
+        for xa, ya, xb, yb in zip(vx, vy, np.roll(vx, -1), np.roll(vy, -1)):
+            if ya == yb:
+                continue
+            crosses = (ya > Y) != (yb > Y)
+            xcross = xa + (Y - ya) * (xb - xa) / (yb - ya)
+            inside ^= crosses & (X < xcross)
+            on_edge |= crosses & (X == xcross)
+        mask |= inside & ~on_edge & (Y > vy.min()) & (Y < vy.max())
+    return mask
+
+
+def lake_depth(x, y, B, stage=lake_stage, polygons=lake_polygons):
+    """Depth max(0, stage - B) inside the lake outline, 0 outside."""
+    depth = np.maximum(0., stage - np.asarray(B))
+    depth[~lake_mask(x, y, polygons)] = 0.
+    return depth
+
+
+def lake_surface(x, y, B, stage=lake_stage, polygons=lake_polygons):
+    """
+    Water surface for a GeoClaw surface qinit file (qinit_type 4, which
+    sets h = max(eta - B, 0)): stage where the lake has water, and the
+    bed elsewhere, its lowest value among the point and its 8 neighbours
+    so that little water is added where the file is interpolated onto
+    finer topography, without the surface dropping away at the shore.
+    """
+    depth = lake_depth(x, y, B, stage, polygons)
+    B = np.asarray(B, dtype=np.float64)
+    padded = np.pad(B, 1, mode='edge')
+    ny, nx = B.shape
+    bed = np.min([padded[j:j + ny, i:i + nx]
+                  for j in range(3) for i in range(3)], axis=0)
+    return np.where(depth > 0., stage, bed)
+
+
+def cell_areas(x, y):
+    """Area (m^2) of the lon/lat cells centred at x[i], y[j], as [j,i]."""
+    dx = np.radians(x[1] - x[0])
+    dy = np.radians(y[1] - y[0])
+    area = earth_radius**2 * dx * dy * np.cos(np.radians(y))
+    return np.repeat(area[:, None], len(x), axis=1)
+
+
+def lake_volume(x, y, depth):
+    """Volume (m^3) of water of the given depth on the grid x, y."""
+    return float((depth * cell_areas(x, y)).sum())
+
+
+def hypsometry(x, y, B, polygons=lake_polygons, dz=0.5):
+    """
+    Stage-area-volume curve of the lake outline on the grid x, y with bed
+    B[j,i], every dz metres from the lowest bed point up to the highest.
+    With the bed elevations b_k and cell areas a_k sorted by elevation,
+        area(s) = sum_{b_k < s} a_k
+        volume(s) = s * area(s) - sum_{b_k < s} a_k b_k
+    which is evaluated for all stages at once from two cumulative sums.
+
+    OUTPUT:
+        stage, area, volume - 1d arrays (m, m^2, m^3)
+    """
+    mask = lake_mask(x, y, polygons)
+    b = np.asarray(B)[mask]
+    a = cell_areas(x, y)[mask]
+    order = np.argsort(b, kind='stable')
+    b, a = b[order], a[order]
+    cum_a = np.concatenate(([0.], np.cumsum(a)))
+    cum_ab = np.concatenate(([0.], np.cumsum(a * b)))
+
+    stage = np.arange(b[0], b[-1] + dz, dz)
+    k = np.searchsorted(b, stage)
+    area = cum_a[k]
+    volume = stage * area - cum_ab[k]
+    return stage, area, volume
+
+
+def write_qinit(fname, x, y, values):
+    """
+    Write values[j,i] as a GeoClaw qinit file: "x y value" lines with x
+    varying fastest, starting from the north-west corner.
+    """
+    X, Y = np.meshgrid(x, y[::-1])
+    np.savetxt(fname, np.column_stack((X.ravel(), Y.ravel(),
+                                       values[::-1, :].ravel())),
+               fmt='%.8f %.8f %.3f')
+
+
+class LakeData(data.ClawData):
+    """
+    Lake stage and outline written to lake.data for lake_module.f90.
+    """
+
+    def __init__(self):
+        super(LakeData, self).__init__()
+        self.add_attribute('stage', lake_stage)
+        self.add_attribute('polygons', lake_polygons)
+
+    def write(self, data_source='setrun.py', out_dir=''):
+        self.open_data_file(os.path.join(out_dir, 'lake.data'), data_source)
+        self.data_write('stage')
+        self.data_write(value=len(self.polygons), alt_name='num_polygons')
+        for polygon in self.polygons:
+            self.data_write()
+            self.data_write(value=len(polygon), alt_name='num_vertices')
+            for x, y in polygon:
+                self._out_file.write("%.10f %.10f\n" % (x, y))
+        self.close_data_file()
@@ -0,0 +1,139 @@
+! Lake stage and outline read from lake.data (written by setrun.py, see
+! lake.py) and the row-span fill used by qinit.
+module lake_module
+
+    implicit none
+    save
+
+    logical :: lake_initialized = .false.
+
+    ! Lake level (m)
+    real(kind=8) :: lake_stage
+
+    ! Polygons: vertices poly_start(p):poly_end(p) of vx, vy
+    integer :: num_polygons
+    integer, allocatable :: poly_start(:), poly_end(:)
+    real(kind=8), allocatable :: vx(:), vy(:)
+
+    ! Bounding box (x1,x2,y1,y2) of each polygon and of the whole lake
+    real(kind=8), allocatable :: poly_box(:,:)
+    real(kind=8) :: lake_box(4)
+
+contains
+
+    subroutine read_lake_data(fname)
+
+        implicit none
+        character(len=*), intent(in) :: fname
+
+        integer, parameter :: iunit = 7
+        integer :: p, k, n, nv
+
+        call opendatafile(iunit, fname)
+
+        read(iunit,*) lake_stage
+        read(iunit,*) num_polygons
+        allocate(poly_start(num_polygons), poly_end(num_polygons))
+        allocate(poly_box(4,num_polygons))
+
+        ! Read polygons into a growing vertex list
+        allocate(vx(0), vy(0))
+        n = 0
+        do p=1,num_polygons
+            read(iunit,*) nv
+            vx = [vx, (0.d0, k=1,nv)]
+            vy = [vy, (0.d0, k=1,nv)]
+            do k=n+1,n+nv
+                read(iunit,*) vx(k), vy(k)
+            enddo
+            poly_start(p) = n + 1
+            poly_end(p) = n + nv
+            poly_box(:,p) = [minval(vx(n+1:n+nv)), maxval(vx(n+1:n+nv)), &
+                             minval(vy(n+1:n+nv)), maxval(vy(n+1:n+nv))]
+            n = n + nv
+        enddo
+        close(iunit)
+
+        lake_box = [minval(poly_box(1,:)), maxval(poly_box(2,:)), &
+                    minval(poly_box(3,:)), maxval(poly_box(4,:))]
+        lake_initialized = .true.
+
+    end subroutine read_lake_data
+
+
+    ! Set q(1) = max(0, stage - B) in the cells whose centres are strictly
+    ! inside the lake (the rule of lake.lake_mask) and q(1) = 0 elsewhere.
+    ! Patches missing the lake bounding box are rejected at once;
+    ! otherwise, for each row the crossings of the polygon edges are sorted
+    ! into spans and only the cells inside them are touched.
+    subroutine fill_lake(stage,meqn,mbc,mx,my,xlower,ylower,dx,dy,q,maux,aux)
+
+        implicit none
+        real(kind=8), intent(in) :: stage
+        integer, intent(in) :: meqn,mbc,mx,my,maux
+        real(kind=8), intent(in) :: xlower,ylower,dx,dy
+        real(kind=8), intent(inout) :: q(meqn,1-mbc:mx+mbc,1-mbc:my+mbc)
+        real(kind=8), intent(in) :: aux(maux,1-mbc:mx+mbc,1-mbc:my+mbc)
+
+        integer :: i1,i2,j,k,m,p,ncross
+        real(kind=8) :: y,xa,ya,xb,yb,xtmp
+        real(kind=8) :: xcross(size(vx))
+
+        q(1,:,:) = 0.d0
+
+        if (xlower + (mx+mbc)*dx < lake_box(1) .or. &
+            xlower - mbc*dx > lake_box(2) .or.      &
+            ylower + (my+mbc)*dy < lake_box(3) .or. &
+            ylower - mbc*dy > lake_box(4)) return
+
+        do j=1-mbc,my+mbc
+            y = ylower + (j - 0.5d0)*dy
+            if (y <= lake_box(3) .or. y >= lake_box(4)) cycle
+
+            do p=1,num_polygons
+                if (y <= poly_box(3,p) .or. y >= poly_box(4,p)) cycle
+
+                ! Crossings of row y with the edges of polygon p
+                ncross = 0
+                do k=poly_start(p),poly_end(p)
+                    xa = vx(k)
+                    ya = vy(k)
+                    if (k < poly_end(p)) then
+                        xb = vx(k+1)
+                        yb = vy(k+1)
+                    else
+                        xb = vx(poly_start(p))
+                        yb = vy(poly_start(p))
+                    endif
+                    if ((ya > y) .neqv. (yb > y)) then
+                        ncross = ncross + 1
+                        xcross(ncross) = xa + (y - ya)*(xb - xa)/(yb - ya)
+                    endif
+                enddo
+
+                ! Insertion sort, ncross is small
+                do k=2,ncross
+                    xtmp = xcross(k)
+                    m = k - 1
+                    do while (m >= 1)
+                        if (xcross(m) <= xtmp) exit
+                        xcross(m+1) = xcross(m)
+                        m = m - 1
+                    enddo
+                    xcross(m+1) = xtmp
+                enddo
+
+                ! Fill cells with centres strictly inside each span
+                do k=1,ncross-1,2
+                    i1 = max(1-mbc, floor((xcross(k) - xlower)/dx + 0.5d0) + 1)
+                    i2 = min(mx+mbc, ceiling((xcross(k+1) - xlower)/dx + 0.5d0) - 1)
+                    if (i1 <= i2) then
+                        q(1,i1:i2,j) = max(0.d0, stage - aux(1,i1:i2,j))
+                    endif
+                enddo
+            enddo
+        enddo
+
+    end subroutine fill_lake
+
+end module lake_module
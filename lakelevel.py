@@ -0,0 +1,87 @@
+"""
+Lake stage for a given lake volume, from a cached hypsometric curve.
+
+The stage-area-volume curve of the lake outline is built once from the
+DEM (see lake.hypsometry) and cached in lake_hypsometry.npz, keyed by the
+DEM contents and the outline.  Volumes are then turned into stages by
+interpolation, so the members of a volume ensemble need neither a
+recompile of qinit.f90 nor trial and error on the lake level.
+
+Examples:
+    python lakelevel.py 10 81 500          # stages for volumes in km^3
+    python lakelevel.py --stage 3088       # volume for a stage
+
+"""
+from __future__ import absolute_import
+from __future__ import print_function
+import os
+import json
+import numpy as np
+
+from topoio import load_topo, file_hash
+from maketopo import topo_fname, crop
+from makeqinit import lake_extent
+from lake import hypsometry, lake_polygons
+
+cache_fname = 'lake_hypsometry.npz'
+
+
+def load_hypsometry(polygons=lake_polygons, fname=topo_fname,
+                    cache=cache_fname, dz=0.5, force=False):
+    """
+    Return the curve as a dict with arrays 'stage', 'area', 'volume',
+    from cache if it was built from the same DEM, outline and dz.
+    """
+    polygons = [[list(map(float, v)) for v in p] for p in polygons]
+    key = json.dumps({'sha1': file_hash(fname), 'polygons': polygons,
+                      'dz': dz}, sort_keys=True)
+    if not force and os.path.exists(cache):
+        cached = np.load(cache)
+        if str(cached['key']) == key:
+            return dict((name, cached[name])
+                        for name in ('stage', 'area', 'volume'))
+
+    x, y, Z, header = load_topo(fname)
+    x, y, B = crop(x, y, Z, *lake_extent(polygons, header['cellsize']))
+    stage, area, volume = hypsometry(x, y, B, polygons, dz)
+    np.savez(cache, key=key, stage=stage, area=area, volume=volume)
+    return {'stage': stage, 'area': area, 'volume': volume}
+
+
+def stage_for_volume(volume, curve):
+    """Stage (m) at which the lake holds volume (m^3)."""
+    if np.any(np.asarray(volume) > curve['volume'][-1]):
+        raise ValueError("*** Volume exceeds the lake outline's capacity "
+                         "of %.1f km^3" % (curve['volume'][-1] / 1e9))
+    return np.interp(volume, curve['volume'], curve['stage'])
+
+
+def volume_for_stage(stage, curve):
+    """Volume (m^3) of the lake at stage (m)."""
+    return np.interp(stage, curve['stage'], curve['volume'])
+
+
+def main():
+    import argparse
+    from setrun import setrun
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('volumes', nargs='*', type=float,
+                        help='lake volumes in km^3')
+    parser.add_argument('--stage', nargs='*', type=float, default=[],
+                        help='lake stages in m')
+    parser.add_argument('--force', action='store_true')
+    args = parser.parse_args()
+
+    curve = load_hypsometry(setrun().lake_data.polygons, force=args.force)
+    for v in args.volumes:
+        s = stage_for_volume(v * 1e9, curve)
+        area = np.interp(s, curve['stage'], curve['area'])
+        print("%10.2f km^3  stage %8.2f m  area %8.1f km^2"
+              % (v, s, area / 1e6))
+    for s in args.stage:
+        print("%10.2f m  volume %8.2f km^3"
+              % (s, volume_for_stage(s, curve) / 1e9))
+
+
+if __name__ == '__main__':
+    main()
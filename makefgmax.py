@@ -0,0 +1,279 @@
+"""
+Build the fgmax point set where the flood can reach.
+
+GeoClaw updates the maxima at every fgmax point on every step of the
+levels it checks, so the points should cover the inundated area and not
+its bounding box.  The points are the cell centres of fgmax_level (with
+dy = dx) on the domain, kept where
+  - pilot: the depth of the pilot run (setrun(pilot=True), regiontune.py)
+    exceeds reach_depth in some frame, widened by mask_margin pilot cells,
+  - hand: the DEM, averaged to the cell size of fgmax_level, is less than
+    hand_max above the channel bed at the nearest cross-section gauge and
+    the gauge is within channel_distance,
+and every point inside the lake outline is added to either set.  Points
+where no region or topography file ever allows fgmax_level are dropped:
+GeoClaw only updates a point from grids of min_level_check or finer.
+With mega_fill.txt registered up to level 5 over the whole domain this
+drops nothing; it does with a region table (setrun.table_topo_maxlevel)
+or with the tiles of maketopo.py.
+
+GeoClaw records the arrival time of a point when its surface rises more
+than fgmax_arrival_tol above sea_level (0 m), which in this valley (and
+the lake at about 3000 m) holds wherever there is water: the arrival
+time is the first time a point is wet, the initial time inside the lake.
+Use gaugestats.py for arrival as a rise above the initial surface.
+The points are written in
+the compact array format of GeoClaw 5.6 (point_style 4): a topotype 3
+file fgmax_flood.tt3 over the bounding box of the points with 1 at a
+point and 0 elsewhere, referenced by the fgmax input file fgmax_flood.txt.
+setgeo() in setrun.py registers fgmax_flood.txt when it exists, set
+MEGAFLOOD_FGMAX_FILE=none to run without fgmax.
+
+Run with
+    python makefgmax.py [--source pilot|hand] [--level 4] [--force]
+
+"""
+from __future__ import absolute_import
+from __future__ import print_function
+import os
+import json
+import numpy as np
+
+from topoio import load_topo, write_topo, file_hash
+from maketopo import topo_fname, level_dx, coarsen
+from lake import lake_mask, earth_radius
+from regions import level_maps, topo_regions
+
+fgmax_fname = 'fgmax_flood.txt'
+points_fname = 'fgmax_flood.tt3'
+meta_fname = 'fgmax_flood.json'
+
+# points are the cells of this level, which is also min_level_check:
+fgmax_level = 4
+
+# time window and interval (s) of the updates, 0 = every step:
+fgmax_tstart = 0.
+fgmax_tend = 1.e10
+fgmax_dt_check = 10.
+
+# rise (m) of the surface above sea_level that counts as arrival (see
+# above, GeoClaw's default):
+fgmax_arrival_tol = 1.e-2
+
+# pilot: depth (m) that counts as reached, and padding in pilot cells:
+reach_depth = 0.1
+mask_margin = 2
+
+# hand: height (m) above the channel bed and distance (m) from the nearest
+# gauge within which a point can be flooded:
+hand_max = 300.
+channel_distance = 10000.
+
+# DEM cells around a gauge searched for the channel bed:
+bed_cells = 2
+
+
+def fgmax_grid(lower, upper, dx):
+    """Cell centres x, y of cells of size dx x dx covering the domain."""
+    nx = int(round((upper[0] - lower[0]) / dx))
+    ny = int(round((upper[1] - lower[1]) / dx))
+    return (lower[0] + (np.arange(nx) + 0.5) * dx,
+            lower[1] + (np.arange(ny) + 0.5) * dx)
+
+
+def _dilate(mask, n):
+    grown = mask.copy()
+    for _ in range(n):
+        grown[1:, :] |= grown[:-1, :].copy()
+        grown[:-1, :] |= grown[1:, :].copy()
+        grown[:, 1:] |= grown[:, :-1].copy()
+        grown[:, :-1] |= grown[:, 1:].copy()
+    return grown
+
+
+def _nearest_index(centres, values):
+    """Index of the cell (of the uniform centres) containing each value."""
+    d = centres[1] - centres[0]
+    k = np.floor((np.asarray(values) - centres[0]) / d + 0.5).astype(int)
+    return np.clip(k, 0, len(centres) - 1)
+
+
+def pilot_mask(outdir, x, y, lower, upper, depth_tol=reach_depth,
+               margin=mask_margin):
+    """
+    True at the points x[i], y[j] whose pilot cell was deeper than
+    depth_tol in some frame of outdir, or within margin cells of one.
+    """
+    from frameio import list_frames, read_frame, fill_grid
+    from regiontune import pilot_grid
+    xp, yp = pilot_grid(outdir, lower, upper)
+    dx, dy = xp[1] - xp[0], yp[1] - yp[0]
+    reached = np.zeros((len(yp), len(xp)), dtype=bool)
+    for frameno in list_frames(outdir):
+        t, patches = read_frame(frameno, outdir)
+        depth = fill_grid(patches, xp[0] - dx / 2, yp[0] - dy / 2, dx, dy,
+                          len(xp), len(yp), fill=0.)[0]
+        reached |= depth > depth_tol
+    reached = _dilate(reached, margin)
+    return reached[np.ix_(_nearest_index(yp, y), _nearest_index(xp, x))]
+
+
+def channel_bed(gauges, xb, yb, B, cells=bed_cells):
+    """Lowest value of B[j,i] within cells of each gauge [gaugeno, x, y]."""
+    bed = []
+    for g in gauges:
+        i = _nearest_index(xb, g[1])
+        j = _nearest_index(yb, g[2])
+        bed.append(B[max(j - cells, 0):j + cells + 1,
+                     max(i - cells, 0):i + cells + 1].min())
+    return np.array(bed)
+
+
+def hand_mask(x, y, xb, yb, B, gauges, height=hand_max,
+              distance=channel_distance):
+    """
+    True at the points x[i], y[j] less than height above the channel bed
+    at the nearest gauge, if it is within distance.  The DEM B[j,i] at
+    xb[i], yb[j] is sampled at the nearest node.  Each gauge only updates
+    the points within distance of it, so the work grows with the length
+    of the valley and not the area of the domain.
+    """
+    bed = channel_bed(gauges, xb, yb, B)
+    Z = np.asarray(B)[np.ix_(_nearest_index(yb, y), _nearest_index(xb, x))]
+    nearest = np.full(Z.shape, np.inf)
+    height_above = np.full(Z.shape, np.inf)
+    dy = np.degrees(distance / earth_radius)
+    for g, b in zip(gauges, bed):
+        gx, gy = g[1], g[2]
+        dx = dy / np.cos(np.radians(gy))
+        i1, i2 = np.searchsorted(x, [gx - dx, gx + dx])
+        j1, j2 = np.searchsorted(y, [gy - dy, gy + dy])
+        if i1 == i2 or j1 == j2:
+            continue
+        window = (slice(j1, j2), slice(i1, i2))
+        d = earth_radius * np.hypot(
+            np.radians(x[None, i1:i2] - gx) * np.cos(np.radians(gy)),
+            np.radians(y[j1:j2, None] - gy))
+        closer = d < nearest[window]
+        nearest[window][closer] = d[closer]
+        height_above[window][closer] = (Z[window] - b)[closer]
+    return (nearest <= distance) & (height_above <= height)
+
+
+def level_mask(regions, x, y, level, levels_max):
+    """
+    True at the points x[i], y[j] where some region (at any time) allows
+    level.  regions should include the topography files (topo_regions),
+    since GeoClaw allows the finest level of both.
+    """
+    anytime = [list(r[:2]) + [0., 1.e10] + list(r[4:8]) for r in regions]
+    return level_maps(anytime, x, y, 0., levels_max)[1] >= level
+
+
+def write_fgmax(fname, points_file, mask, x, y, level):
+    """
+    Write mask[j,i] (points at x[i], y[j]) cropped to its bounding box as
+    the topotype 3 file points_file and the point_style 4 fgmax input
+    file fname referencing it.
+
+    OUTPUT:
+        extent - [x1, x2, y1, y2] of the points file
+    """
+    rows = np.flatnonzero(mask.any(axis=1))
+    cols = np.flatnonzero(mask.any(axis=0))
+    if len(rows) == 0:
+        raise ValueError("*** no fgmax points")
+    j1, j2, i1, i2 = rows[0], rows[-1] + 1, cols[0], cols[-1] + 1
+    write_topo(points_file, x[i1:i2], y[j1:j2],
+               mask[j1:j2, i1:i2].astype(np.int8), fmt='%i')
+    with open(fname, 'w') as f:
+        f.write("%16.10e            # tstart_max\n" % fgmax_tstart)
+        f.write("%16.10e            # tend_max\n" % fgmax_tend)
+        f.write("%16.10e            # dt_check\n" % fgmax_dt_check)
+        f.write("%i                           # min_level_check\n" % level)
+        f.write("%16.10e            # arrival_tol\n" % fgmax_arrival_tol)
+        f.write("4                           # point_style\n")
+        f.write("%s\n" % os.path.abspath(points_file))
+    return [float(x[i1]), float(x[i2 - 1]), float(y[j1]), float(y[j2 - 1])]
+
+
+def make_fgmax(rundata, source='hand', pilot='_pilot', level=fgmax_level,
+               fname=topo_fname, force=False, verbose=True):
+    """
+    Write the fgmax points for rundata from the pilot run in pilot or from
+    the DEM fname (source 'pilot' or 'hand'), unless they were made from
+    the same inputs.
+
+    OUTPUT:
+        meta - dict with the number of points and the extent of the file
+    """
+    clawdata = rundata.clawdata
+    polygons = [[list(v) for v in p] for p in rundata.lake_data.polygons]
+    gauges = [list(g[:3]) for g in rundata.gaugedata.gauges]
+    outdir = os.path.join(pilot, '_output')
+    regions = [[float(v) for v in r] for r in
+               list(rundata.regiondata.regions)
+               + topo_regions(rundata.topo_data.topofiles)]
+    key = {'source': source, 'level': level, 'polygons': polygons,
+           'regions': regions}
+    if source == 'pilot':
+        from checkpoint import wall_profile
+        profile = wall_profile(outdir)
+        if profile is None:
+            raise IOError("*** no pilot frames in %s, run regiontune.py "
+                          "--run first" % outdir)
+        key['pilot'] = [os.path.abspath(outdir), profile[0][-1],
+                        reach_depth, mask_margin]
+    elif source == 'hand':
+        if not gauges:
+            raise ValueError("*** source 'hand' needs the gauge line")
+        key['hand'] = [file_hash(fname), gauges, hand_max, channel_distance]
+    else:
+        raise ValueError("*** unknown source %r" % source)
+    if not force and os.path.exists(meta_fname) \
+            and os.path.exists(fgmax_fname) and os.path.exists(points_fname):
+        with open(meta_fname) as f:
+            meta = json.load(f)
+        if meta.get('key') == key:
+            if verbose:
+                print("%s is up to date, %i points" % (fgmax_fname,
+                                                       meta['points']))
+            return meta
+
+    dx = level_dx(rundata)[level - 1]
+    x, y = fgmax_grid(clawdata.lower, clawdata.upper, dx)
+    if source == 'pilot':
+        mask = pilot_mask(outdir, x, y, clawdata.lower, clawdata.upper)
+    else:
+        xb, yb, Z, header = load_topo(fname)
+        factor = max(1, int(round(dx / header['cellsize'])))
+        xb, yb, B = coarsen(xb, yb, Z, factor, header['nodata_value'])
+        mask = hand_mask(x, y, xb, yb, B, gauges)
+    mask |= lake_mask(x, y, polygons)
+    mask &= level_mask(regions, x, y, level, rundata.amrdata.amr_levels_max)
+
+    extent = write_fgmax(fgmax_fname, points_fname, mask, x, y, level)
+    meta = {'key': key, 'points': int(mask.sum()), 'dx': dx,
+            'extent': extent}
+    with open(meta_fname, 'w') as f:
+        json.dump(meta, f, indent=1)
+    if verbose:
+        print("Wrote %s: %i points (%s), %.1f%% of the domain at level %i"
+              % (fgmax_fname, meta['points'], source,
+                 100. * meta['points'] / mask.size, level))
+    return meta
+
+
+if __name__ == '__main__':
+    import argparse
+    from setrun import setrun
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--source', choices=['pilot', 'hand'],
+                        default='hand')
+    parser.add_argument('--pilot', default='_pilot',
+                        help='pilot directory (with _output)')
+    parser.add_argument('--level', type=int, default=fgmax_level)
+    parser.add_argument('--force', action='store_true')
+    args = parser.parse_args()
+    make_fgmax(setrun(), args.source, args.pilot, args.level,
+               force=args.force)
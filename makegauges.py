@@ -0,0 +1,155 @@
+"""
+Generate cross-section gauges at a fixed spacing along the river.
+
+The centreline is either given as a polyline (CSV of longitude, latitude,
+upstream to downstream) or traced through the topography by steepest
+descent from a start point.  It is then resampled by arc length so that
+consecutive gauges are `spacing` metres apart, and written as a gauge
+table for setrun.py (see gauges.py).
+
+Examples:
+    python makegauges.py --polyline centreline.csv --spacing 500
+    python makegauges.py --start 94.09 29.20 --spacing 2000 -o gauges_2km.csv
+
+"""
+from __future__ import absolute_import
+from __future__ import print_function
+import numpy as np
+
+from gauges import write_table, read_table
+
+# same as geo_data.earth_radius in setrun.py:
+earth_radius = 6367.5e3
+
+# neighbour offsets (di, dj) used for the steepest descent:
+neighbours = np.array([(-1, -1), (-1, 0), (-1, 1), (0, -1),
+                       (0, 1), (1, -1), (1, 0), (1, 1)])
+
+
+def segment_lengths(x, y):
+    """Length in metres of each segment of the lon/lat polyline x, y."""
+    deg2rad = np.pi / 180.
+    ymid = 0.5 * (y[1:] + y[:-1]) * deg2rad
+    dx = np.diff(x) * deg2rad * earth_radius * np.cos(ymid)
+    dy = np.diff(y) * deg2rad * earth_radius
+    return np.hypot(dx, dy)
+
+
+def arc_length(x, y):
+    """Distance in metres along the polyline x, y from its first vertex."""
+    return np.concatenate(([0.], np.cumsum(segment_lengths(x, y))))
+
+
+def resample_polyline(x, y, spacing):
+    """
+    Return points every `spacing` metres along the polyline x, y, starting
+    at its first vertex, by linear interpolation in arc length.
+    """
+    s = arc_length(x, y)
+    keep = np.concatenate(([True], np.diff(s) > 0))   # drop repeated vertices
+    s, x, y = s[keep], x[keep], y[keep]
+    s_new = np.arange(0., s[-1] + 1e-6, spacing)
+    return np.interp(s_new, s, x), np.interp(s_new, s, y)
+
+
+def trace_steepest_descent(x, y, Z, start, end=None, max_steps=None):
+    """
+    Trace a flow path on Z[j,i] from the cell nearest to start = (x0, y0)
+    by always moving to the lowest of the 8 neighbours that is not higher
+    than the current cell and not yet visited (so flats of a filled DEM
+    are crossed).  Stops at the domain edge, in a pit, after max_steps, or
+    within one cell of end.
+
+    OUTPUT:
+        xs, ys - cell centres along the path
+    """
+    i = int(np.argmin(np.abs(x - start[0])))
+    j = int(np.argmin(np.abs(y - start[1])))
+    mx, my = len(x), len(y)
+    if max_steps is None:
+        max_steps = mx * my
+    if end is not None:
+        iend = int(np.argmin(np.abs(x - end[0])))
+        jend = int(np.argmin(np.abs(y - end[1])))
+
+    visited = set([(i, j)])
+    path = [(i, j)]
+    for step in range(max_steps):
+        if end is not None and abs(i - iend) <= 1 and abs(j - jend) <= 1:
+            break
+        ii = i + neighbours[:, 0]
+        jj = j + neighbours[:, 1]
+        inside = (ii >= 0) & (ii < mx) & (jj >= 0) & (jj < my)
+        if not inside.all():
+            break
+        z = Z[jj, ii]
+        z[z > Z[j, i]] = np.inf
+        for k in range(len(z)):
+            if (ii[k], jj[k]) in visited:
+                z[k] = np.inf
+        k = int(np.argmin(z))
+        if not np.isfinite(z[k]):
+            break
+        i, j = int(ii[k]), int(jj[k])
+        visited.add((i, j))
+        path.append((i, j))
+
+    path = np.array(path)
+    return x[path[:, 0]], y[path[:, 1]]
+
+
+def make_gauges(xline, yline, spacing, first_gaugeno=0):
+    """
+    Return gauge numbers and positions every `spacing` metres along the
+    centreline xline, yline.
+    """
+    xg, yg = resample_polyline(np.asarray(xline, dtype=float),
+                               np.asarray(yline, dtype=float), spacing)
+    gaugeno = first_gaugeno + np.arange(len(xg))
+    return gaugeno, xg, yg
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--polyline', help='CSV centreline: lon, lat')
+    parser.add_argument('--start', nargs=2, type=float, metavar=('X', 'Y'),
+                        help='start of steepest descent trace')
+    parser.add_argument('--end', nargs=2, type=float, metavar=('X', 'Y'),
+                        help='stop the trace near this point')
+    parser.add_argument('--topo', default='mega_fill.txt',
+                        help='topotype 3 file used for tracing')
+    parser.add_argument('--spacing', type=float, default=1000.,
+                        help='gauge spacing in metres (default 1000)')
+    parser.add_argument('--first', type=int, default=0,
+                        help='number of the first gauge')
+    parser.add_argument('-o', '--output', default='gauges_generated.csv')
+    parser.add_argument('--save-centreline', metavar='CSV',
+                        help='also write the traced centreline')
+    args = parser.parse_args()
+
+    if args.polyline:
+        line = np.loadtxt(args.polyline, delimiter=',', comments='#',
+                          ndmin=2)
+        xline, yline = line[:, 0], line[:, 1]
+    elif args.start:
+        from topoio import read_topo
+        x, y, Z = read_topo(args.topo)[:3]
+        xline, yline = trace_steepest_descent(x, y, Z, args.start, args.end)
+        if args.save_centreline:
+            np.savetxt(args.save_centreline, np.column_stack((xline, yline)),
+                       fmt='%.6f', delimiter=',')
+    else:
+        parser.error("give either --polyline or --start")
+
+    gaugeno, xg, yg = make_gauges(xline, yline, args.spacing, args.first)
+    write_table(args.output, gaugeno, xg, yg,
+                header='Gauges every %g m along the centreline\n'
+                       'gaugeno, longitude, latitude' % args.spacing)
+    read_table(args.output)   # make sure it reads back
+    print("Wrote %i gauges over %.1f km to %s"
+          % (len(gaugeno), arc_length(xline, yline)[-1] / 1e3, args.output))
+
+
+if __name__ == '__main__':
+    main()
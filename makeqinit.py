@@ -0,0 +1,125 @@
+"""
+Precompute the lake surface as a GeoClaw qinit file.
+
+The depth max(0, stage - B) is evaluated once, with NumPy, on the DEM
+averaged to the cell size of one AMR level and cropped to the lake
+outline of setrun.py.  The water surface (the stage where there is
+water, the bed elsewhere, see lake.lake_surface) is written to
+lake_qinit.xyz together with lake_qinit.json (stage, volume, grid), next
+to setrun.py where it looks for them.
+When these exist, setrun.py sets qinit_type = 4 and registers the file
+for all levels, and qinit.f90 sets h = max(eta - B, 0) from it instead of
+testing the outline on each patch.  (A depth file with qinit_type = 1
+would only be added where B is below sea level, i.e. nowhere here.)
+
+The lake volume is printed, so it can be checked before a run.
+
+Run with
+    python makeqinit.py [--level 4] [--force]
+
+"""
+from __future__ import absolute_import
+from __future__ import print_function
+import os
+import json
+import numpy as np
+
+from topoio import load_topo, file_hash
+from maketopo import topo_fname, level_dx, crop, coarsen
+from lake import lake_depth, lake_surface, lake_volume, write_qinit
+
+qinit_fname = 'lake_qinit.xyz'
+meta_fname = 'lake_qinit.json'
+
+# directory of this script and setrun.py, where the files are written:
+rundir = os.path.dirname(os.path.abspath(__file__))
+
+# the depth is computed at the cell size of this level:
+qinit_level = 4
+
+
+def lake_extent(polygons, margin=0.):
+    """Bounding box [x1, x2, y1, y2] of the polygons, widened by margin."""
+    xy = np.vstack([np.array(p, dtype=np.float64) for p in polygons])
+    return [xy[:, 0].min() - margin, xy[:, 0].max() + margin,
+            xy[:, 1].min() - margin, xy[:, 1].max() + margin]
+
+
+def check_qinit_stage(fname, stage):
+    """
+    Raise ValueError if the qinit file fname, described by the .json file
+    next to it, was made for another lake stage.
+    """
+    with open(os.path.splitext(fname)[0] + '.json') as f:
+        meta = json.load(f)
+    if meta.get('qinit_type') != 4:
+        raise ValueError("*** %s holds the lake depth, not its surface: "
+                         "run makeqinit.py --force" % fname)
+    made_for = meta['stage']
+    if abs(made_for - stage) > 1e-6:
+        raise ValueError("*** %s was made for stage %g m, not %g m: run "
+                         "makeqinit.py --stage %g or set "
+                         "MEGAFLOOD_LAKE_QINIT=none" % (fname, made_for,
+                                                        stage, stage))
+
+
+def make_qinit(rundata, stage=None, level=qinit_level,
+               fname=topo_fname, force=False, verbose=True, outdir=rundir):
+    """
+    Write the lake surface for rundata to qinit_fname and its description
+    to meta_fname in outdir, unless they were made from the same DEM,
+    outline, stage and level.  The stage defaults to
+    rundata.lake_data.stage; a relative DEM fname is looked up in outdir.
+
+    OUTPUT:
+        meta - dict with the stage, volume (m^3) and grid of the file
+    """
+    if stage is None:
+        stage = rundata.lake_data.stage
+    polygons = [[list(v) for v in p] for p in rundata.lake_data.polygons]
+    fname = os.path.join(outdir, fname)
+    qinit_file = os.path.join(outdir, qinit_fname)
+    meta_file = os.path.join(outdir, meta_fname)
+    key = {'sha1': file_hash(fname), 'stage': stage, 'level': level,
+           'polygons': polygons, 'qinit_type': 4}
+    if not force and os.path.exists(meta_file) \
+            and os.path.exists(qinit_file):
+        with open(meta_file) as f:
+            meta = json.load(f)
+        if meta.get('key') == key:
+            if verbose:
+                print("%s is up to date, volume %.2f km^3"
+                      % (qinit_file, meta['volume'] / 1e9))
+            return meta
+
+    x, y, Z, header = load_topo(fname)
+    dx = level_dx(rundata)[level - 1]
+    factor = max(1, int(round(dx / header['cellsize'])))
+    x1, x2, y1, y2 = lake_extent(polygons, 2 * dx)
+    x, y, B = coarsen(*crop(x, y, Z, x1, x2, y1, y2), factor=factor,
+                      nodata_value=header['nodata_value'])
+    depth = lake_depth(x, y, B, stage, polygons)
+
+    write_qinit(qinit_file, x, y, lake_surface(x, y, B, stage, polygons))
+    meta = {'key': key, 'volume': lake_volume(x, y, depth),
+            'stage': stage, 'qinit_type': 4, 'dx': x[1] - x[0],
+            'extent': [x[0], x[-1], y[0], y[-1]]}
+    with open(meta_file, 'w') as f:
+        json.dump(meta, f, indent=1)
+    if verbose:
+        print("Wrote %s: %i x %i points, stage %g m, volume %.2f km^3"
+              % (qinit_file, len(x), len(y), stage, meta['volume'] / 1e9))
+    return meta
+
+
+if __name__ == '__main__':
+    import argparse
+    from setrun import setrun
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--stage', type=float, default=None,
+                        help='lake level in m (default: from setrun)')
+    parser.add_argument('--level', type=int, default=qinit_level)
+    parser.add_argument('--force', action='store_true')
+    args = parser.parse_args()
+    make_qinit(setrun(lake_qinit='none'), args.stage, args.level,
+               force=args.force)
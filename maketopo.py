@@ -0,0 +1,332 @@
+"""
+Build the topography pyramid that setrun.py can register instead of
+mega_fill.txt.
+
+mega_fill.txt is parsed once into a binary cache (see topoio.load_topo)
+and written as one set of tiles per AMR level, each at the cell size of
+its level (amrdata.refinement_ratios_x) but never finer than the DEM:
+    level1.tt3        -- the whole DEM
+    levelL_NN.tt3     -- for L > 1, the parts of the domain where level L
+                         can appear: each region allowing level L, and
+                         boxes along the gauge line (the flood path) and
+                         around the lake outline
+Coarser levels are block averaged weighted by cell area (cos latitude),
+so the volume under the topography is kept.  Since GeoClaw integrates
+each cell over the finest topography covering it, every level now reads
+topography of its own resolution where it is used and xgeoclaw no longer
+parses the full-resolution DEM for the whole domain.
+
+The tiles and the topofiles entries for them are listed in
+topo_tiles/topofiles.json together with a key (tiles_key) of the DEM, the
+cell sizes and the footprints they were cut for.  setrun(topo_tiles=True)
+(or MEGAFLOOD_TOPO_TILES=1) registers them only while the key matches
+its own regions, gauges and lake, and mega_fill.txt otherwise.
+
+In GeoClaw 5.6 the minlevel, maxlevel of a topo file allow refinement
+over its area like a region, so each tile is registered with the time
+window of what it was cut for and a maxlevel no finer than its own
+resolution: a cell is never refined where only coarser topography
+exists.  This narrows the refinement allowed with mega_fill.txt ([1, 5]
+over the whole domain) to the regions, the gauge corridor and the lake,
+which is why the tiles are opt-in.  With a region table
+(MEGAFLOOD_REGION_FILE) the corridor and lake are left out, so only the
+regions of the table allow refinement (see setrun.settopo).
+
+Run with
+    make topo      (or python maketopo.py [--force])
+and then e.g.
+    MEGAFLOOD_TOPO_TILES=1 make .output
+
+"""
+from __future__ import absolute_import
+from __future__ import print_function
+import os
+import json
+import warnings
+import numpy as np
+
+from topoio import load_topo, write_topo, read_header
+
+topo_fname = 'mega_fill.txt'
+tiles_dir = 'topo_tiles'
+manifest_fname = os.path.join(tiles_dir, 'topofiles.json')
+
+# refinement allowed along the gauge line and over the lake (as
+# mega_fill.txt allowed):
+corridor_maxlevel = 5
+lake_maxlevel = 5
+
+# half width (m) of the corridor around the gauge line:
+corridor_width = 5000.
+
+# consecutive gauges per corridor box:
+corridor_gauges = 40
+
+# margin (in cells of the level) added around each tile:
+tile_margin = 2
+
+# rows of blocks averaged at a time, to bound memory:
+band_blocks = 128
+
+
+def level_dx(rundata):
+    """Cell size in x on each AMR level, index 0 for level 1."""
+    clawdata = rundata.clawdata
+    amrdata = rundata.amrdata
+    dx = (clawdata.upper[0] - clawdata.lower[0]) / clawdata.num_cells[0]
+    ratios = amrdata.refinement_ratios_x[:amrdata.amr_levels_max - 1]
+    return dx / np.cumprod([1] + list(ratios))
+
+
+def coarsen(x, y, Z, factor, nodata_value=None):
+    """
+    Area-weighted average of Z[j,i] (lon/lat grid) over blocks of
+    factor x factor points around every factor-th point, starting with
+    the first one, each value placed at the centre of its block (half a
+    point before every factor-th point for an even factor).  Points are
+    weighted by cos(latitude) and points equal to nodata_value are left
+    out.  The coarse grid covers at least the extent of x, y; empty blocks
+    at the edges take the nearest value.
+    """
+    if factor <= 1:
+        return x, y, np.asarray(Z)
+    half = factor // 2
+    # block centres lie shift points before every factor-th point:
+    shift = half - 0.5 * (factor - 1)
+    my, mx = Z.shape
+    nx = int(np.ceil((mx - 1 + shift) / factor)) + 1
+    ny = int(np.ceil((my - 1 + shift) / factor)) + 1
+    weight = np.cos(np.radians(y))
+
+    Zc = np.empty((ny, nx))
+    for jb in range(0, ny, band_blocks):
+        nb = min(band_blocks, ny - jb)
+        # DEM rows feeding block rows jb:jb+nb and where they go:
+        j0 = jb * factor - half
+        j1 = min(j0 + nb * factor, my)
+        jpad = max(0, -j0)
+        j0 = max(0, j0)
+        zsum = np.zeros((nb * factor, nx * factor))
+        wsum = np.zeros((nb * factor, nx * factor))
+        z = np.asarray(Z[j0:j1], dtype=np.float64)
+        w = np.repeat(weight[j0:j1, None], mx, axis=1)
+        if nodata_value is not None:
+            w[z == nodata_value] = 0.
+        rows = slice(jpad, jpad + j1 - j0)
+        cols = slice(half, half + mx)
+        zsum[rows, cols] = w * z
+        wsum[rows, cols] = w
+        zsum = zsum.reshape((nb, factor, nx, factor)).sum(axis=(1, 3))
+        wsum = wsum.reshape((nb, factor, nx, factor)).sum(axis=(1, 3))
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)   # empty blocks
+            Zc[jb:jb + nb] = zsum / wsum
+
+    jj, ii = np.nonzero(~np.isfinite(Zc))
+    Zc[jj, ii] = Z[np.minimum(jj * factor, my - 1),
+                   np.minimum(ii * factor, mx - 1)]
+    dx = x[1] - x[0]
+    xc = x[0] + (factor * np.arange(nx) - shift) * dx
+    yc = y[0] + (factor * np.arange(ny) - shift) * dx
+    return xc, yc, Zc
+
+
+def crop(x, y, Z, x1, x2, y1, y2):
+    """Smallest part of the grid covering [x1,x2] x [y1,y2]."""
+    i1 = max(np.searchsorted(x, x1, side='right') - 1, 0)
+    i2 = min(np.searchsorted(x, x2), len(x) - 1)
+    j1 = max(np.searchsorted(y, y1, side='right') - 1, 0)
+    j2 = min(np.searchsorted(y, y2), len(y) - 1)
+    return x[i1:i2 + 1], y[j1:j2 + 1], Z[j1:j2 + 1, i1:i2 + 1]
+
+
+def _clip(box, lower, upper):
+    x1, x2 = max(box[0], lower[0]), min(box[1], upper[0])
+    y1, y2 = max(box[2], lower[1]), min(box[3], upper[1])
+    if x1 < x2 and y1 < y2:
+        return [x1, x2, y1, y2]
+    return None
+
+
+def corridor_boxes(gauges, width=corridor_width, ngauges=corridor_gauges):
+    """
+    Boxes [x1, x2, y1, y2] covering the gauge line, each spanning ngauges
+    consecutive gauges (overlapping by one) widened by width metres.
+    """
+    xy = np.array([g[1:3] for g in sorted(gauges)], dtype=np.float64)
+    boxes = []
+    for k in range(0, max(len(xy) - 1, 1), ngauges):
+        part = xy[k:k + ngauges + 1]
+        dy = np.degrees(width / 6367.5e3)
+        dx = dy / np.cos(np.radians(part[:, 1].mean()))
+        boxes.append([part[:, 0].min() - dx, part[:, 0].max() + dx,
+                      part[:, 1].min() - dy, part[:, 1].max() + dy])
+    return boxes
+
+
+def _envelope(rundata):
+    """
+    The boxes [maxlevel, t1, t2, x1, x2, y1, y2] outside the regions
+    where mega_fill.txt let the flood refine: the gauge corridor and the
+    bounding box of each lake polygon.
+    """
+    boxes = []
+    if rundata.gaugedata.gauges:
+        boxes.extend([corridor_maxlevel, 0., 1.e10] + list(box)
+                     for box in corridor_boxes(rundata.gaugedata.gauges))
+    lake_data = getattr(rundata, 'lake_data', None)
+    for polygon in getattr(lake_data, 'polygons', None) or []:
+        px = [v[0] for v in polygon]
+        py = [v[1] for v in polygon]
+        boxes.append([lake_maxlevel, 0., 1.e10,
+                      min(px), max(px), min(py), max(py)])
+    return boxes
+
+
+def level_footprint(rundata, level, envelope=True):
+    """
+    Where level can appear, as a list of
+        [maxlevel, t1, t2, x1, x2, y1, y2]
+    from the regions allowing level and, if envelope, the gauge corridor
+    and the lake, clipped to the domain.
+    """
+    lower = rundata.clawdata.lower
+    upper = rundata.clawdata.upper
+    parts = [[r[1], r[2], r[3]] + list(r[4:8])
+             for r in rundata.regiondata.regions]
+    if envelope:
+        parts.extend(_envelope(rundata))
+    footprint = []
+    for part in parts:
+        box = _clip(part[3:], lower, upper)
+        if part[0] >= level and box is not None:
+            footprint.append([int(part[0]), float(part[1]),
+                              float(part[2])] + [float(v) for v in box])
+    return footprint
+
+
+def max_level(rundata, envelope=True):
+    """Finest level allowed by any region or, if envelope, the corridor."""
+    levels = [r[1] for r in rundata.regiondata.regions]
+    if envelope:
+        levels.extend(box[0] for box in _envelope(rundata))
+    return min(max(levels + [1]), rundata.amrdata.amr_levels_max)
+
+
+def level_factors(rundata, dem_dx, envelope=True):
+    """
+    The DEM points averaged per tile point on each level, as a list of
+    (level, factor, finest), one for each distinct factor; finest is the
+    finest level with that factor, the maxlevel its tiles can serve.
+    """
+    dx = level_dx(rundata)
+    groups = []
+    for level in range(1, max_level(rundata, envelope) + 1):
+        factor = max(1, int(round(dx[level - 1] / dem_dx)))
+        if groups and groups[-1][1] == factor:
+            # same resolution as the tiles of the level below, which
+            # already cover this level's footprint
+            groups[-1][2] = level
+        else:
+            groups.append([level, factor, level])
+    return [tuple(g) for g in groups]
+
+
+def tiles_key(rundata, fname=topo_fname, envelope=True):
+    """
+    What the tiles for rundata depend on: the DEM (name, size and
+    modification time), the cell size of each level and the footprints.
+    """
+    with open(fname) as f:
+        header = read_header(f)
+    levels = range(1, max_level(rundata, envelope) + 1)
+    return {'dem': [os.path.basename(fname), os.path.getsize(fname),
+                    os.path.getmtime(fname)],
+            'cellsize': header['cellsize'],
+            'dx': level_dx(rundata)[:len(levels)].tolist(),
+            'footprints': [level_footprint(rundata, L, envelope)
+                           for L in levels]}
+
+
+def tiles_are_current(rundata, manifest=manifest_fname, rundir='.',
+                      fname=topo_fname, envelope=True):
+    """True if manifest lists tiles made for rundata (see tiles_key)."""
+    manifest = os.path.join(rundir, manifest)
+    if not os.path.exists(manifest):
+        return False
+    with open(manifest) as f:
+        key = json.load(f).get('key')
+    return key == json.loads(json.dumps(
+        tiles_key(rundata, os.path.join(rundir, fname), envelope)))
+
+
+def make_tiles(rundata, fname=topo_fname, outdir=tiles_dir, envelope=True,
+               force=False, verbose=True):
+    """
+    Write the topography pyramid for rundata into outdir and the manifest
+    listing its topofiles entries.  Nothing is done if the manifest was
+    made with the same key (tiles_key), unless force.
+    """
+    manifest = os.path.join(outdir, 'topofiles.json')
+    key = tiles_key(rundata, fname, envelope)
+    if not force and tiles_are_current(rundata, manifest, '.', fname,
+                                       envelope):
+        if verbose:
+            print("%s is up to date" % manifest)
+        return manifest
+    if not os.path.isdir(outdir):
+        os.makedirs(outdir)
+
+    x, y, Z, header = load_topo(fname)
+    dem_dx = header['cellsize']
+    dx = level_dx(rundata)
+    topofiles = []
+    for level, factor, finest in level_factors(rundata, dem_dx, envelope):
+        if level == 1:
+            parts = [[finest, 0., 1.e10, x[0], x[-1], y[0], y[-1]]]
+        else:
+            parts = level_footprint(rundata, level, envelope)
+        margin = tile_margin * max(dx[level - 1], dem_dx)
+        for k, part in enumerate(parts):
+            maxlevel, t1, t2, x1, x2, y1, y2 = part
+            # no finer than the tile's resolution:
+            maxlevel = min(maxlevel, finest)
+            xt, yt, Zt = crop(x, y, Z, x1 - margin, x2 + margin,
+                              y1 - margin, y2 + margin)
+            xt, yt, Zt = coarsen(xt, yt, Zt, factor, header['nodata_value'])
+            if level == 1:
+                tile = os.path.join(outdir, 'level1.tt3')
+            else:
+                tile = os.path.join(outdir, 'level%i_%02i.tt3' % (level, k))
+            write_topo(tile, xt, yt, Zt)
+            topofiles.append([3, 1, maxlevel, t1, t2, tile])
+            if verbose:
+                print("%s: %i x %i, averaged over %i x %i points"
+                      % (tile, len(xt), len(yt), factor, factor))
+
+    with open(manifest, 'w') as f:
+        json.dump({'source': fname, 'key': key, 'topofiles': topofiles},
+                  f, indent=1)
+    return manifest
+
+
+def topo_files(manifest=manifest_fname, rundir='.'):
+    """
+    The topofiles entries listed in manifest, with file names relative to
+    rundir made absolute.
+    """
+    with open(os.path.join(rundir, manifest)) as f:
+        topofiles = json.load(f)['topofiles']
+    for topofile in topofiles:
+        topofile[-1] = os.path.join(rundir, topofile[-1])
+    return topofiles
+
+
+if __name__ == '__main__':
+    import sys
+    from setrun import setrun, get_option, is_set
+    # with a region table ($MEGAFLOOD_REGION_FILE) the tiles are cut for
+    # its regions only, see setrun.settopo:
+    make_tiles(setrun(topo_tiles='none'),
+               envelope=not is_set(get_option('region_file')),
+               force='--force' in sys.argv[1:])
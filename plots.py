@@ -0,0 +1,245 @@
+"""
+Render the frame maps and gauge plots in a process pool, skipping the
+ones that are up to date, and write an HTML gallery.
+
+The maps of setplot.frame_maps are drawn for every frame from the
+rasters of rasters.py (one task per frame, so a raster is built once),
+and eta and h at setplot.gauge_numbers() from the gauge cache of
+gaugeio.py.  _plots/plots.json records, for every PNG, the size and
+modification time of the output files it was drawn from and the sha1 of
+setplot.py, so a PNG is redrawn only when its frame or gauge has changed
+or the plots were restyled.  The gallery is
+    _plots/index.html        -- a row of thumbnails per frame, the gauges
+    _plots/figN.html         -- each map animated over the frames
+Run with
+    make plots    (or python plots.py [_output] [_plots] [-j 8] [--force])
+
+"""
+from __future__ import absolute_import
+from __future__ import print_function
+import os
+import json
+
+from frameio import list_frames, frame_file, read_tfile
+from topoio import file_hash
+from gaugeio import build_cache, load_cache
+import setplot
+
+plot_dir = '_plots'
+manifest_name = 'plots.json'
+
+# width (pixels) of the thumbnails in index.html:
+thumb_width = 240
+
+# frames per second of the animations:
+frame_rate = 4
+
+
+def _source_state(fnames):
+    return [[os.path.basename(f), os.path.getsize(f), os.path.getmtime(f)]
+            for f in fnames if os.path.exists(f)]
+
+
+def style_key():
+    """sha1 of setplot.py, which defines what the plots look like."""
+    return file_hash(os.path.splitext(setplot.__file__)[0] + '.py')
+
+
+def frame_png(frameno, figno):
+    return 'frame%04i_fig%i.png' % (frameno, figno)
+
+
+def gauge_png(gaugeno):
+    return 'gauge%05i.png' % gaugeno
+
+
+def plot_tasks(outdir, plotdir, manifest, force=False):
+    """
+    The frames and gauges with PNGs to draw, as tasks for _render, and the
+    manifest entries of all PNGs.
+
+    OUTPUT:
+        tasks - list of ('frame', frameno, [figno, ...], ...) and
+                ('gauge', gaugeno, ...) tuples
+        entries - dict mapping PNG names to their manifest entry
+    """
+    style = style_key()
+    tasks = []
+    entries = {}
+    for frameno in list_frames(outdir):
+        key = [style, _source_state([frame_file(outdir, prefix, frameno)
+                                     for prefix in 'tqb'])]
+        fignos = []
+        for name, figno, draw in setplot.frame_maps:
+            png = frame_png(frameno, figno)
+            entries[png] = key
+            if force or manifest.get(png) != key \
+                    or not os.path.exists(os.path.join(plotdir, png)):
+                fignos.append(figno)
+        if fignos:
+            tasks.append(('frame', frameno, fignos, outdir, plotdir))
+    for gaugeno in setplot.gauge_numbers():
+        fname = os.path.join(outdir, 'gauge%05i.txt' % gaugeno)
+        if not os.path.exists(fname):
+            continue
+        png = gauge_png(gaugeno)
+        key = [style, _source_state([fname])]
+        entries[png] = key
+        if force or manifest.get(png) != key \
+                or not os.path.exists(os.path.join(plotdir, png)):
+            tasks.append(('gauge', gaugeno, None, outdir, plotdir))
+    return tasks, entries
+
+
+def _render(task):
+    """Draw the PNGs of one task, return their names."""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    from rasters import load_raster
+    kind, number, fignos, outdir, plotdir = task
+    drawn = []
+    if kind == 'frame':
+        raster = load_raster(number, outdir, setplot.map_dx)
+        for name, figno, draw in setplot.frame_maps:
+            if figno not in fignos:
+                continue
+            fig, ax = plt.subplots(figsize=(10, 8))
+            draw(raster, ax)
+            fig.suptitle(name)
+            png = frame_png(number, figno)
+            fig.savefig(os.path.join(plotdir, png), dpi=100)
+            plt.close(fig)
+            drawn.append(png)
+    else:
+        gauge = load_cache(outdir).gauge(number)
+        fig, ax = plt.subplots(figsize=(8, 4))
+        ax.plot(gauge['t'] / 3600., gauge['eta'], 'b-', label='eta')
+        ax.plot(gauge['t'] / 3600., gauge['h'], 'g--', label='h')
+        ax.set_xlabel('t (h)')
+        ax.set_ylabel('m')
+        ax.set_title('Gauge %i' % number)
+        ax.legend()
+        png = gauge_png(number)
+        fig.savefig(os.path.join(plotdir, png), dpi=100)
+        plt.close(fig)
+        drawn.append(png)
+    return drawn
+
+
+def write_gallery(outdir, plotdir, gaugenos):
+    """Write index.html and an animation page per map into plotdir."""
+    frames = [(frameno, read_tfile(frameno, outdir)['time'])
+              for frameno in list_frames(outdir)]
+    maps = setplot.frame_maps
+    lines = ['<html><head><title>Plots of %s</title></head><body>'
+             % os.path.abspath(outdir),
+             '<h2>Frames</h2>',
+             '<p>Animations: %s</p>'
+             % ', '.join('<a href="fig%i.html">%s</a>' % (figno, name)
+                         for name, figno, draw in maps),
+             '<table><tr><th>frame</th><th>t (h)</th>%s</tr>'
+             % ''.join('<th>%s</th>' % name for name, figno, draw in maps)]
+    for frameno, t in frames:
+        cells = ''.join('<td><a href="{0}"><img src="{0}" width="{1}" '
+                        'loading="lazy"></a></td>'
+                        .format(frame_png(frameno, figno), thumb_width)
+                        for name, figno, draw in maps)
+        lines.append('<tr><td>%i</td><td>%.2f</td>%s</tr>'
+                     % (frameno, t / 3600., cells))
+    lines.append('</table>')
+    if gaugenos:
+        lines.append('<h2>Gauges</h2><p>')
+        lines.extend('<a href="{0}"><img src="{0}" width="{1}" '
+                     'loading="lazy"></a>'.format(gauge_png(g),
+                                                  2 * thumb_width)
+                     for g in gaugenos)
+        lines.append('</p>')
+    lines.append('</body></html>')
+    with open(os.path.join(plotdir, 'index.html'), 'w') as f:
+        f.write('\n'.join(lines) + '\n')
+
+    for name, figno, draw in maps:
+        pngs = json.dumps([frame_png(frameno, figno) for frameno, t in frames])
+        with open(os.path.join(plotdir, 'fig%i.html' % figno), 'w') as f:
+            f.write("""<html><head><title>%s</title></head><body>
+<p><a href="index.html">index</a> &nbsp; <button id="play">play</button>
+<input id="slider" type="range" min="0" max="%i" value="0"></p>
+<img id="frame" src="">
+<script>
+var pngs = %s, k = 0, timer = null;
+var slider = document.getElementById('slider');
+function show(n) { k = n; slider.value = n;
+  document.getElementById('frame').src = pngs[n]; }
+slider.oninput = function() { show(parseInt(slider.value)); };
+document.getElementById('play').onclick = function() {
+  if (timer) { clearInterval(timer); timer = null; return; }
+  timer = setInterval(function() { show((k + 1) %% pngs.length); }, %i);
+};
+show(0);
+</script></body></html>
+""" % (name, max(len(frames) - 1, 0), pngs, 1000 // frame_rate))
+
+
+def make_plots(outdir='_output', plotdir=plot_dir, nprocs=None, force=False,
+               verbose=True):
+    """
+    Draw the PNGs that are not up to date in nprocs processes and write
+    the gallery.
+
+    OUTPUT:
+        drawn - names of the PNGs drawn
+    """
+    import multiprocessing
+    if not os.path.isdir(plotdir):
+        os.makedirs(plotdir)
+    fname = os.path.join(plotdir, manifest_name)
+    manifest = {}
+    if os.path.exists(fname) and not force:
+        with open(fname) as f:
+            manifest = json.load(f)
+    tasks, entries = plot_tasks(outdir, plotdir, manifest, force)
+    if any(task[0] == 'gauge' for task in tasks):
+        # once here, not in every worker:
+        build_cache(outdir)
+
+    drawn = []
+    pool = multiprocessing.Pool(nprocs)
+    try:
+        for pngs in pool.imap_unordered(_render, tasks):
+            for png in pngs:
+                manifest[png] = entries[png]
+                if verbose:
+                    print("  %s" % png)
+            drawn.extend(pngs)
+    finally:
+        pool.close()
+        pool.join()
+        with open(fname, 'w') as f:
+            json.dump(manifest, f)
+
+    gaugenos = [g for g in setplot.gauge_numbers()
+                if gauge_png(g) in entries]
+    write_gallery(outdir, plotdir, gaugenos)
+    if verbose:
+        print("%i plots drawn, %i up to date, gallery in %s"
+              % (len(drawn), len(entries) - len(drawn),
+                 os.path.join(plotdir, 'index.html')))
+    return drawn
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('outdir', nargs='?', default='_output')
+    parser.add_argument('plotdir', nargs='?', default=plot_dir)
+    parser.add_argument('-j', '--nprocs', type=int, default=None)
+    parser.add_argument('--force', action='store_true',
+                        help='redraw all plots')
+    args = parser.parse_args()
+    make_plots(args.outdir, args.plotdir, args.nprocs,
+               args.force)
+
+
+if __name__ == '__main__':
+    main()
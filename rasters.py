@@ -0,0 +1,180 @@
+"""
+Uniform rasters of the AMR frames, cached per frame and resolution.
+
+load_raster composites a frame onto a uniform grid of cell size dx (by
+default the level 1 cell size / raster_ratio, i.e. level 3): every raster
+cell takes h, hu, hv, eta of the finest patch containing its centre
+(frameio.composite).  With an extent only the patches intersecting it
+are read (frameio.FrameIndex).  The raster is saved as float32 in
+    <outdir>/raster_cache/<key>/NNNN.npy       -- h, hu, hv, eta [m,j,i]
+    <outdir>/raster_cache/<key>/NNNN.level.npy -- patch level [j,i]
+with the grid in grid.json, <key> naming the resolution and extent, and
+memory mapped while it is newer than the frame files.  setplot.py draws
+its maps from these rasters.
+
+Build the rasters of all frames in parallel with
+    python rasters.py _output [--dx 0.001] [-j 4]
+
+"""
+from __future__ import absolute_import
+from __future__ import print_function
+import os
+import json
+import hashlib
+import numpy as np
+
+from frameio import FrameIndex, composite, frame_file, list_frames
+
+cache_dirname = 'raster_cache'
+
+# default raster cell size: the level 1 cell size divided by this (level 3
+# with the refinement ratios 4, 2, ... of setrun.py):
+raster_ratio = 8
+
+# depth (m) below which a raster cell is dry:
+dry_depth = 0.01
+
+
+class Raster(object):
+    """
+    A frame on a uniform grid: q[m,j,i] (h, hu, hv, eta) at the cell
+    centres x[i], y[j] and the level of the patch each value came from.
+    """
+
+    def __init__(self, time, x, y, q, level):
+        self.time = time
+        self.x = x
+        self.y = y
+        self.q = q
+        self.level = level
+
+    @property
+    def h(self):
+        return self.q[0]
+
+    @property
+    def eta(self):
+        return self.q[3]
+
+    @property
+    def wet(self):
+        return self.q[0] > dry_depth
+
+    @property
+    def depth(self):
+        """Depth, NaN where dry."""
+        return np.where(self.wet, self.q[0], np.nan)
+
+    @property
+    def speed(self):
+        """Speed, NaN where dry."""
+        wet = self.wet
+        speed = np.full(wet.shape, np.nan, dtype=np.float32)
+        speed[wet] = np.hypot(self.q[1][wet], self.q[2][wet]) / self.q[0][wet]
+        return speed
+
+    @property
+    def extent(self):
+        """[x1, x2, y1, y2] of the cell edges, e.g. for imshow."""
+        dx, dy = self.x[1] - self.x[0], self.y[1] - self.y[0]
+        return [self.x[0] - dx / 2, self.x[-1] + dx / 2,
+                self.y[0] - dy / 2, self.y[-1] + dy / 2]
+
+
+def raster_grid(index, dx=None, extent=None):
+    """
+    Lower left corner, cell size and size x1, y1, dx, nx, ny of the raster
+    of the frame in index (a FrameIndex) over extent (default the level 1
+    patches) with cells of dx (default level 1 / raster_ratio).
+    """
+    p = index.patches[index.patches['level'] == index.patches['level'].min()]
+    if dx is None:
+        dx = float(p['dx'].min()) / raster_ratio
+    if extent is None:
+        extent = [float(p['xlow'].min()),
+                  float((p['xlow'] + p['mx'] * p['dx']).max()),
+                  float(p['ylow'].min()),
+                  float((p['ylow'] + p['my'] * p['dy']).max())]
+    nx = int(round((extent[1] - extent[0]) / dx))
+    ny = int(round((extent[3] - extent[2]) / dx))
+    return extent[0], extent[2], dx, nx, ny
+
+
+def _cache_key(grid):
+    return hashlib.sha1(json.dumps(['%.10g' % v for v in grid])
+                        .encode()).hexdigest()[:12]
+
+
+def load_raster(frameno, outdir='_output', dx=None, extent=None,
+                cachedir=None, force=False):
+    """
+    The Raster of frame frameno at cell size dx over extent [x1, x2, y1,
+    y2], from the cache if it is current, see the module docstring.
+    """
+    if cachedir is None:
+        cachedir = os.path.join(outdir, cache_dirname)
+    index = FrameIndex(frameno, outdir)
+    if len(index.patches) == 0:
+        raise IOError("*** frame %i in %s has no patches" % (frameno, outdir))
+    x1, y1, dx, nx, ny = raster_grid(index, dx, extent)
+    x = x1 + (np.arange(nx) + 0.5) * dx
+    y = y1 + (np.arange(ny) + 0.5) * dx
+
+    griddir = os.path.join(cachedir, _cache_key([x1, y1, dx, nx, ny]))
+    qfile = os.path.join(griddir, '%04i.npy' % frameno)
+    levelfile = os.path.join(griddir, '%04i.level.npy' % frameno)
+    sources = [f for f in (frame_file(outdir, 'q', frameno),
+                           frame_file(outdir, 'b', frameno))
+               if os.path.exists(f)]
+    if not force and os.path.exists(qfile) and os.path.exists(levelfile) \
+            and all(os.path.getmtime(qfile) >= os.path.getmtime(f)
+                    for f in sources):
+        return Raster(index.time, x, y, np.load(qfile, mmap_mode='r'),
+                      np.load(levelfile, mmap_mode='r'))
+
+    patches = index.read(x[0], x[-1], y[0], y[-1])
+    q, level = composite(patches, x1, y1, dx, dx, nx, ny)
+    q = q.astype(np.float32)
+    level = level.astype(np.int8)
+    if not os.path.isdir(griddir):
+        os.makedirs(griddir)
+        with open(os.path.join(griddir, 'grid.json'), 'w') as f:
+            json.dump({'x1': x1, 'y1': y1, 'dx': dx, 'nx': nx, 'ny': ny}, f)
+    np.save(qfile, q)
+    np.save(levelfile, level)
+    return Raster(index.time, x, y, q, level)
+
+
+def _build(args):
+    frameno, outdir, dx, extent = args
+    raster = load_raster(frameno, outdir, dx, extent)
+    return frameno, raster.time, raster.q.shape
+
+
+def main():
+    import argparse
+    import multiprocessing
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('outdir', nargs='?', default='_output')
+    parser.add_argument('--dx', type=float, default=None,
+                        help='cell size (default level 1 / %i)'
+                             % raster_ratio)
+    parser.add_argument('--extent', type=float, nargs=4, default=None,
+                        metavar=('X1', 'X2', 'Y1', 'Y2'))
+    parser.add_argument('-j', '--nprocs', type=int, default=None)
+    args = parser.parse_args()
+
+    tasks = [(frameno, args.outdir, args.dx, args.extent)
+             for frameno in list_frames(args.outdir)]
+    pool = multiprocessing.Pool(args.nprocs)
+    try:
+        for frameno, time, shape in pool.imap_unordered(_build, tasks):
+            print("frame %4i  t = %9.1f s  %i x %i"
+                  % (frameno, time, shape[2], shape[1]))
+    finally:
+        pool.close()
+        pool.join()
+
+
+if __name__ == '__main__':
+    main()
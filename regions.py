@@ -0,0 +1,246 @@
+"""
+Refinement region tables for setrun.py.
+
+A region table is a CSV file (comment lines starting with #) with one row
+per region in the order of rundata.regiondata.regions:
+    minlevel, maxlevel, t1, t2, x1, x2, y1, y2
+It replaces the regions written in setrun.py when given as region_file.
+
+level_maps evaluates a list of regions, the way GeoClaw combines them (the
+largest minlevel and maxlevel of the regions containing a point, and no
+refinement where none does), on a grid of cell centres at one time, to
+compare region sets; the topography files bound refinement too and are
+passed as regions (topo_regions).  The same rule
+lets compact_regions replace overlapping or adjacent regions by fewer
+rectangles with the same levels everywhere, so that GeoClaw checks a
+shorter list for every cell at each regridding.  setrun.py clips the
+regions to the domain and compacts them; run
+    python regions.py [table.csv]
+to list the regions that reach outside the domain or overlap.
+
+"""
+from __future__ import absolute_import
+from __future__ import print_function
+import numpy as np
+
+from topoio import read_header
+
+
+region_columns = ['minlevel', 'maxlevel', 't1', 't2', 'x1', 'x2', 'y1', 'y2']
+
+
+def read_regions(fname):
+    """Return the regions in fname as a list of lists."""
+    table = np.loadtxt(fname, delimiter=',', comments='#', ndmin=2)
+    if table.size == 0:
+        return []
+    if table.shape[1] != len(region_columns):
+        raise ValueError("*** %s: expected %i columns, found %i"
+                         % (fname, len(region_columns), table.shape[1]))
+    regions = table.tolist()
+    for region in regions:
+        region[0] = int(region[0])
+        region[1] = int(region[1])
+    return regions
+
+
+def write_regions(fname, regions, header=''):
+    """Write regions to a CSV region table."""
+    if header:
+        header += '\n'
+    header += 'Columns: ' + ', '.join(region_columns)
+    table = np.array(regions, dtype=np.float64).reshape((-1, 8))
+    np.savetxt(fname, table,
+               fmt=['%i', '%i', '%.10g', '%.10g'] + ['%.6f'] * 4,
+               delimiter=',', header=header)
+
+
+def topo_regions(topofiles):
+    """
+    The level bounds of topofile entries [topotype, minlevel, maxlevel,
+    t1, t2, fname] as regions over the extent of each file.
+    """
+    regions = []
+    for topotype, minlevel, maxlevel, t1, t2, fname in topofiles:
+        with open(fname) as f:
+            h = read_header(f)
+        regions.append([minlevel, maxlevel, t1, t2, h['xll'],
+                        h['xll'] + (h['ncols'] - 1) * h['cellsize'],
+                        h['yll'],
+                        h['yll'] + (h['nrows'] - 1) * h['cellsize']])
+    return regions
+
+
+def _index_range(centres, lower, upper):
+    return (np.searchsorted(centres, lower, side='left'),
+            np.searchsorted(centres, upper, side='right'))
+
+
+def level_maps(regions, x, y, t, levels_max):
+    """
+    Smallest and largest level allowed at the cell centres x[i], y[j] at
+    time t: the largest minlevel and maxlevel of the regions containing a
+    point, and 1 where no region does (GeoClaw does not flag a point that
+    no region or topography file covers).
+
+    OUTPUT:
+        minlevel, maxlevel - int arrays [j,i]
+    """
+    shape = (len(y), len(x))
+    minlevel = np.ones(shape, dtype=np.int32)
+    maxlevel = np.ones(shape, dtype=np.int32)
+    for rmin, rmax, t1, t2, x1, x2, y1, y2 in regions:
+        if t < t1 or t > t2:
+            continue
+        i1, i2 = _index_range(x, x1, x2)
+        j1, j2 = _index_range(y, y1, y2)
+        box = (slice(j1, j2), slice(i1, i2))
+        minlevel[box] = np.maximum(minlevel[box], rmin)
+        maxlevel[box] = np.maximum(maxlevel[box], rmax)
+    return np.minimum(minlevel, levels_max), np.minimum(maxlevel, levels_max)
+
+
+def clip_regions(regions, lower, upper):
+    """
+    Regions clipped to the domain [lower[0], upper[0]] x [lower[1],
+    upper[1]], without the ones outside it.
+
+    OUTPUT:
+        clipped - list of regions
+        changed - indices (into regions) of the regions clipped or dropped
+    """
+    clipped = []
+    changed = []
+    for k, region in enumerate(regions):
+        x1, x2, y1, y2 = region[4:8]
+        box = [max(x1, lower[0]), min(x2, upper[0]),
+               max(y1, lower[1]), min(y2, upper[1])]
+        if box != [x1, x2, y1, y2]:
+            changed.append(k)
+        if box[0] < box[1] and box[2] < box[3]:
+            clipped.append(list(region[:4]) + box)
+    return clipped, changed
+
+
+def overlapping_pairs(regions):
+    """
+    Pairs (k, m), k < m, of regions that overlap in space and time, found
+    by a sweep in x over the regions sorted by x1 with a list of the ones
+    still open.
+    """
+    order = sorted(range(len(regions)), key=lambda k: regions[k][4])
+    active = []
+    pairs = []
+    for k in order:
+        r = regions[k]
+        active = [m for m in active if regions[m][5] > r[4]]
+        for m in active:
+            s = regions[m]
+            if s[6] < r[7] and r[6] < s[7] and s[2] <= r[3] and r[2] <= s[3]:
+                pairs.append((min(k, m), max(k, m)))
+        active.append(k)
+    return sorted(pairs)
+
+
+def _rectangle(target, allowed, j, i, across_first):
+    """Grow a rectangle of allowed cells from (j, i), see _compact_window."""
+    ny, nx = allowed.shape
+    if across_first:
+        i2 = i + 1
+        while i2 < nx and allowed[j, i2]:
+            i2 += 1
+        j2 = j + 1
+        while j2 < ny and allowed[j2, i:i2].all():
+            j2 += 1
+    else:
+        j2 = j + 1
+        while j2 < ny and allowed[j2, i]:
+            j2 += 1
+        i2 = i + 1
+        while i2 < nx and allowed[j:j2, i2].all():
+            i2 += 1
+    # trim the rows and columns that cover no target cell:
+    while not target[j2 - 1, i:i2].any():
+        j2 -= 1
+    while not target[j:j2, i2 - 1].any():
+        i2 -= 1
+    return j2, i2, target[j:j2, i:i2].sum()
+
+
+def _compact_window(regions):
+    """
+    Fewest rectangles found greedily with the same levels at every point
+    as regions, which all have the same time window.
+    """
+    xs = sorted(set([r[4] for r in regions] + [r[5] for r in regions]))
+    ys = sorted(set([r[6] for r in regions] + [r[7] for r in regions]))
+    shape = (len(ys) - 1, len(xs) - 1)
+    minlevel = np.zeros(shape, dtype=np.int32)
+    maxlevel = np.zeros(shape, dtype=np.int32)
+    for r in regions:
+        box = (slice(ys.index(r[6]), ys.index(r[7])),
+               slice(xs.index(r[4]), xs.index(r[5])))
+        minlevel[box] = np.maximum(minlevel[box], r[0])
+        maxlevel[box] = np.maximum(maxlevel[box], r[1])
+    covered = maxlevel > 0
+
+    t1, t2 = regions[0][2:4]
+    compacted = []
+    levels = sorted(set(zip(minlevel[covered], maxlevel[covered])))
+    for lmin, lmax in levels:
+        target = covered & (minlevel == lmin) & (maxlevel == lmax)
+        # cells with higher levels may be covered too, the maximum over
+        # the regions is unchanged:
+        allowed = covered & (minlevel >= lmin) & (maxlevel >= lmax)
+        while target.any():
+            j, i = np.argwhere(target)[0]
+            best = max((_rectangle(target, allowed, j, i, across)
+                        for across in (True, False)), key=lambda r: r[2])
+            j2, i2 = best[:2]
+            compacted.append([int(lmin), int(lmax), t1, t2,
+                              xs[i], xs[i2], ys[j], ys[j2]])
+            target[j:j2, i:i2] = False
+    return compacted
+
+
+def compact_regions(regions):
+    """
+    Regions giving the same minlevel and maxlevel at every point and time
+    as regions, in fewer rectangles.  Regions with the same time window
+    are painted on the grid of their edges; the cells of each pair of
+    levels are then covered greedily, each rectangle grown from the first
+    uncovered cell across or down, whichever covers more, and allowed to
+    extend over cells with higher levels.  The regions of a window are
+    kept as they are if that gives more rectangles than there were.
+    """
+    windows = []
+    for r in regions:
+        if tuple(r[2:4]) not in windows:
+            windows.append(tuple(r[2:4]))
+    compacted = []
+    for window in windows:
+        given = [list(r) for r in regions if tuple(r[2:4]) == window]
+        merged = _compact_window(given)
+        compacted.extend(merged if len(merged) < len(given) else given)
+    return compacted
+
+
+if __name__ == '__main__':
+    # Check the regions of setrun.py, or of a region table, e.g.
+    #     python regions.py regions_tuned.csv
+    import sys
+    from setrun import setrun
+    rundata = setrun(region_file=sys.argv[1] if len(sys.argv) > 1 else None,
+                     compact='none')
+    regions = rundata.regiondata.regions
+    clipped, changed = clip_regions(regions, rundata.clawdata.lower,
+                                    rundata.clawdata.upper)
+    for k in changed:
+        print("region %i %s reaches outside the domain" % (k + 1, regions[k]))
+    for k, m in overlapping_pairs(clipped):
+        print("regions %i and %i overlap" % (k + 1, m + 1))
+    compacted = compact_regions(clipped)
+    print("%i regions, %i after compaction:" % (len(regions),
+                                                 len(compacted)))
+    for region in compacted:
+        print("  %s" % region)
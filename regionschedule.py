@@ -0,0 +1,233 @@
+"""
+Time-windowed refinement regions that follow the flood down the valley.
+
+The cross-section gauges of a pilot run (setrun(pilot=True), see
+regiontune.py) give, for every gauge, the window flow_start to flow_end in
+which the flood passes (gaugestats.py).  The gauge line is cut into
+segments of segment_gauges consecutive gauges, each covered by a box
+widened by half_width metres (as maketopo.corridor_boxes), and each box
+gets
+  - the setrun.py regions it overlaps, clipped to the box and to the
+    window from flow_start - lead_time to flow_end + lag_time of its
+    gauges, so each keeps its own levels where it is, and
+  - regions capping it at background_level before and after that window,
+so fine cells are forced or allowed only while the wave passes.  The
+regions of setrun.py that only cap refinement at background_level or less
+are kept, and so are the parts of the others outside the segment boxes
+(e.g. around the dam).  A window still open at the end of the pilot stays
+open.
+
+GeoClaw allows the finest level of all regions and topography files
+containing a point, so the caps only hold where the topography files allow
+no more than background_level.  setrun.py registers the topography with
+maxlevel table_topo_maxlevel when a region table is used; the topography
+of that run is checked for conflicts with the caps, and the fine cells
+are predicted with it.
+
+Example:
+    python regionschedule.py --pilot _pilot -o regions_schedule.csv
+    MEGAFLOOD_REGION_FILE=regions_schedule.csv make .output
+
+"""
+from __future__ import absolute_import
+from __future__ import print_function
+import os
+import numpy as np
+
+from gaugestats import gauge_summary
+from maketopo import corridor_boxes
+from regions import write_regions, topo_regions
+
+# consecutive gauges (about 1 km apart) per segment:
+segment_gauges = 10
+
+# half width (m) of the segment boxes around the gauge line:
+half_width = 2500.
+
+# refinement is in place this long (s) before the flood reaches a segment
+# and kept this long after it has passed:
+lead_time = 1800.
+lag_time = 1800.
+
+# finest level allowed in a segment outside its window:
+background_level = 3
+
+
+def _overlaps(region, box):
+    x1, x2, y1, y2 = region[4:8]
+    return x1 < box[1] and x2 > box[0] and y1 < box[3] and y2 > box[2]
+
+
+def _intersection(a, b):
+    return [max(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]),
+            min(a[3], b[3])]
+
+
+def segment_regions(regions, box, t1, t2):
+    """
+    The regions overlapping box, clipped to box and to the window t1, t2,
+    as [minlevel, maxlevel, t1, t2, x1, x2, y1, y2].
+    """
+    clipped = []
+    for r in regions:
+        if _overlaps(r, box) and r[2] < t2 and r[3] > t1:
+            clipped.append(list(r[:2]) + [max(t1, r[2]), min(t2, r[3])]
+                           + _intersection(r[4:8], box))
+    return clipped
+
+
+def outside_boxes(rect, boxes):
+    """
+    The part of rect [x1, x2, y1, y2] outside all boxes, as a list of
+    rectangles.
+    """
+    pieces = [list(rect)]
+    for b in boxes:
+        remaining = []
+        for x1, x2, y1, y2 in pieces:
+            if not (x1 < b[1] and x2 > b[0] and y1 < b[3] and y2 > b[2]):
+                remaining.append([x1, x2, y1, y2])
+                continue
+            if x1 < b[0]:
+                remaining.append([x1, b[0], y1, y2])
+            if b[1] < x2:
+                remaining.append([b[1], x2, y1, y2])
+            xa, xb = max(x1, b[0]), min(x2, b[1])
+            if y1 < b[2]:
+                remaining.append([xa, xb, y1, b[2]])
+            if b[3] < y2:
+                remaining.append([xa, xb, b[3], y2])
+        pieces = remaining
+    return pieces
+
+
+def schedule(summary, regions, ngauges=segment_gauges, width=half_width,
+             lead=lead_time, lag=lag_time, background=background_level,
+             levels=None):
+    """
+    Regions following the flood, see the module docstring.
+
+    INPUT:
+        summary - gauge summary of the pilot (gaugestats.gauge_summary)
+        regions - the regions of setrun.py
+        levels - (minlevel, maxlevel) of all segments, default the
+                 overlapping regions clipped to each segment
+
+    OUTPUT:
+        scheduled - list of [minlevel, maxlevel, t1, t2, x1, x2, y1, y2]
+    """
+    summary = np.sort(summary, order='gaugeno')
+    gauges = [[g['gaugeno'], g['x'], g['y']] for g in summary]
+    t_end = np.nanmax(summary['flow_end'])
+    default = (1, max(r[1] for r in regions))
+    boxes = [[float(v) for v in box]
+             for box in corridor_boxes(gauges, width, ngauges)]
+
+    scheduled = []
+    for r in regions:
+        if r[1] <= background:
+            scheduled.append(list(r))
+        else:
+            scheduled.extend(list(r[:4]) + piece
+                             for piece in outside_boxes(r[4:8], boxes))
+    for k, box in enumerate(boxes):
+        part = summary[k * ngauges:k * ngauges + ngauges + 1]
+        overlapping = [r for r in regions if _overlaps(r, box)]
+        maxlevel = levels[1] if levels else \
+            max([r[1] for r in overlapping] or [default[1]])
+        cap = min(background, maxlevel)
+        if np.all(np.isnan(part['flow_start'])):
+            # never reached:
+            scheduled.append([1, cap, 0., 1.e10] + box)
+            continue
+        t1 = max(0., float(np.nanmin(part['flow_start'])) - lead)
+        t2 = float(np.nanmax(part['flow_end']))
+        t2 = 1.e10 if t2 >= t_end else t2 + lag
+        if levels:
+            scheduled.append([levels[0], levels[1], t1, t2] + box)
+        elif overlapping:
+            # the ones capped at background are kept as they are:
+            scheduled.extend(r for r in segment_regions(overlapping, box,
+                                                        t1, t2)
+                             if r[1] > background)
+        else:
+            scheduled.append([default[0], default[1], t1, t2] + box)
+        if t1 > 0:
+            scheduled.append([1, cap, 0., t1] + box)
+        if t2 < 1.e10:
+            scheduled.append([1, cap, t2, 1.e10] + box)
+    return scheduled
+
+
+def topo_conflicts(scheduled, topo, background=background_level):
+    """
+    The topography regions that allow more than background over a capped
+    segment, which lifts the caps there.
+    """
+    caps = [r for r in scheduled if r[1] <= background]
+    return [t for t in topo if t[1] > background
+            and any(_overlaps(t, c[4:8]) for c in caps)]
+
+
+def main():
+    import argparse
+    from setrun import setrun
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--pilot', default='_pilot',
+                        help='pilot directory (with _output)')
+    parser.add_argument('--gauges', type=int, default=segment_gauges,
+                        help='gauges per segment')
+    parser.add_argument('--width', type=float, default=half_width)
+    parser.add_argument('--lead', type=float, default=lead_time)
+    parser.add_argument('--lag', type=float, default=lag_time)
+    parser.add_argument('--background', type=int, default=background_level)
+    parser.add_argument('--levels', type=int, nargs=2, default=None,
+                        metavar=('MIN', 'MAX'),
+                        help='levels of all segments (default from the '
+                             'regions they overlap)')
+    parser.add_argument('-j', '--nprocs', type=int, default=None)
+    parser.add_argument('-o', '--output', default='regions_schedule.csv')
+    args = parser.parse_args()
+
+    outdir = os.path.join(args.pilot, '_output')
+    rundata = setrun()
+    regions = rundata.regiondata.regions
+    summary = gauge_summary(outdir, args.nprocs)
+    scheduled = schedule(summary, regions, args.gauges, args.width,
+                         args.lead, args.lag, args.background, args.levels)
+
+    lines = ["Regions following the flood at the gauges of %s"
+             % os.path.abspath(outdir),
+             "%i regions, segments of %i gauges" % (len(scheduled),
+                                                    args.gauges)]
+
+    from regiontune import (pilot_grid, flood_times, fine_cells,
+                            report_lines, table_topo)
+    from setrun import pilot_levels, table_topo_maxlevel
+    topo = topo_regions(rundata.topo_data.topofiles)
+    run_topo = table_topo(topo, table_topo_maxlevel)
+    conflicts = topo_conflicts(scheduled, run_topo, args.background)
+    if conflicts:
+        lines.append("warning: topography files allow level %i over "
+                     "capped segments, the caps do not hold there"
+                     % max(t[1] for t in conflicts))
+
+    clawdata, amrdata = rundata.clawdata, rundata.amrdata
+    x, y = pilot_grid(outdir, clawdata.lower, clawdata.upper)
+    t_first, t_last, times = flood_times(outdir, x, y)
+    counts = [fine_cells(r + t, x, y, t_first, t_last, times,
+                         amrdata.amr_levels_max,
+                         amrdata.refinement_ratios_x,
+                         min(pilot_levels, amrdata.amr_levels_max))
+              for r, t in ((regions, topo), (scheduled, run_topo))]
+    lines.extend(report_lines(counts[0], counts[1],
+                              amrdata.refinement_ratios_t))
+
+    write_regions(args.output, scheduled, '\n'.join(lines))
+    print('\n'.join(lines))
+    print("Wrote %s, use it with MEGAFLOOD_REGION_FILE=%s"
+          % (args.output, args.output))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,339 @@
+"""
+Propose refinement regions from a coarse pilot run.
+
+The pilot is setrun(pilot=True): the same run with at most pilot_levels
+levels and a binary frame every hour, so it costs a small fraction of the
+full run.  Each frame is sampled on a grid at the pilot's finest cell
+size, and a cell is on the flood path while the depth exceeds flood_depth
+and the speed flood_speed.  The first and last time of every cell on the
+path are kept, and the path is covered by few rectangles by bisecting its
+bounding box until each box is at least cluster_cutoff full (as GeoClaw
+clusters flagged cells into grids).  Each rectangle becomes a region
+[minlevel, maxlevel, t1, t2, x1, x2, y1, y2] active from the first to the
+last time of its cells, padded by the longest pilot frame interval (the
+flood reaches a cell up to one interval before the frame that first sees
+it, and may stay until the next one) plus time_margin.
+
+The number of fine cells is predicted for the regions of setrun.py and
+for the proposal: at each frame time a cell is refined to level L if the
+regions force it (minlevel >= L), or allow it (maxlevel >= L) and it is on
+the flood path then.  The topography files take part in both, as in
+GeoClaw, for the proposal as setrun.py registers them with a region table
+(maxlevel at most table_topo_maxlevel).
+
+Example:
+    python regiontune.py --run --threads 8 -o regions_tuned.csv
+    MEGAFLOOD_REGION_FILE=regions_tuned.csv make .output
+
+"""
+from __future__ import absolute_import
+from __future__ import print_function
+import os
+import warnings
+import numpy as np
+
+from frameio import list_frames, read_frame, read_headers, fill_grid
+from regions import write_regions, topo_regions, level_maps
+
+pilot_dir = '_pilot'
+
+# depth (m) and speed (m/s) above which a cell is on the flood path:
+flood_depth = 0.5
+flood_speed = 0.5
+
+# pilot cells per side of the blocks that the regions are made of:
+block_cells = 4
+
+# smallest fraction of flood path blocks in a region:
+cluster_cutoff = 0.7
+
+# padding (s) of the time window of each region, on top of one pilot
+# frame interval:
+time_margin = 1800.
+
+
+def run_pilot(threads=1, directory=pilot_dir, exe_path=None, force=False):
+    """
+    Run setrun(pilot=True) in directory unless it is done.
+
+    OUTPUT:
+        outdir - the _output directory of the pilot
+    """
+    from ensemble import exe, write_member, run_member, is_done
+    params = {'pilot': True}
+    member_dir = os.path.abspath(directory)
+    outdir = os.path.join(member_dir, '_output')
+    if not force and is_done(member_dir, params):
+        return outdir
+    exe_path = os.path.abspath(exe_path or exe)
+    if not os.path.exists(exe_path):
+        raise IOError("*** %s not found, run 'make .exe' first" % exe_path)
+    write_member(params, member_dir)
+    returncode = run_member((member_dir, params, exe_path, threads))[1]
+    if returncode != 0:
+        raise RuntimeError("*** pilot failed, see %s"
+                           % os.path.join(outdir, 'run.log'))
+    return outdir
+
+
+def pilot_grid(outdir, lower, upper):
+    """
+    Cell centres x, y covering [lower, upper] at the finest cell size of
+    the pilot frames.
+    """
+    patches = []
+    for frameno in list_frames(outdir):
+        patches.extend(read_headers(frameno, outdir))
+    if not patches:
+        raise IOError("*** no frames in %s" % outdir)
+    dx = min(p.dx for p in patches)
+    dy = min(p.dy for p in patches)
+    nx = int(round((upper[0] - lower[0]) / dx))
+    ny = int(round((upper[1] - lower[1]) / dy))
+    x = lower[0] + (np.arange(nx) + 0.5) * dx
+    y = lower[1] + (np.arange(ny) + 0.5) * dy
+    return x, y
+
+
+def _on_path(depth_tol, speed_tol):
+    def values(patch):
+        h, hu, hv = patch.q[0], patch.q[1], patch.q[2]
+        wet = h > depth_tol
+        speed = np.zeros_like(h)
+        speed[wet] = np.hypot(hu[wet], hv[wet]) / h[wet]
+        return wet & (speed > speed_tol)
+    return values
+
+
+def flood_times(outdir, x, y, depth_tol=flood_depth, speed_tol=flood_speed):
+    """
+    First and last frame time at which each cell (x[i], y[j]) is on the
+    flood path, NaN if never.
+
+    OUTPUT:
+        t_first, t_last - arrays [j,i]
+        times - the frame times
+    """
+    dx, dy = x[1] - x[0], y[1] - y[0]
+    x1, y1 = x[0] - dx / 2, y[0] - dy / 2
+    t_first = np.full((len(y), len(x)), np.nan)
+    t_last = np.full((len(y), len(x)), np.nan)
+    values = _on_path(depth_tol, speed_tol)
+    times = []
+    for frameno in list_frames(outdir):
+        t, patches = read_frame(frameno, outdir)
+        times.append(t)
+        path = fill_grid(patches, x1, y1, dx, dy, len(x), len(y),
+                         values, fill=0.)[0] > 0
+        t_first[path & np.isnan(t_first)] = t
+        t_last[path] = t
+    return t_first, t_last, np.array(times)
+
+
+def _bbox(mask):
+    rows = np.flatnonzero(mask.any(axis=1))
+    cols = np.flatnonzero(mask.any(axis=0))
+    return rows[0], rows[-1] + 1, cols[0], cols[-1] + 1
+
+
+def _split_index(signature):
+    """Where to cut a box with the given signature (flags per line)."""
+    holes = np.flatnonzero(signature[1:-1] == 0) + 1
+    if len(holes):
+        # the hole closest to the middle:
+        return holes[np.argmin(abs(holes - len(signature) / 2.))]
+    if len(signature) >= 4:
+        # the largest change of the second difference (an edge):
+        laplace = np.diff(signature, 2)
+        jump = abs(np.diff(laplace))
+        if jump.max() > 0:
+            return np.argmax(jump) + 2
+    return len(signature) // 2
+
+
+def cluster(mask, cutoff=cluster_cutoff):
+    """
+    Cover the True cells of mask[j,i] with boxes (j1, j2, i1, i2) (half
+    open index ranges) that are each at least cutoff full, by bisection of
+    the bounding box at holes or edges of the row and column counts.
+    """
+    if not mask.any():
+        return []
+    boxes = []
+    stack = [_bbox(mask)]
+    while stack:
+        j1, j2, i1, i2 = stack.pop()
+        sub = mask[j1:j2, i1:i2]
+        if not sub.any():
+            continue
+        b = _bbox(sub)
+        j1, j2, i1, i2 = j1 + b[0], j1 + b[1], i1 + b[2], i1 + b[3]
+        sub = mask[j1:j2, i1:i2]
+        if sub.mean() >= cutoff or sub.size == 1:
+            boxes.append((j1, j2, i1, i2))
+            continue
+        if j2 - j1 >= i2 - i1:
+            k = _split_index(sub.sum(axis=1))
+            stack.extend([(j1, j1 + k, i1, i2), (j1 + k, j2, i1, i2)])
+        else:
+            k = _split_index(sub.sum(axis=0))
+            stack.extend([(j1, j2, i1, i1 + k), (j1, j2, i1 + k, i2)])
+    return boxes
+
+
+def _block_reduce(a, n, func):
+    ny, nx = a.shape
+    pad = ((0, -ny % n), (0, -nx % n))
+    fill = np.nan if a.dtype.kind == 'f' else False
+    a = np.pad(a, pad, mode='constant', constant_values=fill)
+    blocks = a.reshape((a.shape[0] // n, n, a.shape[1] // n, n))
+    return func(blocks, axis=(1, 3))
+
+
+def propose_regions(x, y, t_first, t_last, times, minlevel=1, maxlevel=5,
+                    block=block_cells, cutoff=cluster_cutoff,
+                    margin=time_margin):
+    """
+    Regions covering the flood path, see the module docstring.  A region
+    whose cells are still on the path in the last frame stays active.
+    """
+    if len(times) > 1:
+        margin += float(np.diff(times).max())
+    path = _block_reduce(~np.isnan(t_first), block, np.any)
+    with warnings.catch_warnings():
+        # blocks off the path are all NaN:
+        warnings.simplefilter('ignore', RuntimeWarning)
+        first = _block_reduce(t_first, block, np.nanmin)
+        last = _block_reduce(t_last, block, np.nanmax)
+    dx, dy = x[1] - x[0], y[1] - y[0]
+    x_edge = x[0] - dx / 2
+    y_edge = y[0] - dy / 2
+    regions = []
+    for j1, j2, i1, i2 in cluster(path, cutoff):
+        t1 = float(np.nanmin(first[j1:j2, i1:i2]))
+        t2 = float(np.nanmax(last[j1:j2, i1:i2]))
+        t1 = max(0., t1 - margin)
+        t2 = 1.e10 if t2 >= times[-1] else t2 + margin
+        regions.append([minlevel, maxlevel, t1, t2,
+                        float(x_edge + i1 * block * dx),
+                        float(min(x_edge + i2 * block * dx, x[-1] + dx / 2)),
+                        float(y_edge + j1 * block * dy),
+                        float(min(y_edge + j2 * block * dy, y[-1] + dy / 2))])
+    return regions
+
+
+def table_topo(topo, maxlevel):
+    """
+    The topography regions topo as setrun.py registers them with a region
+    table: allowing no more than maxlevel.
+    """
+    return [[min(t[0], maxlevel), min(t[1], maxlevel)] + list(t[2:])
+            for t in topo]
+
+
+def fine_cells(regions, x, y, t_first, t_last, times, levels_max,
+               ratios, pilot_level):
+    """
+    Predicted cell count of each level above pilot_level summed over the
+    frame times, in cells of that level.
+
+    OUTPUT:
+        counts - dict mapping level to the number of cells
+    """
+    counts = dict((level, 0.) for level in range(pilot_level + 1,
+                                                 levels_max + 1))
+    for t in times:
+        on_path = (t_first <= t) & (t <= t_last)
+        minlevel, maxlevel = level_maps(regions, x, y, t, levels_max)
+        for level in counts:
+            # level-L cells in one pilot cell:
+            per_cell = np.prod(ratios[pilot_level - 1:level - 1])**2
+            refined = (minlevel >= level) | ((maxlevel >= level) & on_path)
+            counts[level] += per_cell * np.count_nonzero(refined)
+    return counts
+
+
+def cell_steps(counts, ratios_t):
+    """
+    Cells of fine_cells weighted by the time steps of their level relative
+    to level 1, i.e. proportional to the cell updates.
+    """
+    return sum(n * np.prod(ratios_t[:level - 1])
+               for level, n in counts.items())
+
+
+def report_lines(before, after, ratios_t):
+    """Lines comparing the fine_cells counts before and after."""
+    lines = ["predicted cells x frames per level (before -> after):"]
+    for level in sorted(before):
+        if before[level] == 0:
+            continue
+        lines.append("  level %i: %.4g -> %.4g (%+.0f%%)"
+                     % (level, before[level], after[level],
+                        100 * (after[level] / before[level] - 1)))
+    total = cell_steps(before, ratios_t)
+    if total > 0:
+        lines.append("  fine cell updates: %+.0f%%"
+                     % (100 * (cell_steps(after, ratios_t) / total - 1)))
+    return lines
+
+
+def main():
+    import argparse
+    from setrun import setrun, pilot_levels, table_topo_maxlevel
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--run', action='store_true',
+                        help='run the pilot (unless done) before tuning')
+    parser.add_argument('--pilot', default=pilot_dir,
+                        help='pilot directory (with _output)')
+    parser.add_argument('--threads', type=int, default=1)
+    parser.add_argument('--depth', type=float, default=flood_depth)
+    parser.add_argument('--speed', type=float, default=flood_speed)
+    parser.add_argument('--minlevel', type=int, default=1)
+    parser.add_argument('--maxlevel', type=int, default=None,
+                        help='default: highest maxlevel of the regions')
+    parser.add_argument('--block', type=int, default=block_cells)
+    parser.add_argument('--cutoff', type=float, default=cluster_cutoff)
+    parser.add_argument('--margin', type=float, default=time_margin,
+                        help='padding (s) of the time windows beyond one '
+                             'pilot frame interval')
+    parser.add_argument('-o', '--output', default='regions_tuned.csv')
+    args = parser.parse_args()
+
+    outdir = os.path.join(args.pilot, '_output')
+    if args.run:
+        outdir = run_pilot(args.threads, args.pilot)
+    rundata = setrun()
+    clawdata, amrdata = rundata.clawdata, rundata.amrdata
+    regions = rundata.regiondata.regions
+    maxlevel = args.maxlevel or max(r[1] for r in regions)
+
+    x, y = pilot_grid(outdir, clawdata.lower, clawdata.upper)
+    t_first, t_last, times = flood_times(outdir, x, y, args.depth,
+                                         args.speed)
+    tuned = propose_regions(x, y, t_first, t_last, times, args.minlevel,
+                            maxlevel, args.block, args.cutoff, args.margin)
+
+    topo = topo_regions(rundata.topo_data.topofiles)
+    ratios = amrdata.refinement_ratios_x
+    levels_max = amrdata.amr_levels_max
+    pilot_level = min(pilot_levels, levels_max)
+    before = fine_cells(regions + topo, x, y, t_first, t_last, times,
+                        levels_max, ratios, pilot_level)
+    after = fine_cells(tuned + table_topo(topo, table_topo_maxlevel), x, y,
+                       t_first, t_last, times, levels_max, ratios,
+                       pilot_level)
+
+    lines = ["Regions from the pilot run in %s" % os.path.abspath(outdir),
+             "flood path: depth > %g m and speed > %g m/s"
+             % (args.depth, args.speed),
+             "%i regions instead of %i" % (len(tuned), len(regions))]
+    lines.extend(report_lines(before, after, amrdata.refinement_ratios_t))
+    write_regions(args.output, tuned, '\n'.join(lines))
+    print('\n'.join(lines))
+    print("Wrote %s, use it with MEGAFLOOD_REGION_FILE=%s"
+          % (args.output, args.output))
+
+
+if __name__ == '__main__':
+    main()
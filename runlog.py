@@ -0,0 +1,192 @@
+"""
+Parse the screen output of xgeoclaw (run.log) and fort.amr.
+
+Three parts of the output are read:
+  - the step lines printed for levels <= clawdata.verbosity,
+        AMRCLAW: level  2  CFL = .512E+00  dt = 0.3125E+01  final t = ...
+    counted per level;
+  - the regridding messages printed for levels <= verbosity_regrid and
+    with rprint, counted per level, with the number of grids and cells of
+    the new level where they are printed.  AMRClaw 5.6 prints one line
+    for the levels made anew from a base level,
+        regridding levels  2 to  4 at t =   0.120000E+03
+    which counts one regrid of each of levels 2 to 4; the older
+    'regridding level 3' form is read too;
+  - the timing summary printed at the end of the run,
+        ============ Timing Data ============
+        Integration Time (stepgrid + BC + overhead)
+        Level  Wall Time (seconds)  CPU Time (seconds)  Total Cell Updates
+          1        12.345               45.678              0.123E+08
+        ...
+        total      ...
+        All levels:
+        stepgrid   ...
+        Regridding ...
+    giving the wall and CPU time and the cell updates of each level and
+    the time spent in each part of the code.
+The wording of the regridding messages differs between GeoClaw versions
+and the patterns below may miss it: read_regrids warns when it finds no
+regridding message at all.
+
+"""
+from __future__ import absolute_import
+from __future__ import print_function
+import os
+import re
+import warnings
+
+_step_re = re.compile(r'AMRCLAW:\s+level\s+(\d+)\s+CFL\s*=\s*(\S+)\s+'
+                      r'dt\s*=\s*(\S+)\s+final t\s*=\s*(\S+)')
+_regrid_re = re.compile(r'regrid\w*\s+(?:of\s+)?levels?\s+(\d+)'
+                        r'(?:\s+to\s+(\d+))?', re.I)
+_grids_re = re.compile(r'level\s+(\d+)\s+has\s+(\d+)\s+grids?'
+                       r'(?:\s+with\s+(\d+)\s+cells)?', re.I)
+_number_re = re.compile(r'[-+]?(?:\d+\.?\d*|\.\d+)(?:[eEdD][-+]?\d+)?')
+
+
+def _float(s):
+    return float(s.replace('D', 'E').replace('d', 'e'))
+
+
+def parse_steps(lines):
+    """
+    Step lines per level.
+
+    OUTPUT:
+        steps - dict mapping level to a dict with 'count', 'dt_min',
+                'dt_max', 'cfl_max' and 't_final' (time reached)
+    """
+    steps = {}
+    for line in lines:
+        match = _step_re.search(line)
+        if match is None:
+            continue
+        level = int(match.group(1))
+        cfl, dt, t = [_float(match.group(k)) for k in (2, 3, 4)]
+        s = steps.get(level)
+        if s is None:
+            steps[level] = {'count': 1, 'dt_min': dt, 'dt_max': dt,
+                            'cfl_max': cfl, 't_final': t}
+            continue
+        s['count'] += 1
+        s['dt_min'] = min(s['dt_min'], dt)
+        s['dt_max'] = max(s['dt_max'], dt)
+        s['cfl_max'] = max(s['cfl_max'], cfl)
+        s['t_final'] = t
+    return steps
+
+
+def parse_regrids(lines):
+    """
+    Regridding messages per level.
+
+    OUTPUT:
+        regrids - dict mapping level to a dict with 'count' (regrids of
+                  that level) and, if grid counts are printed,
+                  'grids_max', 'cells_max' and the sums 'grids', 'cells'
+                  over the 'reports'
+    """
+    regrids = {}
+
+    def record(level):
+        return regrids.setdefault(level, {'count': 0, 'reports': 0,
+                                          'grids': 0, 'cells': 0,
+                                          'grids_max': 0, 'cells_max': 0})
+
+    for line in lines:
+        match = _grids_re.search(line)
+        if match is not None:
+            r = record(int(match.group(1)))
+            grids = int(match.group(2))
+            cells = int(match.group(3) or 0)
+            r['reports'] += 1
+            r['grids'] += grids
+            r['cells'] += cells
+            r['grids_max'] = max(r['grids_max'], grids)
+            r['cells_max'] = max(r['cells_max'], cells)
+            continue
+        match = _regrid_re.search(line)
+        if match is not None:
+            first = int(match.group(1))
+            for level in range(first, int(match.group(2) or first) + 1):
+                record(level)['count'] += 1
+    return regrids
+
+
+def parse_timing(lines):
+    """
+    The timing summary at the end of the run, None if there is none (the
+    run did not finish).
+
+    OUTPUT:
+        timing - dict with
+            'levels': {level: {'wall', 'cpu', 'cell_updates'}}
+            'total': {'wall', 'cpu', 'cell_updates'}
+            'parts': {name: {'wall', 'cpu'}}, e.g. 'stepgrid',
+                     'regridding', 'output (valout)', 'total time'
+            'threads': number of OpenMP threads, if printed
+    """
+    timing = None
+    section = None
+    for line in lines:
+        if 'Timing Data' in line:
+            timing = {'levels': {}, 'total': None, 'parts': {}}
+            section = 'levels'
+            continue
+        if timing is None:
+            continue
+        text = line.strip()
+        if not text:
+            continue
+        if text.startswith('All levels'):
+            section = 'parts'
+            continue
+        match = re.match(r'Using\s+(\d+)\s+thread', text)
+        if match:
+            timing['threads'] = int(match.group(1))
+            continue
+
+        head = _number_re.split(text, 1)[0]
+        label = head.strip().rstrip(':')
+        numbers = [_float(n) for n in _number_re.findall(text[len(head):])]
+        if section == 'levels' and not label and len(numbers) >= 3:
+            timing['levels'][int(numbers[0])] = {
+                'wall': numbers[1], 'cpu': numbers[2],
+                'cell_updates': numbers[3] if len(numbers) > 3 else None}
+        elif section == 'levels' and label == 'total' and numbers:
+            timing['total'] = {'wall': numbers[0],
+                               'cpu': numbers[1] if len(numbers) > 1 else None,
+                               'cell_updates': numbers[2]
+                               if len(numbers) > 2 else None}
+        elif label and numbers and (section == 'parts'
+                                    or label.lower().startswith('total time')):
+            timing['parts'][label.lower()] = {
+                'wall': numbers[0],
+                'cpu': numbers[1] if len(numbers) > 1 else None}
+    return timing
+
+
+def read_log(fname):
+    """parse_steps and parse_timing of the file fname."""
+    with open(fname) as f:
+        lines = f.readlines()
+    return parse_steps(lines), parse_timing(lines)
+
+
+def read_regrids(fnames):
+    """
+    parse_regrids of the lines of all existing files in fnames, with a
+    warning if no regridding message is recognised.
+    """
+    lines = []
+    for fname in fnames:
+        if os.path.exists(fname):
+            with open(fname) as f:
+                lines.extend(f.readlines())
+    regrids = parse_regrids(lines)
+    if not regrids:
+        warnings.warn("no regridding messages recognised in %s: was the run "
+                      "instrumented (verbosity_regrid, rprint), and does "
+                      "runlog._regrid_re match this GeoClaw version?"
+                      % ', '.join(fnames))
+    return regrids
@@ -0,0 +1,138 @@
+"""
+Set up the plot figures, axes, and items for 'make .plots'.
+
+The maps of each frame (depth, speed and the AMR level of each cell) are
+drawn from the rasters cached by rasters.py, so after the first pass a
+frame is never composited from its patches again.  Surface elevation and
+depth are plotted at every gauge_stride-th cross-section gauge.
+
+The draw_* functions take a rasters.Raster and a matplotlib axes and are
+also used by plots.py, which renders the same maps in parallel.
+
+"""
+from __future__ import absolute_import
+from __future__ import print_function
+import os
+import numpy as np
+
+from rasters import load_raster
+
+# depth (m) and speed (m/s) at the top of the colour scales:
+depth_max = 100.
+speed_max = 20.
+
+# plot every gauge_stride-th gauge of the gauge table:
+gauge_stride = 50
+
+# raster cell size (degrees) of the maps, None for rasters.py's default:
+map_dx = None
+
+
+def _finish(ax, raster, image, label):
+    import matplotlib.pyplot as plt
+    plt.colorbar(image, ax=ax, label=label, shrink=0.8)
+    ax.set_xlabel('longitude')
+    ax.set_ylabel('latitude')
+    ax.set_aspect(1. / np.cos(np.radians(np.mean(raster.y))))
+    ax.set_title('t = %.2f h' % (raster.time / 3600.))
+
+
+def draw_depth(raster, ax):
+    """Depth map, dry cells left blank."""
+    image = ax.imshow(raster.depth, origin='lower', extent=raster.extent,
+                      cmap='Blues', vmin=0., vmax=depth_max,
+                      interpolation='nearest')
+    _finish(ax, raster, image, 'depth (m)')
+
+
+def draw_speed(raster, ax):
+    """Speed map, dry cells left blank."""
+    image = ax.imshow(raster.speed, origin='lower', extent=raster.extent,
+                      cmap='magma_r', vmin=0., vmax=speed_max,
+                      interpolation='nearest')
+    _finish(ax, raster, image, 'speed (m/s)')
+
+
+def draw_levels(raster, ax):
+    """AMR level of the patch each raster cell was taken from."""
+    level = np.where(raster.level > 0, raster.level, np.nan)
+    image = ax.imshow(level, origin='lower', extent=raster.extent,
+                      cmap='viridis', interpolation='nearest')
+    _finish(ax, raster, image, 'AMR level')
+
+
+# maps drawn for each frame: figure name, figure number, draw function
+frame_maps = [('Depth', 0, draw_depth),
+              ('Speed', 1, draw_speed),
+              ('AMR levels', 2, draw_levels)]
+
+
+def gauge_numbers(gauge_file='gauges_xs.csv', stride=gauge_stride):
+    """Every stride-th gauge number of the gauge table."""
+    from gauges import read_table
+    fname = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                         gauge_file)
+    return [int(g) for g in read_table(fname)[::stride, 0]]
+
+
+def _map_afteraxes(draw):
+    def afteraxes(current_data):
+        import matplotlib.pyplot as plt
+        raster = load_raster(current_data.frameno,
+                             current_data.plotdata.outdir, map_dx)
+        draw(raster, plt.gca())
+    return afteraxes
+
+
+#--------------------------
+def setplot(plotdata=None):
+#--------------------------
+    """
+    Specify what is to be plotted at each frame.
+    Input:  plotdata, an instance of pyclaw.plotters.data.ClawPlotData.
+    Output: a modified version of plotdata.
+    """
+    if plotdata is None:
+        from clawpack.visclaw.data import ClawPlotData
+        plotdata = ClawPlotData()
+
+    plotdata.clearfigures()  # clear any old figures,axes,items data
+    plotdata.format = os.environ.get('MEGAFLOOD_OUTPUT_FORMAT', 'ascii')
+
+    for name, figno, draw in frame_maps:
+        plotfigure = plotdata.new_plotfigure(name=name, figno=figno)
+        plotfigure.kwargs = {'figsize': (10, 8)}
+        plotaxes = plotfigure.new_plotaxes()
+        plotaxes.title = name
+        plotaxes.afteraxes = _map_afteraxes(draw)
+        # the map is drawn by afteraxes from the cached raster:
+        plotaxes.new_plotitem(plot_type='2d_empty')
+
+    #-----------------------------------------
+    # Figures for gauges
+    #-----------------------------------------
+    plotfigure = plotdata.new_plotfigure(name='Surface at gauges', figno=300,
+                                         type='each_gauge')
+    plotfigure.clf_each_gauge = True
+    plotaxes = plotfigure.new_plotaxes()
+    plotaxes.title = 'Surface'
+    plotitem = plotaxes.new_plotitem(plot_type='1d_plot')
+    plotitem.plot_var = 3    # eta
+    plotitem.plotstyle = 'b-'
+    plotitem = plotaxes.new_plotitem(plot_type='1d_plot')
+    plotitem.plot_var = 0    # h
+    plotitem.plotstyle = 'g--'
+
+    #-----------------------------------------
+    # Parameters used only when creating html and/or latex hardcopy
+    # e.g., via pyclaw.plotters.frametools.printframes:
+    plotdata.printfigs = True                # print figures
+    plotdata.print_format = 'png'            # file format
+    plotdata.print_framenos = 'all'          # list of frames to print
+    plotdata.print_gaugenos = gauge_numbers()  # list of gauges to print
+    plotdata.print_fignos = 'all'            # list of figures to print
+    plotdata.html = True                     # create html files of plots?
+    plotdata.html_homelink = '../README.html'   # pointer for top of index
+    plotdata.latex = False                   # create latex file of plots?
+
+    return plotdata
@@ -0,0 +1,7 @@
+import os
+import sys
+
+# the modules are scripts in the run directory, next to setrun.py:
+here = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(here))
+sys.path.insert(0, here)
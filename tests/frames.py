@@ -0,0 +1,72 @@
+"""
+Writers of small synthetic xgeoclaw frames for the tests.
+
+A patch is given as (grid_number, level, xlow, ylow, dx, dy, q) with
+q[m,i,j] the interior values; binary frames get nghost ghost cells of
+-999 around each patch.
+"""
+from __future__ import absolute_import
+from __future__ import print_function
+import os
+import numpy as np
+
+from frameio import frame_file
+
+
+def write_tfile(outdir, frameno, time, ngrids, meqn=4, nghost=2):
+    with open(frame_file(outdir, 't', frameno), 'w') as f:
+        f.write("%18.8e    time\n" % time)
+        f.write("%6i                 meqn\n" % meqn)
+        f.write("%6i                 ngrids\n" % ngrids)
+        f.write("%6i                 naux\n" % 3)
+        f.write("%6i                 ndim\n" % 2)
+        f.write("%6i                 nghost\n" % nghost)
+
+
+def _write_header(f, patch):
+    grid_number, level, xlow, ylow, dx, dy, q = patch
+    f.write("%6i                 grid_number\n" % grid_number)
+    f.write("%6i                 AMR_level\n" % level)
+    f.write("%6i                 mx\n" % q.shape[1])
+    f.write("%6i                 my\n" % q.shape[2])
+    f.write("%18.8e    xlow\n" % xlow)
+    f.write("%18.8e    ylow\n" % ylow)
+    f.write("%18.8e    dx\n" % dx)
+    f.write("%18.8e    dy\n" % dy)
+    f.write("\n")
+
+
+def write_frame(outdir, frameno, time, patches, binary=False, nghost=2):
+    """Write fort.t, fort.q and (if binary) fort.b of a frame."""
+    if not os.path.isdir(outdir):
+        os.makedirs(outdir)
+    meqn = patches[0][6].shape[0] if patches else 4
+    write_tfile(outdir, frameno, time, len(patches), meqn, nghost)
+    with open(frame_file(outdir, 'q', frameno), 'w') as f:
+        for patch in patches:
+            _write_header(f, patch)
+            if binary:
+                continue
+            q = patch[6]
+            for j in range(q.shape[2]):
+                for i in range(q.shape[1]):
+                    f.write(' '.join('%22.14E' % v for v in q[:, i, j])
+                            .replace('E', 'D') + '\n')
+                f.write("\n")
+    if binary:
+        blocks = []
+        for patch in patches:
+            q = patch[6]
+            full = np.full((q.shape[0], q.shape[1] + 2 * nghost,
+                            q.shape[2] + 2 * nghost), -999.)
+            full[:, nghost:-nghost, nghost:-nghost] = q
+            blocks.append(full.ravel(order='F'))
+        data = np.concatenate(blocks) if blocks else np.zeros(0)
+        data.astype(np.float64).tofile(frame_file(outdir, 'b', frameno))
+
+
+def random_patches(seed=0):
+    """A level 1 patch over [0, 4] x [0, 2] and a level 2 patch inside."""
+    rng = np.random.RandomState(seed)
+    return [(1, 1, 0., 0., 0.5, 0.5, rng.rand(4, 8, 4)),
+            (2, 2, 1., 0.5, 0.25, 0.25, rng.rand(4, 4, 2))]
@@ -0,0 +1,22 @@
+"""Writer of synthetic gaugeNNNNN.txt files in the format of GeoClaw 5.6."""
+from __future__ import absolute_import
+from __future__ import print_function
+import os
+
+
+def write_gauge(outdir, gaugeno, x, y, t, q, level=1, indent=''):
+    """
+    Write gauge gaugeno at (x, y) with rows t[k], q[k] (h, hu, hv, eta).
+    indent is put in front of the header lines.
+    """
+    if not os.path.isdir(outdir):
+        os.makedirs(outdir)
+    fname = os.path.join(outdir, 'gauge%05i.txt' % gaugeno)
+    with open(fname, 'w') as f:
+        f.write("%s# gauge_id= %5i location=( %17.10E %17.10E ) "
+                "num_eqn= %2i\n" % (indent, gaugeno, x, y, len(q[0])))
+        f.write("%s# Columns: level, time, q(1 ... num_eqn)\n" % indent)
+        for tk, qk in zip(t, q):
+            f.write("%02i %15.7E " % (level, tk)
+                    + ' '.join('%15.7E' % v for v in qk) + '\n')
+    return fname
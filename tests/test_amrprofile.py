@@ -0,0 +1,42 @@
+from __future__ import absolute_import
+import os
+import shutil
+
+from amrprofile import profile, report_lines
+from frames import write_frame, random_patches
+
+fixture = os.path.join(os.path.dirname(__file__), 'data',
+                       'run_instrumented.log')
+
+
+def _run(tmp_path):
+    outdir = str(tmp_path / '_output')
+    write_frame(outdir, 0, 0., random_patches(0))
+    write_frame(outdir, 1, 10., random_patches(1))
+    shutil.copy(fixture, os.path.join(outdir, 'run.log'))
+    return outdir
+
+
+def test_profile(tmp_path):
+    prof = profile(_run(tmp_path))
+    levels = dict((rec['level'], rec) for rec in prof['levels'])
+    assert levels[3]['steps'] == 5 and levels[3]['regrids'] == 3
+    assert levels[2]['patches_mean'] == 1 and levels[2]['cells_mean'] == 8
+    assert levels[3]['updates_per_second'] == 6.12e7 / 6.
+    lines = report_lines(prof)
+    assert 'inflated' in lines[1]
+    assert 'Level 3 takes the most integration time (81% of it).' in lines
+
+
+def test_profile_timing_of_another_run(tmp_path):
+    outdir = _run(tmp_path)
+    timing_log = str(tmp_path / 'base.log')
+    with open(fixture) as f:
+        text = f.read()
+    with open(timing_log, 'w') as f:
+        f.write(text.replace('6.000                 23.800',
+                             '3.000                 11.900'))
+    prof = profile(outdir, timing_log=timing_log)
+    levels = dict((rec['level'], rec) for rec in prof['levels'])
+    assert levels[3]['wall'] == 3. and levels[3]['steps'] == 5
+    assert report_lines(prof)[1] == '(times from %s)' % timing_log
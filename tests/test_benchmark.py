@@ -0,0 +1,29 @@
+from __future__ import absolute_import
+
+from benchmark import compare, print_result
+
+
+def _result(name, wall, rate, **settings):
+    return {'name': name, 'wall_time': wall, 'threads': 4,
+            'cell_updates_per_second': rate, 'settings': settings,
+            'steps': {}, 'cell_updates': {}}
+
+
+def test_compare_rates(capsys):
+    reference = _result('base', 100., 1.e6, cfl_desired=0.7)
+    assert not compare(_result('new', 90., 1.1e6, cfl_desired=0.8),
+                       reference)
+    out = capsys.readouterr().out
+    assert 'setting cfl_desired: 0.7 -> 0.8' in out
+    assert 'x 0.90' in out and 'x 1.10' in out
+    assert compare(_result('slow', 150., 0.8e6), reference)
+    assert not compare(_result('slow', 150., 0.95e6), reference)
+
+
+def test_compare_unknown_rates(capsys):
+    # a reference without timing summary or that took no time:
+    assert not compare(_result('new', 10., 1.e6), _result('old', 0., None))
+    assert not compare(_result('new', 10., None), _result('old', 10., 0.))
+    assert 'n/a' in capsys.readouterr().out
+    print_result(_result('new', 10., None))
+    assert 'n/a cell updates/s' in capsys.readouterr().out
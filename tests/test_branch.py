@@ -0,0 +1,39 @@
+from __future__ import absolute_import
+import os
+import pytest
+
+from branch import check_variants, trunk_name, _checkpoint_at
+from ensemble import parse_value
+
+
+def test_parse_value():
+    assert parse_value('0.05') == 0.05
+    assert parse_value('3600') == 3600
+    assert parse_value('True') is True
+    assert parse_value('none') == 'none'
+    assert parse_value('regions_a.csv') == 'regions_a.csv'
+    assert parse_value("['mc', 'mc', 'vanleer']") == ['mc', 'mc', 'vanleer']
+
+
+def test_check_variants():
+    check_variants([{'manning_coefficient': 0.03},
+                    {'region_file': 'a.csv', 'tfinal': 2.e5}])
+    with pytest.raises(ValueError):
+        check_variants([{'lake_volume': 81.}])
+
+
+def test_trunk_name():
+    assert trunk_name({}, 183600.) == 't183600'
+    assert trunk_name({'lake_volume': 81.0, 'checkpoint_interval': 3600},
+                      1000.) == 't1000_checkpoint_interval3600_lake_volume81.0'
+
+
+def test_checkpoint_at(tmp_path):
+    outdir = str(tmp_path)
+    for n, t in ((10, 500.), (20, 1000.)):
+        with open(os.path.join(outdir, 'fort.chk%05i' % n), 'w') as f:
+            f.write('data')
+        with open(os.path.join(outdir, 'fort.tck%05i' % n), 'w') as f:
+            f.write(' Checkpoint file at time t = %.6E\n' % t)
+    assert _checkpoint_at(outdir, 1000.).endswith('fort.chk00020')
+    assert _checkpoint_at(outdir, 750.) is None
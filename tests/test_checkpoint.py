@@ -0,0 +1,52 @@
+from __future__ import absolute_import
+import os
+import numpy as np
+
+from checkpoint import (checkpoint_times, wall_profile, list_checkpoints,
+                        latest_checkpoint, rotate)
+from frameio import frame_file
+from frames import write_frame, random_patches
+
+
+def _write_checkpoint(outdir, n, t, complete=True):
+    with open(os.path.join(outdir, 'fort.chk%05i' % n), 'w') as f:
+        f.write('data' if complete else '')
+    with open(os.path.join(outdir, 'fort.tck%05i' % n), 'w') as f:
+        if complete:
+            f.write(' Checkpoint file at time t =   %.6E\n' % t)
+
+
+def test_checkpoint_times():
+    # 100 s of simulation per wall second, then extrapolated:
+    profile = (np.array([0., 1000., 2000.]), np.array([0., 10., 20.]))
+    assert np.allclose(checkpoint_times(5000., 15., profile),
+                       [1500., 3000., 4500.])
+    assert checkpoint_times(1000., 15., profile) == []
+
+
+def test_wall_profile(tmp_path):
+    outdir = str(tmp_path)
+    assert wall_profile(str(tmp_path / 'missing')) is None
+    for frameno, (t, wall) in enumerate([(0., 1000.), (600., 1010.),
+                                         (1200., 1030.)]):
+        write_frame(outdir, frameno, t, random_patches(frameno))
+        os.utime(frame_file(outdir, 't', frameno), (wall, wall))
+    times, walls = wall_profile(outdir)
+    assert list(times) == [0., 600., 1200.]
+    assert list(walls) == [0., 10., 30.]
+
+
+def test_list_and_rotate(tmp_path):
+    outdir = str(tmp_path)
+    assert latest_checkpoint(outdir) is None
+    for n, t in ((100, 1000.), (200, 2000.), (300, 3000.)):
+        _write_checkpoint(outdir, n, t)
+    # cut short by a crash:
+    _write_checkpoint(outdir, 400, 4000., complete=False)
+    assert [c[0] for c in list_checkpoints(outdir)] == [1000., 2000., 3000.]
+    assert latest_checkpoint(outdir).endswith('fort.chk00300')
+    removed = rotate(outdir, keep=2)
+    assert [os.path.basename(r) for r in removed] == ['fort.chk00100']
+    assert not os.path.exists(os.path.join(outdir, 'fort.tck00100'))
+    assert os.path.exists(os.path.join(outdir, 'fort.chk00400'))
+    assert len(list_checkpoints(outdir)) == 2
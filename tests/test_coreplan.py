@@ -0,0 +1,38 @@
+from __future__ import absolute_import
+import numpy as np
+import pytest
+
+from coreplan import fit_scaling, predicted_time, plan
+
+
+def test_fit_recovers_coefficients():
+    threads = [1, 2, 4, 8, 16]
+    walls = predicted_time(threads, [100., 1600., 5.])
+    assert np.allclose(fit_scaling(threads, walls), [100., 1600., 5.])
+    # too few trials for the thread cost:
+    coeffs = fit_scaling([1, 2, 4], predicted_time([1, 2, 4],
+                                                   [50., 800., 0.]))
+    assert np.allclose(coeffs, [50., 800., 0.])
+
+
+def test_fit_clips_negative_terms():
+    coeffs = fit_scaling([1, 2, 4, 8], [1000., 480., 240., 120.])
+    assert coeffs[0] >= 0 and coeffs[2] >= 0
+
+
+def test_plan():
+    coeffs = [100., 1600., 5.]
+    rows = plan(coeffs, 16)
+    assert len(rows) == 16
+    best = rows[0]
+    assert best['runs_per_hour'] == max(r['runs_per_hour'] for r in rows)
+    assert all(r['jobs'] == 16 // r['threads'] for r in rows)
+    rows = plan(coeffs, 16, members=3)
+    assert all(r['jobs'] <= 3 for r in rows)
+    assert rows[0]['makespan'] == min(r['makespan'] for r in rows)
+
+
+@pytest.mark.parametrize('cores, members', [(0, None), (8, 0), (-1, 4)])
+def test_plan_rejects_empty(cores, members):
+    with pytest.raises(ValueError):
+        plan([100., 1600., 5.], cores, members)
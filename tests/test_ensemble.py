@@ -0,0 +1,46 @@
+from __future__ import absolute_import
+import os
+import stat
+
+from ensemble import (member_name, make_members, setrun_args, is_done,
+                      run_member, read_json)
+
+
+def test_member_names():
+    members = make_members({'lake_volume': [10., 81.],
+                            'manning_coefficient': [0.03, 0.04, 0.05]})
+    assert len(members) == 6
+    names = [member_name(m) for m in members]
+    assert len(set(names)) == 6
+    assert names[0] == 'lake_volume10.0_manning_coefficient0.03'
+    assert member_name(dict(members[0], restart='x/fort.chk00010')) \
+        == names[0]
+
+
+def test_setrun_args():
+    assert setrun_args({'lake_volume': 81.}, 'out') == \
+        {'lake_volume': 81., 'outdir': 'out', 'lake_qinit': 'none'}
+    assert setrun_args({'lake_stage': 3088., 'lake_qinit': 'a.xyz'},
+                       'out')['lake_qinit'] == 'a.xyz'
+    assert 'lake_qinit' not in setrun_args({'manning_coefficient': 0.05},
+                                           'out')
+
+
+def test_run_member_and_is_done(tmp_path):
+    member_dir = str(tmp_path / 'member')
+    os.makedirs(os.path.join(member_dir, '_output'))
+    exe_path = str(tmp_path / 'xgeoclaw')
+    with open(exe_path, 'w') as f:
+        f.write('#!/bin/sh\necho "threads $OMP_NUM_THREADS"\n'
+                'touch fort.chk00001\n')
+    os.chmod(exe_path, os.stat(exe_path).st_mode | stat.S_IEXEC)
+    params = {'manning_coefficient': 0.05}
+    assert not is_done(member_dir, params)
+    result = run_member((member_dir, params, exe_path, 3))
+    assert result[:2] == (member_dir, 0)
+    with open(os.path.join(member_dir, '_output', 'run.log')) as f:
+        assert f.read() == 'threads 3\n'
+    assert read_json(os.path.join(member_dir, 'done.json'))['threads'] == 3
+    assert is_done(member_dir, params)
+    assert not is_done(member_dir, {'manning_coefficient': 0.04})
+    assert read_json(str(tmp_path / 'missing.json')) is None
@@ -0,0 +1,83 @@
+from __future__ import absolute_import
+import os
+import numpy as np
+import pytest
+
+from fgmaxio import (field_names, point_grid, build_cache, load_cache,
+                     cache_is_current, write_band, nodata_value)
+
+
+def write_fgmax_output(outdir, skip=((0, 0), (3, 2))):
+    """fort.FG1.valuemax (h, speed) and fort.FG1.aux1 on a 5 x 4 grid."""
+    rows, aux = [], []
+    for j in range(4):
+        for i in range(5):
+            if (i, j) in skip:
+                continue
+            x, y = 94. + 0.01 * i, 29. + 0.02 * j
+            level = 1 + (i + j) % 3
+            h = 10. * i + j
+            rows.append((x, y, level, h, 0.5 * h, 100. + i, 200. + j,
+                         50. + i))
+            aux.append((x, y, 3000. + i, 3100. + i, 3200. + i))
+    with open(os.path.join(outdir, 'fort.FG1.valuemax'), 'w') as f:
+        for r in rows:
+            f.write('%18.8E %18.8E %4i' % r[:3]
+                    + ''.join(' %18.8E' % v for v in r[3:]) + '\n')
+    with open(os.path.join(outdir, 'fort.FG1.aux1'), 'w') as f:
+        for r in aux:
+            f.write(' '.join('%18.8E' % v for v in r) + '\n')
+
+
+def test_field_names():
+    assert field_names(8) == ['x', 'y', 'level', 'h', 'speed', 't_h',
+                              't_speed', 'arrival']
+    with pytest.raises(ValueError):
+        field_names(7)
+
+
+def test_point_grid():
+    x = np.array([1., 1.5, 3.])
+    y = np.array([2., 2., 2.2])
+    assert np.allclose(point_grid(x, y), (1., 2., 0.5, 0.2, 5, 2))
+
+
+def test_cache(tmp_path):
+    outdir = str(tmp_path)
+    write_fgmax_output(outdir)
+    cache = load_cache(outdir, chunk_lines=3)
+    assert cache.shape == (4, 5) and cache.npoints == 18
+    assert np.isnan(cache.fields['h'][0, 0])
+    assert np.isnan(cache.fields['h'][2, 3])
+    assert cache.fields['h'][3, 4] == 43. and cache.fields['speed'][1, 2] \
+        == 10.5
+    assert cache.fields['arrival'][2, 4] == 54.
+    # B on the level of each point:
+    level = np.asarray(cache.fields['level'])
+    B = np.asarray(cache.fields['B'])
+    assert B[1, 1] == 3000. + 100. * (level[1, 1] - 1) + 1.
+    x, y, fields = cache.window(94.005, 94.025, 29.01, 29.05, ['h'])
+    assert np.allclose(x, [94.01, 94.02]) and np.allclose(y, [29.02, 29.04])
+    assert fields['h'].shape == (2, 2)
+
+    assert cache_is_current(outdir)
+    write_fgmax_output(outdir, skip=())
+    os.utime(os.path.join(outdir, 'fort.FG1.valuemax'), (1, 1))
+    assert not cache_is_current(outdir)
+    assert load_cache(outdir).fields['h'][0, 0] == 0.
+
+
+def test_write_band(tmp_path):
+    outdir = str(tmp_path)
+    write_fgmax_output(outdir)
+    cache = load_cache(outdir)
+    fname = str(tmp_path / 'h.flt')
+    write_band(fname, cache, 'h', rows=3)
+    band = np.fromfile(fname, dtype='<f4').reshape((4, 5))
+    # north up:
+    assert band[0, 4] == 43. and band[3, 1] == 10.
+    assert band[3, 0] == nodata_value
+    with open(str(tmp_path / 'h.hdr')) as f:
+        header = dict(line.split() for line in f)
+    assert header['NROWS'] == '4' and float(header['ULYMAP']) == 29.06
+    assert os.path.exists(str(tmp_path / 'h.prj'))
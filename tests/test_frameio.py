@@ -0,0 +1,82 @@
+from __future__ import absolute_import
+import os
+import numpy as np
+import pytest
+
+from frameio import (read_frame, read_headers, read_tfile, list_frames,
+                     fill_grid, FrameIndex, read_window)
+from frames import write_frame, random_patches
+
+
+@pytest.mark.parametrize('binary', [False, True])
+def test_read_frame(tmp_path, binary):
+    outdir = str(tmp_path)
+    patches = random_patches()
+    write_frame(outdir, 3, 120., patches, binary=binary)
+    time, read = read_frame(3, outdir)
+    assert time == 120.
+    assert [p.level for p in read] == [1, 2]
+    for (grid, level, xlow, ylow, dx, dy, q), p in zip(patches, read):
+        assert (p.grid_number, p.mx, p.my) == (grid, q.shape[1], q.shape[2])
+        assert (p.xlow, p.ylow, p.dx, p.dy) == (xlow, ylow, dx, dy)
+        np.testing.assert_allclose(p.q, q, rtol=1e-13)
+
+
+def test_read_headers_skips_ascii_data(tmp_path):
+    outdir = str(tmp_path)
+    write_frame(outdir, 0, 0., random_patches())
+    headers = read_headers(0, outdir)
+    assert [(p.mx, p.my) for p in headers] == [(8, 4), (4, 2)]
+    assert all(p.q is None for p in headers)
+    assert read_tfile(0, outdir)['ngrids'] == 2
+
+
+def test_list_frames(tmp_path):
+    outdir = str(tmp_path)
+    for frameno in (2, 0, 11):
+        write_frame(outdir, frameno, frameno * 10., random_patches())
+    assert list_frames(outdir) == [0, 2, 11]
+
+
+def test_fill_grid_takes_finest_patch(tmp_path):
+    outdir = str(tmp_path)
+    patches = random_patches()
+    write_frame(outdir, 1, 0., patches)
+    read = read_frame(1, outdir)[1]
+    grid, level = fill_grid(read, 0., 0., 0.25, 0.25, 16, 8)
+    # level 2 patch over [1, 2] x [0.5, 1]:
+    assert (level[2:4, 4:8] == 2).all()
+    assert (level == 2).sum() == 8
+    np.testing.assert_allclose(grid[2:4, 4:8], patches[1][6][0].T)
+    # level 1 cells of 0.5 are sampled twice in each direction:
+    np.testing.assert_allclose(grid[0, 0:2], patches[0][6][0, 0, 0])
+    assert (level > 0).all()
+
+
+@pytest.mark.parametrize('binary', [False, True])
+def test_frame_index_reads_window(tmp_path, binary):
+    outdir = str(tmp_path)
+    patches = random_patches(2)
+    write_frame(outdir, 4, 60., patches, binary=binary)
+    index = FrameIndex(4, outdir)
+    assert index.time == 60.
+    assert list(index.patches['level']) == [1, 2]
+    # only the level 1 patch reaches x > 2.5:
+    assert list(index.select(2.5, 4., 0., 2.)) == [0]
+    assert list(index.select(1.2, 1.4, 0.6, 0.8, levels=[2])) == [1]
+    time, read = read_window(4, 1.2, 1.4, 0.6, 0.8, outdir)
+    assert [p.level for p in read] == [1, 2]
+    for (grid, level, xlow, ylow, dx, dy, q), p in zip(patches, read):
+        np.testing.assert_allclose(p.q, q, rtol=1e-13)
+
+
+def test_frame_index_cache(tmp_path):
+    outdir = str(tmp_path)
+    write_frame(outdir, 0, 0., random_patches())
+    FrameIndex(0, outdir)
+    fname = os.path.join(outdir, 'frame_index', '0000.npy')
+    assert os.path.exists(fname)
+    # a newer frame replaces a stale index:
+    os.utime(fname, (1, 1))
+    write_frame(outdir, 0, 0., random_patches()[:1])
+    assert len(FrameIndex(0, outdir).patches) == 1
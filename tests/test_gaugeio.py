@@ -0,0 +1,53 @@
+from __future__ import absolute_import
+import os
+import numpy as np
+
+from gaugeio import (load_cache, build_cache, cache_is_current,
+                     read_gauge_header, list_gauge_files)
+from gaugefiles import write_gauge
+
+
+def _gauges(outdir, indent=''):
+    t = np.arange(5) * 10.
+    data = {}
+    for gaugeno in (3, 12):
+        q = np.column_stack((t + gaugeno, 2 * t, -t, t + 3000.))
+        write_gauge(outdir, gaugeno, 94. + gaugeno / 100., 29.5, t, q,
+                    indent=indent)
+        data[gaugeno] = (t, q)
+    return data
+
+
+def test_cache_round_trip(tmp_path):
+    outdir = str(tmp_path)
+    data = _gauges(outdir)
+    cache = load_cache(outdir, chunk_lines=2)
+    assert list(cache.gaugenos) == [3, 12]
+    assert cache.names == ['level', 't', 'h', 'hu', 'hv', 'eta']
+    for gaugeno, (t, q) in data.items():
+        g = cache.gauge(gaugeno)
+        np.testing.assert_allclose(g['t'], t)
+        np.testing.assert_allclose(g['h'], q[:, 0], rtol=1e-7)
+        np.testing.assert_allclose(g['eta'], q[:, 3], rtol=1e-7)
+        np.testing.assert_array_equal(g['level'], 1)
+    np.testing.assert_allclose(cache.location(12), (94.12, 29.5))
+
+
+def test_indented_header_is_skipped(tmp_path):
+    outdir = str(tmp_path)
+    data = _gauges(outdir, indent='  ')
+    assert read_gauge_header(list_gauge_files(outdir)[0])[0] == 3
+    cache = load_cache(outdir)
+    np.testing.assert_allclose(cache.gauge(3)['t'], data[3][0])
+
+
+def test_cache_rebuilt_when_files_change(tmp_path):
+    outdir = str(tmp_path)
+    _gauges(outdir)
+    build_cache(outdir)
+    assert cache_is_current(outdir)
+    t = np.arange(3) * 10.
+    write_gauge(outdir, 3, 94.03, 29.5, t, np.ones((3, 4)))
+    os.utime(os.path.join(outdir, 'gauge00003.txt'), (1, 1))
+    assert not cache_is_current(outdir)
+    assert len(load_cache(outdir).gauge(3)['t']) == 3
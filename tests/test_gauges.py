@@ -0,0 +1,48 @@
+from __future__ import absolute_import
+import numpy as np
+import pytest
+
+from gauges import read_table, write_table, load_gauges, gauge_t2, gauge_dt
+
+
+def test_load_gauges_fills_times(tmp_path):
+    fname = str(tmp_path / 'g.csv')
+    write_table(fname, [5, 6], [94.1, 94.2], [29.3, 29.4], header='test')
+    gauges = load_gauges(fname, [94., 29.], [95., 30.])
+    assert gauges == [[5, 94.1, 29.3, 0., gauge_t2, gauge_dt],
+                      [6, 94.2, 29.4, 0., gauge_t2, gauge_dt]]
+    assert isinstance(gauges[0][0], int)
+
+
+def test_npy_table(tmp_path):
+    fname = str(tmp_path / 'g.npy')
+    write_table(fname, [1], [94.1], [29.3])
+    np.testing.assert_array_equal(read_table(fname), [[1, 94.1, 29.3]])
+
+
+def test_six_columns_kept(tmp_path):
+    fname = str(tmp_path / 'g.csv')
+    with open(fname, 'w') as f:
+        f.write("# gaugeno, x, y, t1, t2, dt\n1, 94.1, 29.3, 10, 20, 5\n")
+    assert load_gauges(fname) == [[1, 94.1, 29.3, 10., 20., 5.]]
+
+
+@pytest.mark.parametrize('rows, message', [
+    ("1, 94.1, 29.3\n1, 94.2, 29.4\n", 'Duplicate'),
+    ("1.5, 94.1, 29.3\n", 'integers'),
+    ("1, 96.1, 29.3\n", 'outside'),
+    ("1, 94.1\n", 'columns')])
+def test_bad_tables(tmp_path, rows, message):
+    fname = str(tmp_path / 'g.csv')
+    with open(fname, 'w') as f:
+        f.write(rows)
+    with pytest.raises(ValueError, match=message):
+        load_gauges(fname, [94., 29.], [95., 30.])
+
+
+def test_repository_table():
+    import os
+    here = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    gauges = load_gauges(os.path.join(here, 'gauges_xs.csv'))
+    assert len(gauges) > 0
+    assert len(set(g[0] for g in gauges)) == len(gauges)
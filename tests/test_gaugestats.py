@@ -0,0 +1,61 @@
+from __future__ import absolute_import
+import numpy as np
+import pytest
+
+from gaugestats import gauge_summary, write_summary, arrival_tol
+from gaugefiles import write_gauge
+
+
+def _flood(outdir):
+    """Gauges 1..3 down a line, a wave arriving 100 s later at each."""
+    t = np.arange(0., 1000., 10.)
+    expected = {}
+    for gaugeno in (1, 2, 3):
+        t0 = 100. * gaugeno
+        wave = np.where((t >= t0) & (t < t0 + 300.), 5. * gaugeno, 0.)
+        h = 1. + wave
+        q = np.column_stack((h, 2. * wave, 0. * t, 100. + h))
+        write_gauge(outdir, gaugeno, 94. + 0.01 * gaugeno, 29.5, t, q)
+        expected[gaugeno] = (t0, t0 + 290., 1. + 5. * gaugeno,
+                             10. * gaugeno)
+    # a gauge the flood never reaches:
+    write_gauge(outdir, 4, 94.04, 29.5, t, np.tile([1., 0., 0., 101.],
+                                                    (len(t), 1)))
+    return expected
+
+
+@pytest.mark.parametrize('nprocs', [1, 2])
+def test_summary(tmp_path, nprocs):
+    outdir = str(tmp_path)
+    expected = _flood(outdir)
+    summary = gauge_summary(outdir, nprocs)
+    assert list(summary['gaugeno']) == [1, 2, 3, 4]
+    assert np.all(np.diff(summary['distance_km']) > 0)
+    for row in summary[:3]:
+        t0, t1, peak_h, peak_q = expected[int(row['gaugeno'])]
+        assert row['arrival_time'] == t0
+        assert row['flow_start'] == t0
+        assert row['flow_end'] == t1
+        assert row['t_peak_eta'] == t0
+        assert row['peak_h'] == pytest.approx(peak_h)
+        assert row['peak_q'] == pytest.approx(peak_q)
+    assert np.isnan(summary['arrival_time'][3])
+    assert np.isnan(summary['flow_start'][3])
+
+
+def test_arrival_tolerance(tmp_path):
+    outdir = str(tmp_path)
+    t = np.arange(0., 50., 10.)
+    rise = np.array([0., 0.5, 1.5, 2., 2.]) * arrival_tol
+    write_gauge(outdir, 1, 94., 29.5, t,
+                np.column_stack((1. + rise, 0. * t, 0. * t, 100. + rise)))
+    assert gauge_summary(outdir, 1)['arrival_time'][0] == 20.
+
+
+def test_write_summary(tmp_path):
+    outdir = str(tmp_path)
+    _flood(outdir)
+    fname = str(tmp_path / 'summary.csv')
+    write_summary(fname, gauge_summary(outdir, 1))
+    table = np.genfromtxt(fname, delimiter=',', names=True)
+    assert list(table['gaugeno']) == [1, 2, 3, 4]
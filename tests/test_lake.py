@@ -0,0 +1,62 @@
+from __future__ import absolute_import
+import numpy as np
+import pytest
+
+pytest.importorskip('clawpack')
+
+from lake import (lake_mask, lake_depth, lake_volume, hypsometry,
+                  box_polygon)
+
+
+def fill_lake_rows(x, y, polygon):
+    """The cells fill_lake in lake_module.f90 fills, row by row."""
+    vx, vy = np.array(polygon, dtype=np.float64).T
+    dx = x[1] - x[0]
+    xlower = x[0] - dx / 2
+    mask = np.zeros((len(y), len(x)), dtype=bool)
+    for j, yc in enumerate(y):
+        if yc <= vy.min() or yc >= vy.max():
+            continue
+        xcross = sorted(xa + (yc - ya) * (xb - xa) / (yb - ya)
+                        for xa, ya, xb, yb in zip(vx, vy, np.roll(vx, -1),
+                                                  np.roll(vy, -1))
+                        if (ya > yc) != (yb > yc))
+        for k in range(0, len(xcross) - 1, 2):
+            i1 = int(np.floor((xcross[k] - xlower) / dx + 0.5))
+            i2 = int(np.ceil((xcross[k + 1] - xlower) / dx + 0.5)) - 2
+            mask[j, max(i1, 0):i2 + 1] = True
+    return mask
+
+
+def test_edge_aligned_box():
+    # cell centres 0.5, 1.5, ..., the box edges run through centres:
+    x = 0.5 + np.arange(10.)
+    y = 0.5 + np.arange(8.)
+    polygon = box_polygon([2.5, 6.5, 1.5, 5.5])
+    mask = lake_mask(x, y, [polygon])
+    expected = np.zeros_like(mask)
+    expected[2:5, 3:6] = True
+    assert (mask == expected).all()
+    assert (mask == fill_lake_rows(x, y, polygon)).all()
+
+
+def test_same_rule_as_fill_lake():
+    x = 0.5 + np.arange(20.)
+    y = 0.5 + np.arange(16.)
+    # non-convex, with vertices and edges on cell centres:
+    polygon = [(1.5, 1.5), (12.5, 1.5), (12.5, 8.5), (7.5, 4.5),
+               (4.5, 10.5), (16.5, 14.5), (0.5, 14.5)]
+    assert (lake_mask(x, y, [polygon])
+            == fill_lake_rows(x, y, polygon)).all()
+
+
+def test_hypsometry_matches_depth_volume():
+    x = 94. + 0.01 * np.arange(30)
+    y = 29. + 0.01 * np.arange(25)
+    B = 3000. + 200. * np.hypot(x[None, :] - 94.15, y[:, None] - 29.12)
+    polygons = [box_polygon([94.03, 94.27, 29.02, 29.22])]
+    stage, area, volume = hypsometry(x, y, B, polygons, dz=1.)
+    assert (np.diff(volume) >= 0).all() and volume[0] == 0.
+    for s, v in zip(stage[::7], volume[::7]):
+        depth = lake_depth(x, y, B, s, polygons)
+        assert np.isclose(lake_volume(x, y, depth), v, rtol=1e-10)
@@ -0,0 +1,45 @@
+from __future__ import absolute_import
+import os
+import numpy as np
+import pytest
+
+pytest.importorskip('clawpack')
+
+from lakelevel import load_hypsometry, stage_for_volume, volume_for_stage
+from lake import box_polygon
+from topoio import write_topo
+
+
+@pytest.fixture
+def curve_files(tmp_path, monkeypatch):
+    monkeypatch.chdir(str(tmp_path))
+    x = 94. + 0.01 * np.arange(41)
+    y = 29. + 0.01 * np.arange(41)
+    B = 3000. + 2000. * np.hypot(x[None, :] - 94.2, y[:, None] - 29.2)
+    write_topo('dem.tt3', x, y, B)
+    return [box_polygon([94.05, 94.35, 29.05, 29.35])]
+
+
+def test_stage_volume_round_trip(curve_files):
+    curve = load_hypsometry(curve_files, 'dem.tt3', 'curve.npz', dz=1.)
+    assert curve['stage'][0] >= 3000. and curve['volume'][0] == 0.
+    stages = np.array([3050., 3100., 3200.])
+    volumes = volume_for_stage(stages, curve)
+    assert (np.diff(volumes) > 0).all()
+    assert np.allclose(stage_for_volume(volumes, curve), stages)
+    with pytest.raises(ValueError):
+        stage_for_volume(2 * curve['volume'][-1], curve)
+
+
+def test_cache(curve_files):
+    curve = load_hypsometry(curve_files, 'dem.tt3', 'curve.npz', dz=1.)
+    mtime = os.path.getmtime('curve.npz')
+    os.utime('curve.npz', (mtime - 100., mtime - 100.))
+    again = load_hypsometry(curve_files, 'dem.tt3', 'curve.npz', dz=1.)
+    assert os.path.getmtime('curve.npz') == mtime - 100.
+    assert np.array_equal(again['volume'], curve['volume'])
+    # another outline rebuilds it:
+    smaller = [box_polygon([94.1, 94.3, 29.1, 29.3])]
+    other = load_hypsometry(smaller, 'dem.tt3', 'curve.npz', dz=1.)
+    assert other['volume'][-1] < curve['volume'][-1]
+    assert os.path.getmtime('curve.npz') != mtime - 100.
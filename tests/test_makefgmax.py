@@ -0,0 +1,53 @@
+from __future__ import absolute_import
+import numpy as np
+import pytest
+
+pytest.importorskip('clawpack')
+
+from makefgmax import (level_mask, write_fgmax, hand_mask, fgmax_grid,
+                       fgmax_arrival_tol)
+from topoio import read_topo
+
+
+def test_level_mask_with_topography():
+    x, y = fgmax_grid([0., 0.], [1., 1.], 0.1)
+    regions = [[1, 4, 100., 200., 0., 0.5, 0., 1.]]
+    mask = level_mask(regions, x, y, 4, 5)
+    assert mask[:, x < 0.5].all() and not mask[:, x > 0.5].any()
+    # topography registered up to level 5 everywhere allows it anywhere:
+    topo = [[1, 5, 0., 1.e10, 0., 1., 0., 1.]]
+    assert level_mask(regions + topo, x, y, 4, 5).all()
+    topo = [[1, 1, 0., 1.e10, 0., 1., 0., 1.]]
+    assert (level_mask(regions + topo, x, y, 4, 5) == mask).all()
+
+
+def test_write_fgmax(tmp_path):
+    x, y = fgmax_grid([0., 0.], [1., 1.], 0.1)
+    mask = np.zeros((len(y), len(x)), dtype=bool)
+    mask[2:5, 3:7] = True
+    mask[4, 8] = True
+    fname = str(tmp_path / 'fgmax.txt')
+    points = str(tmp_path / 'fgmax.tt3')
+    extent = write_fgmax(fname, points, mask, x, y, 4)
+    assert np.allclose(extent, [0.35, 0.85, 0.25, 0.45])
+    xp, yp, Z = read_topo(points)[:3]
+    assert Z.shape == (3, 6) and Z.sum() == mask.sum()
+    with open(fname) as f:
+        lines = [line.split('#')[0].strip() for line in f]
+    assert int(lines[3]) == 4
+    assert float(lines[4]) == fgmax_arrival_tol
+    assert lines[5] == '4' and lines[6] == points
+    with pytest.raises(ValueError):
+        write_fgmax(fname, points, mask & False, x, y, 4)
+
+
+def test_hand_mask():
+    x, y = fgmax_grid([94., 29.], [94.2, 29.2], 0.01)
+    # a valley along y = 29.1, rising 1000 m per 0.01 degree away from it:
+    B = 1000. * abs(y[:, None] - 29.105) / 0.01 + 0. * x[None, :]
+    gauges = [[k, 94.005 + 0.01 * k, 29.105] for k in range(20)]
+    mask = hand_mask(x, y, x, y, B, gauges, height=1500.,
+                     distance=10000.)
+    rows = np.flatnonzero(mask.all(axis=1))
+    assert list(y[rows].round(3)) == [29.095, 29.105, 29.115]
+    assert not mask[np.abs(y - 29.105) > 0.015].any()
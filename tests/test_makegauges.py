@@ -0,0 +1,39 @@
+from __future__ import absolute_import
+import numpy as np
+
+from makegauges import (arc_length, resample_polyline, make_gauges,
+                        trace_steepest_descent, earth_radius)
+
+
+def test_resample_spacing():
+    # due north, 1 degree:
+    x = np.array([94., 94.])
+    y = np.array([29., 30.])
+    length = np.radians(1.) * earth_radius
+    np.testing.assert_allclose(arc_length(x, y), [0., length])
+    xs, ys = resample_polyline(x, y, 1000.)
+    assert len(xs) == int(length // 1000.) + 1
+    np.testing.assert_allclose(np.diff(arc_length(xs, ys)), 1000.)
+
+
+def test_repeated_vertices_dropped():
+    xs, ys = resample_polyline(np.array([94., 94., 94.]),
+                               np.array([29., 29., 29.01]), 100.)
+    assert np.all(np.isfinite(xs)) and np.all(np.isfinite(ys))
+
+
+def test_make_gauges_numbers():
+    gaugeno, xg, yg = make_gauges([94., 94.01], [29., 29.], 200., 100)
+    assert gaugeno[0] == 100
+    np.testing.assert_array_equal(np.diff(gaugeno), 1)
+
+
+def test_trace_follows_valley():
+    x = np.arange(10.)
+    y = np.arange(5.)
+    # valley along j = 2 sloping down in x:
+    Z = 10. - x[None, :] + 5. * np.abs(y[:, None] - 2.)
+    xs, ys = trace_steepest_descent(x, y, Z, (1., 2.))
+    np.testing.assert_array_equal(ys, 2.)
+    # stops on reaching the domain edge:
+    np.testing.assert_array_equal(xs, np.arange(1., 10.))
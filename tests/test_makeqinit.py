@@ -0,0 +1,54 @@
+from __future__ import absolute_import
+import os
+import json
+import numpy as np
+import pytest
+from types import SimpleNamespace as Namespace
+
+pytest.importorskip('clawpack')
+
+from makeqinit import make_qinit, check_qinit_stage, qinit_fname
+from lake import lake_surface, lake_depth
+from topoio import write_topo
+
+
+def test_surface_dry_points_at_the_bed():
+    x = np.arange(10.)
+    y = np.arange(8.)
+    B = 100. + 10. * x[None, :] + 0. * y[:, None]
+    polygon = [[(-0.5, -0.5), (4.5, -0.5), (4.5, 8.5), (-0.5, 8.5)]]
+    eta = lake_surface(x, y, B, 125., polygon)
+    assert (eta[:, :3] == 125.).all()
+    # dry inside the outline and outside it: the lowest neighbouring bed
+    assert (eta[:, 3:9] == B[:, 2:8]).all() and (eta[:, 9] == B[:, 8]).all()
+    assert (np.maximum(eta - B, 0.)[:, 3:] == 0.).all()
+    assert (lake_depth(x, y, B, 125., polygon)[:, 3:] == 0.).all()
+
+
+def test_make_qinit_next_to_setrun(tmp_path, monkeypatch):
+    rundir = tmp_path / 'run'
+    rundir.mkdir()
+    monkeypatch.chdir(str(tmp_path))
+    x = 94. + 0.01 * np.arange(41)
+    y = 29. + 0.01 * np.arange(41)
+    B = 3000. + 1000. * np.hypot(x[None, :] - 94.2, y[:, None] - 29.2)
+    write_topo(str(rundir / 'mega_fill.txt'), x, y, B)
+    polygon = [(94.1, 29.1), (94.3, 29.1), (94.3, 29.3), (94.1, 29.3)]
+    rundata = Namespace(
+        clawdata=Namespace(lower=[94., 29.], upper=[94.4, 29.4],
+                           num_cells=[20, 20]),
+        amrdata=Namespace(refinement_ratios_x=[2], amr_levels_max=2),
+        lake_data=Namespace(stage=3050., polygons=[polygon]))
+    meta = make_qinit(rundata, level=2, verbose=False, outdir=str(rundir))
+    assert sorted(os.listdir(str(tmp_path))) == ['run']
+    assert meta['volume'] > 0
+    qinit = str(rundir / qinit_fname)
+    check_qinit_stage(qinit, 3050.)
+    with pytest.raises(ValueError):
+        check_qinit_stage(qinit, 3088.)
+    eta = np.loadtxt(qinit)[:, 2]
+    assert (eta == 3050.).any() and eta.min() >= 3000.
+    with open(str(rundir / 'lake_qinit.json')) as f:
+        assert json.load(f)['stage'] == 3050.
+    assert make_qinit(rundata, level=2, verbose=False,
+                      outdir=str(rundir)) == meta
@@ -0,0 +1,90 @@
+from __future__ import absolute_import
+import os
+import json
+import numpy as np
+import pytest
+from types import SimpleNamespace as Namespace
+
+from topoio import write_topo, read_topo
+from maketopo import (make_tiles, tiles_are_current, topo_files,
+                      level_factors, level_footprint, max_level)
+from regions import topo_regions, level_maps
+
+
+def _rundata(regions, gauges=(), polygons=None):
+    return Namespace(
+        clawdata=Namespace(lower=[94., 29.], upper=[94.4, 29.4],
+                           num_cells=[10, 10]),
+        amrdata=Namespace(refinement_ratios_x=[2, 2, 2], amr_levels_max=4),
+        regiondata=Namespace(regions=[list(r) for r in regions]),
+        gaugedata=Namespace(gauges=[list(g) for g in gauges]),
+        lake_data=Namespace(polygons=polygons))
+
+
+@pytest.fixture
+def dem(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    x = 94. + 0.005 * np.arange(81)
+    y = 29. + 0.005 * np.arange(81)
+    Z = 100. * np.sin(x[None, :] * 50.) + 10. * y[:, None]
+    write_topo('mega_fill.txt', x, y, Z)
+    return x, y, Z
+
+
+def test_factors_and_levels(dem):
+    rundata = _rundata([[1, 3, 0., 1.e10, 94.1, 94.2, 29.1, 29.2]])
+    assert max_level(rundata) == 3
+    assert level_factors(rundata, 0.005) == [(1, 8, 1), (2, 4, 2),
+                                             (3, 2, 3)]
+    # the DEM resolution serves all finer levels:
+    rundata.regiondata.regions[0][1] = 4
+    rundata.amrdata.refinement_ratios_x = [2, 4, 2]
+    assert level_factors(rundata, 0.005)[-1] == (3, 1, 4)
+
+
+def test_tiles_capped_at_their_resolution(dem):
+    rundata = _rundata([[2, 3, 0., 1.e10, 94.1, 94.2, 29.1, 29.2]],
+                       polygons=[[(94.3, 29.3), (94.35, 29.3),
+                                  (94.35, 29.35)]])
+    make_tiles(rundata, verbose=False)
+    topofiles = topo_files()
+    maxlevels = dict((os.path.basename(t[-1]), t[2]) for t in topofiles)
+    assert maxlevels['level1.tt3'] == 1
+    # the level 4 tiles have the DEM resolution and only the lake allows
+    # level 4:
+    assert sorted(maxlevels.values()) == [1, 2, 2, 3, 3, 4]
+    # wherever the regions and tiles allow a level there is a tile of
+    # that resolution:
+    topo = topo_regions(topofiles)
+    x = 94. + 0.0025 * np.arange(160)
+    allowed = level_maps(rundata.regiondata.regions + topo, x, x - 65.,
+                         0., 4)[1]
+    for level in (2, 3, 4):
+        dx = 0.04 / 2**(level - 1)
+        fine = [t for t in topofiles
+                if abs(read_topo(t[-1])[3]['cellsize'] - dx) < 1e-9]
+        covered = level_maps([[1, 2] + list(r[2:])
+                              for r in topo_regions(fine)],
+                             x, x - 65., 0., 4)[1] == 2
+        assert covered[allowed >= level].all()
+
+
+def test_tiles_key(dem):
+    rundata = _rundata([[1, 3, 0., 1.e10, 94.1, 94.2, 29.1, 29.2]])
+    assert not tiles_are_current(rundata)
+    make_tiles(rundata, verbose=False)
+    assert tiles_are_current(rundata)
+    other = _rundata([[1, 3, 0., 1.e10, 94.1, 94.25, 29.1, 29.2]])
+    assert not tiles_are_current(other)
+    os.utime('mega_fill.txt', (1, 1))
+    assert not tiles_are_current(rundata)
+    with open(os.path.join('topo_tiles', 'topofiles.json')) as f:
+        assert json.load(f)['key']['dem'][0] == 'mega_fill.txt'
+
+
+def test_corridor_only_with_envelope(dem):
+    gauges = [[k, 94.05 + 0.01 * k, 29.2] for k in range(20)]
+    rundata = _rundata([], gauges)
+    assert level_footprint(rundata, 2)
+    assert level_footprint(rundata, 2, envelope=False) == []
+    assert max_level(rundata, envelope=False) == 1
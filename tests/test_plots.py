@@ -0,0 +1,69 @@
+from __future__ import absolute_import
+import os
+import json
+
+import setplot
+from plots import plot_tasks, write_gallery, frame_png, gauge_png
+from frames import write_frame, random_patches
+from gaugefiles import write_gauge
+
+
+def _touch(plotdir, entries):
+    for png in entries:
+        open(os.path.join(plotdir, png), 'w').close()
+
+
+def test_plot_tasks_skip_up_to_date(tmp_path):
+    outdir = str(tmp_path / '_output')
+    plotdir = str(tmp_path / '_plots')
+    os.makedirs(plotdir)
+    for frameno in range(3):
+        write_frame(outdir, frameno, 60. * frameno, random_patches(frameno))
+    gaugeno = setplot.gauge_numbers()[1]
+    write_gauge(outdir, gaugeno, 1., 1., [0., 60.],
+                [[1., 0., 0., 0.], [1., 0., 0., 0.]])
+    fignos = [figno for name, figno, draw in setplot.frame_maps]
+
+    tasks, entries = plot_tasks(outdir, plotdir, {})
+    assert [t[:3] for t in tasks] == \
+        [('frame', k, fignos) for k in range(3)] + [('gauge', gaugeno, None)]
+    assert sorted(entries) == sorted(
+        [frame_png(k, f) for k in range(3) for f in fignos]
+        + [gauge_png(gaugeno)])
+
+    # everything drawn and recorded: nothing to do, unless forced
+    _touch(plotdir, entries)
+    manifest = json.loads(json.dumps(entries))
+    assert plot_tasks(outdir, plotdir, manifest)[0] == []
+    assert len(plot_tasks(outdir, plotdir, manifest, force=True)[0]) == 4
+
+    # a missing PNG is redrawn alone
+    os.remove(os.path.join(plotdir, frame_png(1, fignos[-1])))
+    assert [t[:3] for t in plot_tasks(outdir, plotdir, manifest)[0]] == \
+        [('frame', 1, [fignos[-1]])]
+
+    # a rewritten frame is redrawn in every map
+    _touch(plotdir, entries)
+    write_frame(outdir, 2, 120., random_patches(7), binary=True)
+    assert [t[:3] for t in plot_tasks(outdir, plotdir, manifest)[0]] == \
+        [('frame', 2, fignos)]
+
+
+def test_write_gallery(tmp_path):
+    outdir = str(tmp_path / '_output')
+    plotdir = str(tmp_path / '_plots')
+    os.makedirs(plotdir)
+    for frameno in range(2):
+        write_frame(outdir, frameno, 1800. * frameno, random_patches(frameno))
+    write_gallery(outdir, plotdir, [50])
+    with open(os.path.join(plotdir, 'index.html')) as f:
+        index = f.read()
+    for name, figno, draw in setplot.frame_maps:
+        assert 'href="fig%i.html"' % figno in index
+        assert frame_png(1, figno) in index
+        with open(os.path.join(plotdir, 'fig%i.html' % figno)) as f:
+            page = f.read()
+        assert json.dumps([frame_png(0, figno), frame_png(1, figno)]) in page
+        assert 'max="1"' in page
+    assert '<td>1</td><td>0.50</td>' in index
+    assert gauge_png(50) in index
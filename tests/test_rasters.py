@@ -0,0 +1,54 @@
+from __future__ import absolute_import
+import os
+import numpy as np
+
+from frameio import read_frame, fill_grid, composite, FrameIndex
+from rasters import load_raster, raster_grid, Raster
+from frames import write_frame, random_patches
+
+
+def test_composite_matches_fill_grid(tmp_path):
+    outdir = str(tmp_path)
+    write_frame(outdir, 0, 0., random_patches(3))
+    patches = read_frame(0, outdir)[1]
+    q, level = composite(patches, 0., 0., 0.125, 0.125, 32, 16)
+    for m in range(4):
+        grid, lev = fill_grid(patches, 0., 0., 0.125, 0.125, 32, 16,
+                              lambda p: p.q[m])
+        np.testing.assert_array_equal(q[m], grid)
+        np.testing.assert_array_equal(level, lev)
+
+
+def test_load_raster(tmp_path):
+    outdir = str(tmp_path)
+    patches = random_patches(4)
+    write_frame(outdir, 2, 30., patches, binary=True)
+    assert raster_grid(FrameIndex(2, outdir)) == (0., 0., 0.0625, 64, 32)
+    raster = load_raster(2, outdir, dx=0.25)
+    assert raster.time == 30. and raster.q.shape == (4, 8, 16)
+    assert raster.q.dtype == np.float32
+    assert raster.extent == [0., 4., 0., 2.]
+    np.testing.assert_allclose(raster.q[:, 2:4, 4:8],
+                               patches[1][6].transpose((0, 2, 1)),
+                               rtol=1e-6)
+    cached = [f for d, _, fs in os.walk(os.path.join(outdir, 'raster_cache'))
+              for f in fs]
+    assert sorted(cached) == ['0002.level.npy', '0002.npy', 'grid.json']
+    again = load_raster(2, outdir, dx=0.25)
+    assert isinstance(again.q, np.memmap)
+    np.testing.assert_array_equal(again.q, raster.q)
+    window = load_raster(2, outdir, dx=0.25, extent=[1., 2., 0.5, 1.])
+    assert window.q.shape == (4, 2, 4) and (window.level == 2).all()
+
+
+def test_raster_properties():
+    q = np.zeros((4, 2, 3), dtype=np.float32)
+    q[0] = [[0., 2., 0.005], [1., 0., 4.]]
+    q[1, 0, 1] = 6.
+    q[2, 0, 1] = 8.
+    raster = Raster(0., np.array([0.5, 1.5, 2.5]), np.array([0.5, 1.5]), q,
+                    np.ones((2, 3), dtype=np.int8))
+    assert raster.wet.sum() == 3
+    assert np.isnan(raster.depth[0, 2]) and raster.depth[1, 2] == 4.
+    assert raster.speed[0, 1] == 5. and np.isnan(raster.speed[0, 0])
+    assert raster.extent == [0., 3., 0., 2.]
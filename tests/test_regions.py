@@ -0,0 +1,90 @@
+from __future__ import absolute_import
+import itertools
+import numpy as np
+
+from regions import (read_regions, write_regions, topo_regions, level_maps,
+                     clip_regions, overlapping_pairs, compact_regions)
+from topoio import write_topo
+
+
+def random_regions(seed, n=25):
+    rng = np.random.RandomState(seed)
+    windows = [(0., 1.e10), (0., 5000.), (3000., 1.e10)]
+    regions = []
+    for _ in range(n):
+        x1, x2 = sorted(rng.choice(21, 2, replace=False) * 0.1)
+        y1, y2 = sorted(rng.choice(21, 2, replace=False) * 0.1)
+        lmin = rng.randint(1, 4)
+        t1, t2 = windows[rng.randint(len(windows))]
+        regions.append([lmin, lmin + rng.randint(0, 3), t1, t2,
+                        x1, x2, y1, y2])
+    return regions
+
+
+def test_table_round_trip(tmp_path):
+    fname = str(tmp_path / 'regions.csv')
+    regions = random_regions(0, 5)
+    write_regions(fname, regions, 'five regions\nfor a test')
+    with open(fname) as f:
+        assert f.readline().startswith('#')
+    assert np.allclose(read_regions(fname), regions)
+
+
+def test_topo_regions(tmp_path):
+    fname = str(tmp_path / 'topo.tt3')
+    write_topo(fname, 94. + 0.5 * np.arange(5), 29. + 0.5 * np.arange(3),
+               np.zeros((3, 5)))
+    assert topo_regions([[3, 1, 5, 0., 1.e10, fname]]) == \
+        [[1, 5, 0., 1.e10, 94., 96., 29., 30.]]
+
+
+def test_level_maps():
+    x = y = 0.05 + 0.1 * np.arange(20)
+    regions = [[2, 4, 0., 100., 0., 1., 0., 2.],
+               [1, 3, 0., 1.e10, 0.5, 2., 0., 1.]]
+    minlevel, maxlevel = level_maps(regions, x, y, 50., 3)
+    assert minlevel[0, 0] == 2 and maxlevel[0, 0] == 3
+    assert maxlevel[15, 15] == 1 and maxlevel[5, 15] == 3
+    assert (level_maps(regions, x, y, 200., 5)[1][:, :5] <= 3).all()
+
+
+def test_clip_regions():
+    regions = [[1, 3, 0., 1.e10, -1., 1., 0., 1.],
+               [1, 3, 0., 1.e10, 0.2, 0.4, 0.2, 0.4],
+               [1, 3, 0., 1.e10, 3., 4., 0., 1.]]
+    clipped, changed = clip_regions(regions, [0., 0.], [2., 2.])
+    assert clipped == [[1, 3, 0., 1.e10, 0., 1., 0., 1.], regions[1]]
+    assert changed == [0, 2]
+
+
+def test_overlapping_pairs():
+    regions = random_regions(1)
+
+    def overlap(r, s):
+        return (r[4] < s[5] and s[4] < r[5] and r[6] < s[7] and s[6] < r[7]
+                and r[2] <= s[3] and s[2] <= r[3])
+
+    expected = [(k, m) for k, m in itertools.combinations(range(25), 2)
+                if overlap(regions[k], regions[m])]
+    assert overlapping_pairs(regions) == expected
+
+
+def test_compact_regions_keeps_levels():
+    x = y = 0.025 + 0.05 * np.arange(40)
+    for seed in range(5):
+        regions = random_regions(seed)
+        compacted = compact_regions(regions)
+        assert len(compacted) <= len(regions)
+        for t in (0., 2000., 4000., 5000., 6000.):
+            for a, b in zip(level_maps(regions, x, y, t, 6),
+                            level_maps(compacted, x, y, t, 6)):
+                assert (a == b).all()
+
+
+def test_compact_regions_merges():
+    regions = [[1, 3, 0., 1.e10, 0., 1., 0., 1.],
+               [1, 3, 0., 1.e10, 1., 2., 0., 1.],
+               [1, 3, 0., 1.e10, 0.5, 1.5, 0.2, 0.8],
+               [1, 4, 0., 100., 0., 1., 0., 1.]]
+    assert compact_regions(regions) == [[1, 3, 0., 1.e10, 0., 2., 0., 1.],
+                                        [1, 4, 0., 100., 0., 1., 0., 1.]]
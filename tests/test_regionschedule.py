@@ -0,0 +1,58 @@
+from __future__ import absolute_import
+import numpy as np
+
+from regionschedule import (schedule, outside_boxes, segment_regions,
+                            topo_conflicts)
+from regiontune import table_topo
+from regions import level_maps
+
+
+def _summary(ngauges=21):
+    dtype = [('gaugeno', int), ('x', float), ('y', float),
+             ('flow_start', float), ('flow_end', float)]
+    summary = np.zeros(ngauges, dtype=dtype)
+    summary['gaugeno'] = np.arange(ngauges)
+    summary['x'] = 94. + 0.01 * np.arange(ngauges)
+    summary['y'] = 29.
+    summary['flow_start'] = 10000. + 1000. * np.arange(ngauges)
+    summary['flow_end'] = summary['flow_start'] + 5000.
+    summary['flow_start'][-1] = summary['flow_end'][-1] = np.nan
+    return summary
+
+
+def test_outside_boxes_area():
+    rect = [0., 10., 0., 10.]
+    pieces = outside_boxes(rect, [[2., 4., -1., 3.], [5., 12., 5., 6.]])
+    area = sum((p[1] - p[0]) * (p[3] - p[2]) for p in pieces)
+    assert np.isclose(area, 100. - 2. * 3. - 5. * 1.)
+    assert outside_boxes(rect, [[-1., 11., -1., 11.]]) == []
+
+
+def test_segment_regions_clipped():
+    regions = [[1, 5, 0., 1.e10, 0., 10., 0., 10.],
+               [1, 4, 0., 50., 20., 30., 0., 10.]]
+    clipped = segment_regions(regions, [5., 25., 2., 3.], 100., 200.)
+    assert clipped == [[1, 5, 100., 200., 5., 10., 2., 3.]]
+
+
+def test_schedule_caps_outside_window():
+    regions = [[1, 5, 0., 1.e10, 93.9, 94.3, 28.9, 29.1]]
+    scheduled = schedule(_summary(), regions, ngauges=10, width=2500.,
+                         lead=500., lag=500., background=3)
+    x = np.array([94.02])
+    y = np.array([29.])
+    level = lambda t: level_maps(scheduled, x, y, t, 5)[1][0, 0]
+    # first segment: gauges 0-10, window 9500 to 20500:
+    assert level(5000.) == 3
+    assert level(15000.) == 5
+    assert level(30000.) == 3
+    # the part of the region away from the gauges is kept:
+    assert level_maps(scheduled, x, np.array([28.95]), 0., 5)[1][0, 0] == 5
+
+
+def test_topo_conflicts_with_table_topo():
+    regions = [[1, 5, 0., 1.e10, 93.9, 94.3, 28.9, 29.1]]
+    scheduled = schedule(_summary(), regions, ngauges=10)
+    topo = [[1, 5, 0., 1.e10, 93., 95.6, 28., 30.]]
+    assert topo_conflicts(scheduled, topo) == topo
+    assert topo_conflicts(scheduled, table_topo(topo, 1)) == []
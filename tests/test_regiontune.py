@@ -0,0 +1,59 @@
+from __future__ import absolute_import
+import numpy as np
+
+from regiontune import (cluster, propose_regions, fine_cells, table_topo,
+                        cell_steps)
+from regions import level_maps
+
+
+def _path(n=40):
+    """A flood path along the diagonal, reached at t = 100 * i."""
+    x = 0.005 + 0.01 * np.arange(n)
+    y = x.copy()
+    t_first = np.full((n, n), np.nan)
+    t_last = np.full((n, n), np.nan)
+    for i in range(n):
+        j = slice(max(i - 2, 0), i + 3)
+        t_first[j, i] = 100. * i
+        t_last[j, i] = 100. * i + 300.
+    return x, y, t_first, t_last, 100. * np.arange(n + 4)
+
+
+def test_cluster_covers_mask():
+    mask = np.zeros((30, 30), dtype=bool)
+    mask[2:6, 1:25] = True
+    mask[6:28, 20:25] = True
+    boxes = cluster(mask, 0.8)
+    covered = np.zeros_like(mask)
+    for j1, j2, i1, i2 in boxes:
+        covered[j1:j2, i1:i2] = True
+        assert mask[j1:j2, i1:i2].mean() >= 0.8
+    assert covered[mask].all()
+    assert cluster(np.zeros((3, 3), dtype=bool)) == []
+
+
+def test_proposal_covers_path_while_flooded():
+    x, y, t_first, t_last, times = _path()
+    regions = propose_regions(x, y, t_first, t_last, times, 2, 4, block=2,
+                              cutoff=0.5, margin=0.)
+    assert all(r[:2] == [2, 4] for r in regions)
+    for t in times:
+        on_path = (t_first <= t) & (t <= t_last)
+        maxlevel = level_maps(regions, x, y, t, 4)[1]
+        assert (maxlevel[on_path] == 4).all()
+    assert len(regions) < 40
+
+
+def test_table_topo_caps_topography():
+    x, y, t_first, t_last, times = _path()
+    topo = [[1, 5, 0., 1.e10, 0., 0.4, 0., 0.4]]
+    assert table_topo(topo, 1) == [[1, 1, 0., 1.e10, 0., 0.4, 0., 0.4]]
+    ratios = [2, 2, 2, 2]
+    # with the topography allowing level 5 everywhere a cap is void:
+    cap = [[1, 2, 0., 1.e10, 0., 0.4, 0., 0.4]]
+    void = fine_cells(cap + topo, x, y, t_first, t_last, times, 5, ratios, 2)
+    held = fine_cells(cap + table_topo(topo, 1), x, y, t_first, t_last,
+                      times, 5, ratios, 2)
+    assert void[5] > 0
+    assert sum(held.values()) == 0
+    assert cell_steps(held, [2, 2, 2, 2]) == 0
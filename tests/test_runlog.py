@@ -0,0 +1,58 @@
+from __future__ import absolute_import
+import os
+import warnings
+import pytest
+
+from runlog import parse_steps, parse_regrids, read_log, read_regrids
+
+fixture = os.path.join(os.path.dirname(__file__), 'data',
+                       'run_instrumented.log')
+
+
+def _lines():
+    with open(fixture) as f:
+        return f.readlines()
+
+
+def test_steps():
+    steps = parse_steps(_lines())
+    assert sorted(steps) == [1, 2, 3]
+    assert steps[3]['count'] == 5
+    assert steps[3]['dt_min'] == 2.4 and steps[3]['dt_max'] == 2.5
+    assert steps[3]['cfl_max'] == 0.47
+    assert steps[3]['t_final'] == 12.3
+    assert steps[1] == {'count': 1, 'dt_min': 9.9, 'dt_max': 9.9,
+                        'cfl_max': 0.201, 't_final': 9.9}
+
+
+def test_regrids_level_ranges():
+    regrids = parse_regrids(_lines())
+    assert regrids[2]['count'] == 2
+    assert regrids[3]['count'] == 3
+    assert regrids[3]['grids_max'] == 7 and regrids[3]['cells'] == 2240
+    assert 1 not in regrids
+    # the older one-level form:
+    assert parse_regrids(['  Regridding level  4\n'])[4]['count'] == 1
+
+
+def test_timing():
+    timing = read_log(fixture)[1]
+    assert timing['threads'] == 4
+    assert timing['levels'][3] == {'wall': 6., 'cpu': 23.8,
+                                   'cell_updates': 6.12e7}
+    assert timing['total']['cell_updates'] == 7.4e7
+    assert timing['parts']['regridding']['wall'] == 1.5
+    assert timing['parts']['total time']['wall'] == 9.8
+
+
+def test_unfinished_and_missing(tmp_path):
+    log = str(tmp_path / 'run.log')
+    with open(log, 'w') as f:
+        f.writelines(_lines()[:8])
+    steps, timing = read_log(log)
+    assert timing is None and steps[3]['count'] == 2
+    with pytest.warns(UserWarning):
+        assert read_regrids([str(tmp_path / 'missing.log')]) == {}
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        assert read_regrids([log])[2]['count'] == 1
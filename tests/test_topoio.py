@@ -0,0 +1,98 @@
+from __future__ import absolute_import
+import os
+import numpy as np
+import pytest
+
+from topoio import read_topo, write_topo, load_topo, read_header
+from maketopo import coarsen, crop
+
+
+def _dem(tmp_path, nx=13, ny=9, dx=0.01):
+    x = 94. + dx * np.arange(nx)
+    y = 29. + dx * np.arange(ny)
+    Z = 1000. + 10. * np.arange(nx)[None, :] + np.arange(ny)[:, None]
+    fname = str(tmp_path / 'dem.tt3')
+    write_topo(fname, x, y, Z)
+    return fname, x, y, Z
+
+
+def test_round_trip(tmp_path):
+    fname, x, y, Z = _dem(tmp_path)
+    xr, yr, Zr, header = read_topo(fname)
+    np.testing.assert_allclose(xr, x)
+    np.testing.assert_allclose(yr, y)
+    np.testing.assert_allclose(Zr, Z)
+    # the file is north to south:
+    with open(fname) as f:
+        read_header(f)
+        first = np.array(f.readline().split(), dtype=float)
+    np.testing.assert_allclose(first, Z[-1])
+
+
+def test_esri_header(tmp_path):
+    fname = str(tmp_path / 'esri.asc')
+    with open(fname, 'w') as f:
+        f.write("ncols 2\nnrows 2\nxllcorner 1.\nyllcorner 2.\n"
+                "cellsize 0.5\nnodata_value -9999\n1 2\n3 4\n")
+    x, y, Z, header = read_topo(fname)
+    np.testing.assert_allclose(Z, [[3, 4], [1, 2]])
+    assert header['cellsize'] == 0.5
+
+
+def test_load_topo_cache(tmp_path):
+    fname, x, y, Z = _dem(tmp_path)
+    cachedir = str(tmp_path / 'cache')
+    load_topo(fname, cachedir=cachedir)
+    assert len([f for f in os.listdir(cachedir) if f.endswith('.npy')]) == 1
+    xr, yr, Zr, header = load_topo(fname, cachedir=cachedir)
+    assert isinstance(Zr, np.memmap)
+    np.testing.assert_allclose(Zr, Z)
+
+
+def test_size_mismatch(tmp_path):
+    fname = str(tmp_path / 'bad.tt3')
+    with open(fname, 'w') as f:
+        f.write("3 ncols\n2 nrows\n0 xll\n0 yll\n1 cellsize\n-9999 nd\n1 2 3\n")
+    with pytest.raises(IOError):
+        read_topo(fname)
+
+
+@pytest.mark.parametrize('factor', [2, 3, 4])
+def test_coarsen_at_block_centres(factor):
+    dx = 0.001
+    x = 94. + dx * np.arange(23)
+    y = 0. + dx * np.arange(17)    # near the equator, cos(lat) ~ 1
+    Z = 5. * x[None, :] + 3. * y[:, None]
+    xc, yc, Zc = coarsen(x, y, Z, factor)
+    np.testing.assert_allclose(np.diff(xc), factor * dx)
+    assert xc[0] <= x[0] and xc[-1] >= x[-1]
+    assert yc[0] <= y[0] and yc[-1] >= y[-1]
+    # a linear surface averaged over a whole block is its value at the
+    # block centre:
+    first = factor // 2
+    full_x = [k for k in range(len(xc))
+              if first <= k * factor <= len(x) - factor + first]
+    full_y = [k for k in range(len(yc))
+              if first <= k * factor <= len(y) - factor + first]
+    expected = 5. * xc[None, full_x] + 3. * yc[full_y, None]
+    np.testing.assert_allclose(Zc[np.ix_(full_y, full_x)], expected,
+                               atol=1e-9)
+
+
+def test_coarsen_skips_nodata():
+    x = np.arange(6.) * 0.001
+    y = np.arange(6.) * 0.001
+    Z = np.full((6, 6), 10.)
+    Z[2, 3] = -9999.
+    xc, yc, Zc = coarsen(x, y, Z, 3, -9999.)
+    np.testing.assert_allclose(Zc, 10.)
+
+
+def test_crop_covers_box():
+    x = np.arange(10.)
+    y = np.arange(8.)
+    Z = np.zeros((8, 10))
+    xc, yc, Zc = crop(x, y, Z, 2.5, 5.5, 1.2, 3.)
+    assert xc[0] <= 2.5 and xc[-1] >= 5.5
+    assert yc[0] <= 1.2 and yc[-1] >= 3.
+    assert Zc.shape == (len(yc), len(xc))
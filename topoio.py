@@ -0,0 +1,110 @@
+"""
+Reading GeoClaw topography files with NumPy.
+
+Only the header + values formats (topotype 2 and 3) are handled, which is
+what mega_fill.txt uses.  Values are returned as Z[j,i] at x[i], y[j] with
+y increasing, i.e. flipped from the north-to-south order of the file.
+
+load_topo keeps a binary copy of each file it has parsed, keyed by the
+hash of its contents, so the text is only parsed once.
+
+"""
+from __future__ import absolute_import
+from __future__ import print_function
+import os
+import json
+import hashlib
+import numpy as np
+
+
+header_keys = ['ncols', 'nrows', 'xll', 'yll', 'cellsize', 'nodata_value']
+
+
+def read_header(f):
+    """
+    Read the 6 header lines of a topotype 2/3 file from the open file f.
+    Both 'value key' (GeoClaw) and 'key value' (ESRI) lines are accepted.
+    """
+    header = {}
+    for key in header_keys:
+        tokens = f.readline().split()
+        try:
+            value = float(tokens[0])
+        except ValueError:
+            value = float(tokens[1])
+        header[key] = value
+    header['ncols'] = int(header['ncols'])
+    header['nrows'] = int(header['nrows'])
+    return header
+
+
+def read_topo(fname, topo_type=3):
+    """
+    Read a topotype 2 or 3 file.
+
+    OUTPUT:
+        x, y, Z, header - 1d coordinates, 2d elevations Z[j,i], and the
+                          header as a dict
+    """
+    if topo_type not in (2, 3):
+        raise ValueError("*** topo_type %s not supported" % topo_type)
+    with open(fname) as f:
+        header = read_header(f)
+        Z = np.array(f.read().split(), dtype=np.float64)
+
+    mx, my = header['ncols'], header['nrows']
+    if Z.size != mx * my:
+        raise IOError("*** %s: expected %i values, found %i"
+                      % (fname, mx * my, Z.size))
+    Z = Z.reshape((my, mx))[::-1, :]
+    dx = header['cellsize']
+    x = header['xll'] + dx * np.arange(mx)
+    y = header['yll'] + dx * np.arange(my)
+    return x, y, Z, header
+
+
+def file_hash(fname, blocksize=1 << 23):
+    """sha1 of the contents of fname."""
+    sha = hashlib.sha1()
+    with open(fname, 'rb') as f:
+        for block in iter(lambda: f.read(blocksize), b''):
+            sha.update(block)
+    return sha.hexdigest()
+
+
+def load_topo(fname, topo_type=3, cachedir=None):
+    """
+    Like read_topo, but the values are converted once to a .npy file in
+    cachedir (default topo_cache next to fname), named by the sha1 of the
+    contents of fname, and memory mapped on later calls.
+    """
+    if cachedir is None:
+        cachedir = os.path.join(os.path.dirname(os.path.abspath(fname)),
+                                'topo_cache')
+    key = os.path.join(cachedir, file_hash(fname))
+    if os.path.exists(key + '.npy') and os.path.exists(key + '.json'):
+        with open(key + '.json') as f:
+            header = json.load(f)
+        Z = np.load(key + '.npy', mmap_mode='r')
+    else:
+        x, y, Z, header = read_topo(fname, topo_type)
+        if not os.path.isdir(cachedir):
+            os.makedirs(cachedir)
+        np.save(key + '.npy', Z)
+        with open(key + '.json', 'w') as f:
+            json.dump(header, f)
+    dx = header['cellsize']
+    x = header['xll'] + dx * np.arange(header['ncols'])
+    y = header['yll'] + dx * np.arange(header['nrows'])
+    return x, y, Z, header
+
+
+def write_topo(fname, x, y, Z, nodata_value=-9999, fmt='%.2f'):
+    """
+    Write Z[j,i] at x[i], y[j] (uniform spacing dx = dy, y increasing) as
+    a topotype 3 file.
+    """
+    dx = x[1] - x[0]
+    header = "%i ncols\n%i nrows\n%.10f xll\n%.10f yll\n%.10f cellsize\n" \
+             "%s nodata_value" % (len(x), len(y), x[0], y[0], dx, nodata_value)
+    np.savetxt(fname, Z[::-1, :], fmt=fmt, header=header, comments='')